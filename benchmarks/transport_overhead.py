@@ -0,0 +1,74 @@
+"""
+Benchmark: Per-Request Overhead of HTTP Transports
+~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+Solves against a zero-latency local fake API, so the time per request is
+almost entirely client and loopback overhead. Each backend is measured
+sequentially (per-request latency) and with concurrent threads
+(throughput).
+
+Usage:
+    python benchmarks/transport_overhead.py [--requests 2000] [--threads 16]
+"""
+
+import argparse
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from fastcaptcha import FastCaptcha
+from fastcaptcha.metrics import latency_summary
+from fastcaptcha.testing import FakeAPIServer, make_image
+from fastcaptcha.transport import TRANSPORTS
+
+IMAGE = make_image('BENCH1')
+
+
+def bench_sequential(solver, count):
+    latencies = []
+    for _ in range(count):
+        started = time.perf_counter()
+        solver.solve_bytes(IMAGE)
+        latencies.append(time.perf_counter() - started)
+    return latency_summary(latencies)
+
+
+def bench_concurrent(solver, count, threads):
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=threads) as executor:
+        list(executor.map(lambda _: solver.solve_bytes(IMAGE), range(count)))
+    return count / (time.perf_counter() - started)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument('--requests', type=int, default=2000)
+    parser.add_argument('--threads', type=int, default=16)
+    args = parser.parse_args()
+    
+    print(f"{'backend':<10} {'mean':>9} {'p50':>9} {'p99':>9} {'threads/s':>11}")
+    with FakeAPIServer() as server:
+        for name in TRANSPORTS:
+            try:
+                solver = FastCaptcha(
+                    api_key='bench', base_url=server.url,
+                    transport=name, pool_size=args.threads
+                )
+            except ImportError as e:
+                print(f"{name:<10} skipped: {e}")
+                continue
+            
+            with solver:
+                solver.warmup(connections=args.threads)
+                bench_sequential(solver, 100)
+                stats = bench_sequential(solver, args.requests)
+                rate = bench_concurrent(solver, args.requests, args.threads)
+            
+            print(
+                f"{name:<10} {stats['mean'] * 1e6:>7.0f}us "
+                f"{stats['p50'] * 1e6:>7.0f}us {stats['p99'] * 1e6:>7.0f}us "
+                f"{rate:>11.0f}"
+            )
+
+
+if __name__ == '__main__':
+    main()
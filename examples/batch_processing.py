@@ -2,10 +2,13 @@
 Example: Batch Process Multiple CAPTCHAs
 ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
 
-This example shows how to solve multiple CAPTCHA images in batch.
+This example shows how to solve multiple CAPTCHA images in batch,
+concurrently, with automatically tuned concurrency, and keep every result
+in a compact columnar store for analysis and export.
 """
 
 from fastcaptcha import FastCaptcha
+from fastcaptcha.results import ResultStore
 import glob
 import time
 
@@ -24,33 +27,40 @@ def main():
         
         print(f"Found {len(captcha_files)} CAPTCHAs to solve\n")
         
-        # Track statistics
-        successful = 0
-        failed = 0
+        # Every result is recorded with its status code, latency and the
+        # server's processing time in a few dozen bytes
+        store = ResultStore(labels=captcha_files)
         start_time = time.time()
         
-        # Process each CAPTCHA
-        for i, captcha_file in enumerate(captcha_files, 1):
-            try:
-                print(f"[{i}/{len(captcha_files)}] Solving {captcha_file}...", end=" ")
-                result = solver.solve(captcha_file)
-                print(f"✓ Result: {result}")
-                successful += 1
-                
-            except Exception as e:
-                print(f"✗ Error: {e}")
-                failed += 1
+        # Solve concurrently; the number of requests in flight adapts to
+        # the API's observed latency and error rate
+        for index, result in solver.solve_stream(captcha_files, store=store):
+            captcha_file = captcha_files[index]
+            if isinstance(result, Exception):
+                print(f"✗ {captcha_file}: Error: {result}")
+            else:
+                print(f"✓ {captcha_file}: {result}")
+        
+        # Export all results; both formats stream row by row
+        store.to_csv("results.csv")
+        store.to_jsonl("results.jsonl")
         
         # Print statistics
         elapsed = time.time() - start_time
+        stats = store.stats()
+        latency = stats['latency']
         print(f"\n{'='*50}")
-        print(f"Batch Processing Complete")
+        print("Batch Processing Complete")
         print(f"{'='*50}")
-        print(f"Total: {len(captcha_files)}")
-        print(f"Successful: {successful}")
-        print(f"Failed: {failed}")
+        print(f"Total: {stats['count']}")
+        print(f"Successful: {stats['succeeded']}")
+        print(f"Failed: {stats['failed']} {stats['errors'] or ''}")
+        print(f"Success rate: {stats['success_rate']:.1%}")
         print(f"Time elapsed: {elapsed:.2f} seconds")
-        print(f"Average time per CAPTCHA: {elapsed/len(captcha_files):.2f} seconds")
+        print(f"Latency p50/p90/p99: {latency['p50']:.2f}s / "
+              f"{latency['p90']:.2f}s / {latency['p99']:.2f}s")
+        print(f"Final concurrency limit: {solver.concurrency.limit}")
+        print("Results saved to results.csv and results.jsonl")
         print(f"{'='*50}")
 
 
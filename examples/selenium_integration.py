@@ -11,6 +11,7 @@ from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from fastcaptcha import FastCaptcha
+from fastcaptcha.integrations.selenium import PageScreenshot, solve_element
 import time
 
 def solve_captcha_with_selenium():
@@ -36,17 +37,10 @@ def solve_captcha_with_selenium():
             EC.presence_of_element_located((By.ID, "captcha-image"))
         )
         
-        # Option 1: Download CAPTCHA image and solve
-        print("Downloading CAPTCHA image...")
-        captcha_src = captcha_element.get_attribute("src")
-        
-        if captcha_src.startswith("data:"):
-            # Base64 encoded image
-            base64_data = captcha_src.split(",")[1]
-            result = solver.solve_base64(base64_data)
-        else:
-            # URL image
-            result = solver.solve_url(captcha_src)
+        # Solve straight from the element: a data URI in ``src`` is sent
+        # as-is, otherwise the element screenshot is solved in memory
+        print("Solving CAPTCHA...")
+        result = solve_element(solver, captcha_element)
         
         print(f"CAPTCHA solved: {result}")
         
@@ -81,7 +75,10 @@ def solve_captcha_with_selenium():
 
 def solve_captcha_screenshot():
     """
-    Alternative method: Take a screenshot of the CAPTCHA element.
+    Alternative method: Crop the CAPTCHA out of one page screenshot.
+    
+    No temporary files are written; when a page has several CAPTCHA
+    elements, a single screenshot serves all of them.
     """
     
     api_key = "your-api-key-here"
@@ -94,11 +91,11 @@ def solve_captcha_screenshot():
         # Find CAPTCHA element
         captcha_element = driver.find_element(By.ID, "captcha-image")
         
-        # Take screenshot of CAPTCHA element
-        captcha_element.screenshot("captcha_screenshot.png")
-        
-        # Solve from file
-        result = solver.solve("captcha_screenshot.png")
+        # Capture the page once and crop the element from it (needs Pillow)
+        page = PageScreenshot(driver)
+        result = solve_element(
+            solver, captcha_element, screenshot=page, use_src=False
+        )
         print(f"CAPTCHA solved: {result}")
         
         # Enter solution
@@ -29,8 +29,10 @@ from .exceptions import (
     APIKeyError,
     InvalidImageError,
     APIError,
-    TimeoutError
+    TimeoutError,
+    AnswerFormatError
 )
+from .formats import AnswerFormat
 
 __all__ = [
     'FastCaptcha',
@@ -38,5 +40,7 @@ __all__ = [
     'APIKeyError',
     'InvalidImageError',
     'APIError',
-    'TimeoutError'
+    'TimeoutError',
+    'AnswerFormatError',
+    'AnswerFormat'
 ]
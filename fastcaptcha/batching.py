@@ -0,0 +1,203 @@
+"""
+FastCaptcha Micro-Batching
+~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+Gathers concurrent solve calls into multi-image batch requests.
+
+Calls arriving within ``max_wait`` seconds of each other are sent together
+(up to ``max_batch_size`` images) to the batch endpoint, and each caller
+receives its own result. A batch of one, or any batch sent while the API
+has no batch endpoint, falls back to an ordinary single request made from
+the caller's own thread.
+"""
+
+import copy
+import queue
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+
+# Tells a waiting caller to send its request on its own
+_SEND_SINGLE = object()
+
+
+def _copy_error(error: Exception) -> Exception:
+    try:
+        copied = copy.copy(error)
+    except Exception:
+        return error
+    copied.__cause__ = error.__cause__
+    return copied
+
+
+class MicroBatcher:
+    """
+    Collects solve payloads from many threads into batch requests.
+    
+    Args:
+        solver (FastCaptcha): Client used to send requests
+        max_batch_size (int, optional): Maximum images per batch.
+            Defaults to 16.
+        max_wait (float, optional): Seconds the first call of a batch waits
+            for more calls to join. Defaults to 0.005.
+    
+    Example:
+        >>> solver = FastCaptcha(api_key='your-api-key', max_batch_size=16)
+        >>> # solve* calls from concurrent threads are now batched
+    """
+    
+    def __init__(self, solver, max_batch_size: int = 16, max_wait: float = 0.005):
+        if max_batch_size < 2:
+            raise ValueError("max_batch_size must be at least 2")
+        
+        self.solver = solver
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait
+        self.available = True
+        self._queue: queue.Queue = queue.Queue()
+        self._executor = ThreadPoolExecutor(
+            max_workers=max(1, solver.pool_size),
+            thread_name_prefix='fastcaptcha-batch'
+        )
+        self._thread = None
+        self._lock = threading.Lock()
+        self._closed = False
+        self._stats = {'batches': 0, 'batched': 0, 'single': 0}
+    
+    def submit(self, payload: dict) -> str:
+        """
+        Solve one payload, batched with concurrent calls where possible.
+        
+        Args:
+            payload: JSON request payload
+        
+        Returns:
+            str: Solved CAPTCHA text
+        
+        Raises:
+            APIError: If API request fails
+            TimeoutError: If request times out
+        """
+        future: Future = Future()
+        # close() takes the same lock, so a queued call is always seen by
+        # the collector before its stop sentinel
+        with self._lock:
+            queued = self.available and not self._closed
+            if queued:
+                self._ensure_thread()
+                self._queue.put((payload, future))
+        
+        if queued:
+            result = future.result()
+            if isinstance(result, str):
+                return result
+        
+        with self._lock:
+            self._stats['single'] += 1
+        text: str = self.solver._request_solve(payload)
+        return text
+    
+    def stats(self) -> dict:
+        """
+        Get batching counters.
+        
+        Returns:
+            dict: Batches sent, payloads sent in batches, single requests,
+            and whether the batch endpoint is available
+        """
+        with self._lock:
+            stats = dict(self._stats)
+        stats['available'] = self.available
+        return stats
+    
+    def close(self):
+        """Stop the collector thread; pending calls fall back to single requests."""
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            self._queue.put(None)
+            thread = self._thread
+        if thread is not None:
+            thread.join()
+        self._executor.shutdown(wait=True)
+    
+    def _ensure_thread(self):
+        # Called with self._lock held
+        if self._thread is None:
+            self._thread = threading.Thread(
+                target=self._collect, name='fastcaptcha-batcher', daemon=True
+            )
+            self._thread.start()
+    
+    def _collect(self):
+        while True:
+            item = self._queue.get()
+            if item is None:
+                break
+            
+            batch = [item]
+            deadline = time.monotonic() + self.max_wait
+            stop = False
+            while len(batch) < self.max_batch_size:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    item = self._queue.get(timeout=remaining)
+                except queue.Empty:
+                    break
+                if item is None:
+                    stop = True
+                    break
+                batch.append(item)
+            
+            if len(batch) == 1 or not self.available or self._closed:
+                for _, future in batch:
+                    future.set_result(_SEND_SINGLE)
+            else:
+                self._executor.submit(self._send, batch)
+            
+            if stop:
+                break
+        
+        # submit() cannot queue behind the sentinel; this is only a safety net
+        while True:
+            try:
+                item = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if item is not None:
+                item[1].set_result(_SEND_SINGLE)
+    
+    def _send(self, batch):
+        try:
+            results = self.solver._request_batch([payload for payload, _ in batch])
+        except Exception as e:
+            # Each caller raises in its own thread; a shared instance would
+            # have its traceback rewritten by every one of them
+            for _, future in batch:
+                future.set_exception(_copy_error(e))
+            return
+        
+        if results is None:
+            # No batch endpoint: stop batching for the life of this client
+            self.available = False
+            for _, future in batch:
+                future.set_result(_SEND_SINGLE)
+            return
+        
+        with self._lock:
+            self._stats['batches'] += 1
+            self._stats['batched'] += len(batch)
+        for (_, future), result in zip(batch, results):
+            if isinstance(result, Exception):
+                future.set_exception(result)
+            else:
+                future.set_result(result)
+    
+    def __repr__(self):
+        return (
+            f"<MicroBatcher(max_batch_size={self.max_batch_size}, "
+            f"max_wait={self.max_wait})>"
+        )
@@ -0,0 +1,300 @@
+"""
+FastCaptcha Command Line Interface
+~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+Entry point for the ``fastcaptcha`` command.
+
+Usage:
+
+   $ fastcaptcha serve --api-key YOUR_KEY --listen unix:/tmp/fastcaptcha.sock
+   $ fastcaptcha loadgen --ramp 10:200:10 --step-duration 10 --latency 0.3
+   $ fastcaptcha fake-server --port 8080 --latency lognormal:0.3:0.5 --error-rate 0.01
+"""
+
+import argparse
+import json
+import os
+import signal
+import sys
+from typing import List, Optional
+
+from .core import FastCaptcha
+from .daemon import DEFAULT_ADDRESS, SolverDaemon
+from .transport import TRANSPORTS
+
+
+def _cmd_serve(args) -> int:
+    if not args.api_key:
+        print("error: an API key is required (--api-key or FASTCAPTCHA_API_KEY)",
+              file=sys.stderr)
+        return 2
+    
+    solver = FastCaptcha(
+        api_key=args.api_key,
+        base_url=args.base_url,
+        timeout=args.timeout,
+        rate_limit=args.rate_limit,
+        pool_size=args.pool_size,
+        transport=args.transport,
+        connect_timeout=args.connect_timeout,
+        adaptive_timeout=args.adaptive_timeout
+    )
+    try:
+        daemon = SolverDaemon(
+            solver,
+            address=args.listen,
+            cache_size=args.cache_size,
+            cache_ttl=args.cache_ttl,
+            allow_remote=args.allow_remote
+        )
+    except ValueError as e:
+        solver.close()
+        print(f"error: {e}", file=sys.stderr)
+        return 2
+    
+    # Let SIGTERM stop the daemon the same way Ctrl+C does
+    signal.signal(signal.SIGTERM, lambda signum, frame: sys.exit(0))
+    
+    print(f"FastCaptcha daemon listening on {args.listen}", flush=True)
+    try:
+        daemon.serve_forever()
+    except (KeyboardInterrupt, SystemExit):
+        pass
+    finally:
+        daemon.shutdown()
+    return 0
+
+
+def _cmd_loadgen(args) -> int:
+    from .loadgen import LoadGenerator, Stage, format_report, ramp
+    from .testing import FakeAPIServer
+    
+    if args.ramp:
+        try:
+            start, stop, step = (float(part) for part in args.ramp.split(':'))
+        except ValueError:
+            print("error: --ramp must be START:STOP:STEP", file=sys.stderr)
+            return 2
+        stages = ramp(start, stop, step, args.step_duration)
+    else:
+        stages = [Stage(args.rate, args.duration)]
+    
+    transport = args.transport
+    if args.replay:
+        from .recording import ReplayTransport
+        transport = ReplayTransport(args.replay, speed=args.replay_speed or None)
+    
+    server = None
+    base_url = args.base_url
+    if base_url is None and not args.replay:
+        server = FakeAPIServer(latency=args.latency).start()
+        base_url = server.url
+    
+    solver = FastCaptcha(
+        api_key=args.api_key or 'loadgen',
+        base_url=base_url,
+        timeout=args.timeout,
+        pool_size=args.pool_size,
+        transport=transport,
+        record_to=args.record
+    )
+    generator = LoadGenerator(
+        solver,
+        stages,
+        max_concurrency=args.concurrency,
+        report_interval=args.interval,
+        poisson=not args.uniform,
+        trace_memory=not args.no_tracemalloc
+    )
+    
+    try:
+        summary = generator.run(
+            None if args.json else
+            lambda report: print(format_report(report), flush=True)
+        )
+    finally:
+        solver.close()
+        if server is not None:
+            server.stop()
+    
+    if args.json:
+        print(json.dumps(summary, indent=2))
+    else:
+        latency = summary['latency']
+        print(
+            f"\nCompleted {summary['completed']}/{summary['offered']} in "
+            f"{summary['duration']:.1f}s ({summary['throughput']:.1f}/s), "
+            f"p50={latency['p50'] * 1000:.0f}ms p90={latency['p90'] * 1000:.0f}ms "
+            f"p99={latency['p99'] * 1000:.0f}ms, errors={summary['errors'] or 0}, "
+            f"rss growth={(summary['rss_growth'] or 0) / 1048576:.1f}MB, "
+            f"fds {summary['open_fds_start']}->{summary['open_fds_end']}"
+        )
+    return 0
+
+
+def _cmd_fake_server(args) -> int:
+    from .testing import FakeAPIServer
+    
+    try:
+        server = FakeAPIServer(
+            host=args.host,
+            port=args.port,
+            latency=args.latency,
+            batch=not args.no_batch,
+            api_keys=args.api_key,
+            credits=args.credits,
+            rate_limit=args.rate_limit,
+            error_rate=args.error_rate,
+            throttle_rate=args.throttle_rate,
+            seed=args.seed
+        )
+    except ValueError as e:
+        print(f"error: {e}", file=sys.stderr)
+        return 2
+    
+    signal.signal(signal.SIGTERM, lambda signum, frame: sys.exit(0))
+    
+    # The URL is the first line of output; FakeAPIProcess waits for it
+    print(server.url, flush=True)
+    try:
+        server.serve_forever()
+    except (KeyboardInterrupt, SystemExit):
+        pass
+    return 0
+
+
+def build_parser() -> argparse.ArgumentParser:
+    """Build the argument parser for the ``fastcaptcha`` command."""
+    parser = argparse.ArgumentParser(
+        prog='fastcaptcha',
+        description='FastCaptcha command line tools'
+    )
+    subparsers = parser.add_subparsers(dest='command')
+    
+    serve = subparsers.add_parser(
+        'serve',
+        help='run a shared local solver daemon'
+    )
+    serve.add_argument('--api-key', default=os.environ.get('FASTCAPTCHA_API_KEY'),
+                       help='API key (default: $FASTCAPTCHA_API_KEY)')
+    serve.add_argument('--listen', default=DEFAULT_ADDRESS,
+                       help=f'unix:/path or host:port (default: {DEFAULT_ADDRESS})')
+    serve.add_argument('--allow-remote', action='store_true',
+                       help='allow a non-loopback --listen address; the daemon has '
+                            'no authentication, so anyone who can connect spends '
+                            'your credits')
+    serve.add_argument('--base-url', default=None, help='custom API endpoint')
+    serve.add_argument('--timeout', type=float, default=30,
+                       help='upstream request timeout in seconds (default: 30)')
+    serve.add_argument('--connect-timeout', type=float, default=None,
+                       help='upstream connect timeout in seconds (default: --timeout)')
+    serve.add_argument('--adaptive-timeout', action='store_true',
+                       help='derive read timeouts from observed latency, up to --timeout')
+    serve.add_argument('--rate-limit', type=float, default=None,
+                       help='maximum upstream solves per second (default: unlimited)')
+    serve.add_argument('--pool-size', type=int, default=64,
+                       help='maximum pooled upstream connections (default: 64)')
+    serve.add_argument('--transport', choices=sorted(TRANSPORTS), default='urllib3',
+                       help='upstream HTTP backend (default: urllib3)')
+    serve.add_argument('--cache-size', type=int, default=1024,
+                       help='maximum cached results, 0 to disable (default: 1024)')
+    serve.add_argument('--cache-ttl', type=float, default=300,
+                       help='seconds a cached result stays valid (default: 300)')
+    serve.set_defaults(func=_cmd_serve)
+    
+    loadgen = subparsers.add_parser(
+        'loadgen',
+        help='drive a client at a target arrival rate (open loop)'
+    )
+    loadgen.add_argument('--rate', type=float, default=20,
+                         help='arrivals per second (default: 20)')
+    loadgen.add_argument('--duration', type=float, default=30,
+                         help='seconds to run at --rate (default: 30)')
+    loadgen.add_argument('--ramp', default=None, metavar='START:STOP:STEP',
+                         help='raise the rate step by step instead of --rate')
+    loadgen.add_argument('--step-duration', type=float, default=10,
+                         help='seconds per ramp step (default: 10)')
+    loadgen.add_argument('--uniform', action='store_true',
+                         help='evenly spaced arrivals instead of Poisson')
+    loadgen.add_argument('--concurrency', type=int, default=256,
+                         help='maximum requests in flight (default: 256)')
+    loadgen.add_argument('--pool-size', type=int, default=64,
+                         help='client connection pool size (default: 64)')
+    loadgen.add_argument('--transport', choices=sorted(TRANSPORTS), default='requests',
+                         help='client HTTP backend (default: requests)')
+    loadgen.add_argument('--timeout', type=float, default=30,
+                         help='client request timeout in seconds (default: 30)')
+    loadgen.add_argument('--interval', type=float, default=1.0,
+                         help='seconds between reports (default: 1)')
+    loadgen.add_argument('--latency', default='0.3',
+                         help='fake server latency: seconds or a distribution '
+                              'such as lognormal:0.3:0.5 (default: 0.3)')
+    loadgen.add_argument('--base-url', default=None,
+                         help='endpoint to drive instead of a local fake server')
+    loadgen.add_argument('--api-key', default=os.environ.get('FASTCAPTCHA_API_KEY'),
+                         help='API key sent to the endpoint')
+    loadgen.add_argument('--record', default=None, metavar='CASSETTE',
+                         help='record HTTP exchanges to a cassette (.gz to compress)')
+    loadgen.add_argument('--replay', default=None, metavar='CASSETTE',
+                         help='answer from a recorded cassette instead of the network')
+    loadgen.add_argument('--replay-speed', type=float, default=1.0,
+                         help='replay latency divisor, 0 for no delay (default: 1)')
+    loadgen.add_argument('--no-tracemalloc', action='store_true',
+                         help='do not trace Python allocations')
+    loadgen.add_argument('--json', action='store_true',
+                         help='print the full report as JSON')
+    loadgen.set_defaults(func=_cmd_loadgen)
+    
+    fake = subparsers.add_parser(
+        'fake-server',
+        help='run a local stand-in for the API'
+    )
+    fake.add_argument('--host', default='127.0.0.1',
+                      help='interface to bind (default: 127.0.0.1)')
+    fake.add_argument('--port', type=int, default=0,
+                      help='port to bind, 0 for any free port (default: 0)')
+    fake.add_argument('--latency', default='0',
+                      help='seconds, or lognormal:MEDIAN:SIGMA, uniform:LOW:HIGH, '
+                           'bimodal:FAST:SLOW:FRACTION (default: 0)')
+    fake.add_argument('--no-batch', action='store_true',
+                      help='do not serve the batch endpoint')
+    fake.add_argument('--api-key', action='append', default=None,
+                      help='accepted API key, repeatable (default: any key)')
+    fake.add_argument('--credits', type=int, default=1000000,
+                      help='starting credits per key (default: 1000000)')
+    fake.add_argument('--rate-limit', type=float, default=None,
+                      help='solves per second per key before 429 (default: unlimited)')
+    fake.add_argument('--error-rate', type=float, default=0.0,
+                      help='fraction of solves answered with 500 (default: 0)')
+    fake.add_argument('--throttle-rate', type=float, default=0.0,
+                      help='fraction of solves answered with 429 (default: 0)')
+    fake.add_argument('--seed', type=int, default=None,
+                      help='random seed for latency and error injection')
+    fake.set_defaults(func=_cmd_fake_server)
+    
+    return parser
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """
+    Run the ``fastcaptcha`` command.
+    
+    Args:
+        argv: Command line arguments (default: ``sys.argv[1:]``)
+    
+    Returns:
+        int: Process exit status
+    """
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    
+    if not hasattr(args, 'func'):
+        parser.print_help()
+        return 1
+    
+    status: int = args.func(args)
+    return status
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,198 @@
+"""
+FastCaptcha Adaptive Concurrency
+~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+Concurrency limiter for batch solving that tunes itself from observed
+latency and errors.
+
+Two algorithms are available:
+
+* ``'aimd'`` - additive increase, multiplicative decrease. The limit grows
+  by about one per round trip while recent latency stays within
+  ``tolerance`` times the long-run average, and is cut by ``backoff`` on a
+  timeout, server error, or latency spike.
+* ``'gradient'`` - the limit follows the ratio of long-run to recent
+  latency plus a small headroom (``sqrt(limit)``), so it settles where
+  extra requests stop being served without queueing.
+"""
+
+import math
+import threading
+import time
+from typing import Optional
+
+
+class AdaptiveLimiter:
+    """
+    Thread-safe limit on in-flight requests that adapts to the API.
+    
+    Args:
+        initial (int, optional): Starting limit. Defaults to 4.
+        min_limit (int, optional): Lowest limit. Defaults to 1.
+        max_limit (int, optional): Highest limit. Defaults to 64.
+        algorithm (str, optional): ``'aimd'`` or ``'gradient'``.
+            Defaults to ``'aimd'``.
+        backoff (float, optional): Factor the limit is multiplied by on
+            overload. Defaults to 0.7.
+        tolerance (float, optional): Recent/long-run latency ratio treated
+            as overload. Defaults to 2.0.
+    
+    Example:
+        >>> limiter = AdaptiveLimiter(max_limit=32)
+        >>> limiter.acquire()
+        >>> limiter.release(latency=0.28)
+        >>> limiter.limit
+        4
+    """
+    
+    ALGORITHMS = ('aimd', 'gradient')
+    
+    def __init__(
+        self,
+        initial: int = 4,
+        min_limit: int = 1,
+        max_limit: int = 64,
+        algorithm: str = 'aimd',
+        backoff: float = 0.7,
+        tolerance: float = 2.0
+    ):
+        if algorithm not in self.ALGORITHMS:
+            raise ValueError(
+                f"Unknown algorithm '{algorithm}'. "
+                f"Choose from: {', '.join(self.ALGORITHMS)}"
+            )
+        if not 1 <= min_limit <= max_limit:
+            raise ValueError("limits must satisfy 1 <= min_limit <= max_limit")
+        
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.algorithm = algorithm
+        self.backoff = backoff
+        self.tolerance = tolerance
+        self._limit = float(min(max(initial, min_limit), max_limit))
+        self._in_flight = 0
+        self._short_latency: Optional[float] = None
+        self._long_latency: Optional[float] = None
+        self._last_decrease = 0.0
+        self._increases = 0
+        self._decreases = 0
+        self._cond = threading.Condition()
+    
+    @property
+    def limit(self) -> int:
+        """Current maximum number of requests in flight."""
+        return int(self._limit)
+    
+    @property
+    def in_flight(self) -> int:
+        """Requests currently in flight."""
+        return self._in_flight
+    
+    def acquire(self):
+        """Wait until a request may be sent, then count it as in flight."""
+        with self._cond:
+            while self._in_flight >= int(self._limit):
+                self._cond.wait()
+            self._in_flight += 1
+    
+    def release(self, latency: Optional[float], overloaded: bool = False):
+        """
+        Record a finished request and adjust the limit.
+        
+        Args:
+            latency: Seconds the request took, or None if the slot was
+                given back without sending a request
+            overloaded: True if it failed in a way that signals overload
+                (timeout, network error, 429 or 5xx)
+        """
+        with self._cond:
+            saturated = self._in_flight >= int(self._limit)
+            self._in_flight -= 1
+            if latency is None:
+                self._cond.notify_all()
+                return
+            self._observe(latency)
+            if self.algorithm == 'aimd':
+                self._update_aimd(overloaded, saturated)
+            else:
+                self._update_gradient(overloaded)
+            self._cond.notify_all()
+    
+    def _observe(self, latency: float):
+        recent, average = self._short_latency, self._long_latency
+        if recent is None or average is None:
+            self._short_latency = self._long_latency = latency
+            return
+        self._short_latency = recent + 0.2 * (latency - recent)
+        self._long_latency = average + 0.02 * (latency - average)
+    
+    def _latency_spike(self) -> bool:
+        recent, average = self._short_latency, self._long_latency
+        if recent is None or average is None:
+            return False
+        return recent > average * self.tolerance
+    
+    def _decrease(self):
+        # One cut per round trip, so a burst of failures from the same
+        # window does not collapse the limit to the minimum.
+        now = time.monotonic()
+        if now - self._last_decrease < (self._short_latency or 0.0):
+            return
+        self._last_decrease = now
+        self._limit = max(self.min_limit, self._limit * self.backoff)
+        self._decreases += 1
+    
+    def _update_aimd(self, overloaded: bool, saturated: bool):
+        if overloaded or self._latency_spike():
+            self._decrease()
+        elif saturated and self._limit < self.max_limit:
+            # Only grow when the current limit is actually being used
+            before = int(self._limit)
+            self._limit = min(self.max_limit, self._limit + 1.0 / self._limit)
+            if int(self._limit) > before:
+                self._increases += 1
+    
+    def _update_gradient(self, overloaded: bool):
+        if overloaded:
+            self._decrease()
+            return
+        
+        recent, average = self._short_latency, self._long_latency
+        gradient = 1.0
+        if recent and average:
+            gradient = max(0.5, min(1.0, average / recent))
+        target = self._limit * gradient + math.sqrt(self._limit)
+        before = int(self._limit)
+        self._limit = max(self.min_limit, min(
+            self.max_limit, 0.8 * self._limit + 0.2 * target
+        ))
+        if int(self._limit) > before:
+            self._increases += 1
+        elif int(self._limit) < before:
+            self._decreases += 1
+    
+    def snapshot(self) -> dict:
+        """
+        Get the limiter's state for monitoring.
+        
+        Returns:
+            dict: Limit, in-flight count, latency averages and adjustments
+        """
+        with self._cond:
+            return {
+                'algorithm': self.algorithm,
+                'limit': int(self._limit),
+                'in_flight': self._in_flight,
+                'min_limit': self.min_limit,
+                'max_limit': self.max_limit,
+                'recent_latency': self._short_latency,
+                'average_latency': self._long_latency,
+                'increases': self._increases,
+                'decreases': self._decreases,
+            }
+    
+    def __repr__(self):
+        return (
+            f"<AdaptiveLimiter(algorithm='{self.algorithm}', "
+            f"limit={self.limit}, max_limit={self.max_limit})>"
+        )
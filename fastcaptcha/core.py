@@ -6,12 +6,38 @@ This module contains the main FastCaptcha class for solving image CAPTCHAs.
 """
 
 import base64
-import requests
-from typing import Optional, Union
+import json
+import queue
+import threading
+import time
+from collections import Counter
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import Iterable, Iterator, List, Optional, Tuple, Union
 from pathlib import Path
+from urllib.parse import urljoin
 
-from .exceptions import APIKeyError, InvalidImageError, APIError, TimeoutError
-from .utils import validate_image_path, is_valid_url, download_image
+from .exceptions import (
+    FastCaptchaException,
+    APIKeyError,
+    InvalidImageError,
+    APIError,
+    TimeoutError,
+    AnswerFormatError
+)
+from .batching import MicroBatcher
+from .concurrency import AdaptiveLimiter
+from .dedup import NearDuplicateIndex
+from .formats import AnswerFormat
+from .hedging import HedgePolicy
+from .metrics import LatencyWindow
+from .timeouts import AdaptiveTimeout
+from .validation import DEFAULT_MAX_BYTES, DEFAULT_MAX_PIXELS, validate_image_data
+from .ratelimit import RateLimiter
+from .recording import RecordingTransport
+from .results import Answer, ResultStore
+from .transport import Transport, TransportError, TransportTimeout, create_transport
+from .warmup import ConnectionWarmer
+from .utils import validate_image_path, is_valid_url
 
 
 class FastCaptcha:
@@ -25,6 +51,55 @@ class FastCaptcha:
         api_key (str): Your FastCaptcha API key
         base_url (str, optional): Custom API endpoint. Defaults to production API.
         timeout (int, optional): Request timeout in seconds. Defaults to 30.
+        rate_limit (float, optional): Maximum solve requests per second
+            across all threads using this solver. Defaults to unlimited.
+        pool_size (int, optional): Maximum pooled connections to the API.
+            Defaults to 10.
+        max_batch_size (int, optional): Gather concurrent solves into batch
+            requests of up to this many images. Defaults to 1 (no batching).
+        max_batch_wait (float, optional): Seconds to wait for concurrent
+            solves to join a batch. Defaults to 0.005.
+        warm_connections (int, optional): Open this many connections in the
+            background at start-up and keep them alive. Defaults to 0.
+        keepalive_interval (float, optional): Seconds of inactivity after
+            which warm connections are pinged. Defaults to 30.
+        transport (str or Transport, optional): HTTP backend: ``'requests'``,
+            ``'urllib3'`` (lean), ``'http2'`` or a Transport instance.
+            Defaults to ``'requests'``.
+        max_concurrency (int, optional): Upper bound for the adaptive
+            concurrency of :meth:`solve_batch` and :meth:`solve_stream`.
+            Defaults to ``pool_size``.
+        concurrency_algorithm (str, optional): ``'aimd'`` or
+            ``'gradient'``. Defaults to ``'aimd'``.
+        answer_format (AnswerFormat, optional): Default expected answer
+            format for every solve. Defaults to None (no check).
+        max_resolves (int, optional): Re-solves allowed when an answer
+            violates the expected format. Defaults to 2.
+        validate_images (bool, optional): Check image bytes locally (format,
+            header, truncation, limits) before uploading. Defaults to True.
+        max_image_bytes (int, optional): Largest image accepted by local
+            validation. Defaults to 5 MB.
+        max_image_pixels (int, optional): Largest width x height accepted
+            by local validation. Defaults to 4096 x 4096.
+        near_duplicates (NearDuplicateIndex, optional): Reuse answers for
+            images perceptually identical to ones solved before.
+            Defaults to None.
+        hedge (HedgePolicy, float or bool, optional): Send a duplicate of
+            a slow single solve and use whichever answers first. A number
+            is a fixed hedge delay in seconds; True hedges after the
+            observed p95 latency. Defaults to None (no hedging).
+        connect_timeout (float, optional): Seconds to wait for a connection.
+            Defaults to ``timeout``.
+        read_timeout (float, optional): Seconds to wait for a response once
+            connected. Defaults to ``timeout``.
+        adaptive_timeout (AdaptiveTimeout or bool, optional): Derive solve
+            read timeouts from observed latency and retry stuck requests
+            with a longer one. True uses the defaults. Defaults to None.
+        record_to (str or Path, optional): Record every API exchange, with
+            timing, to this cassette file for offline replay with
+            :class:`~fastcaptcha.recording.ReplayTransport`, including
+            images downloaded by :meth:`solve_url` (with query strings
+            hashed). Defaults to None.
     
     Example:
         >>> solver = FastCaptcha(api_key='your-api-key')
@@ -39,7 +114,27 @@ class FastCaptcha:
         self,
         api_key: str,
         base_url: Optional[str] = None,
-        timeout: int = 30
+        timeout: int = 30,
+        rate_limit: Optional[float] = None,
+        pool_size: int = 10,
+        max_batch_size: int = 1,
+        max_batch_wait: float = 0.005,
+        warm_connections: int = 0,
+        keepalive_interval: Optional[float] = 30.0,
+        transport: Union[str, Transport] = 'requests',
+        max_concurrency: Optional[int] = None,
+        concurrency_algorithm: str = 'aimd',
+        answer_format: Optional[AnswerFormat] = None,
+        max_resolves: int = 2,
+        validate_images: bool = True,
+        max_image_bytes: Optional[int] = DEFAULT_MAX_BYTES,
+        max_image_pixels: Optional[int] = DEFAULT_MAX_PIXELS,
+        near_duplicates: Optional[NearDuplicateIndex] = None,
+        hedge: Union[HedgePolicy, float, bool, None] = None,
+        connect_timeout: Optional[float] = None,
+        read_timeout: Optional[float] = None,
+        adaptive_timeout: Union[AdaptiveTimeout, bool, None] = None,
+        record_to: Union[str, Path, None] = None
     ):
         """
         Initialize FastCaptcha solver.
@@ -48,6 +143,26 @@ class FastCaptcha:
             api_key: Your FastCaptcha API key
             base_url: Custom API endpoint (optional)
             timeout: Request timeout in seconds (default: 30)
+            rate_limit: Maximum solve requests per second (optional)
+            pool_size: Maximum pooled connections to the API (default: 10)
+            max_batch_size: Maximum images per batch request (default: 1)
+            max_batch_wait: Seconds to collect a batch (default: 0.005)
+            warm_connections: Connections to pre-open (default: 0)
+            keepalive_interval: Idle seconds before pinging (default: 30)
+            transport: HTTP backend name or instance (default: 'requests')
+            max_concurrency: Adaptive concurrency ceiling (default: pool_size)
+            concurrency_algorithm: 'aimd' or 'gradient' (default: 'aimd')
+            answer_format: Default expected answer format (optional)
+            max_resolves: Re-solves on format violations (default: 2)
+            validate_images: Validate images before upload (default: True)
+            max_image_bytes: Image byte limit (default: 5 MB)
+            max_image_pixels: Image pixel limit (default: 4096 x 4096)
+            near_duplicates: Near-duplicate answer index (optional)
+            hedge: Hedge policy or fixed hedge delay (optional)
+            connect_timeout: Connect timeout in seconds (default: timeout)
+            read_timeout: Read timeout in seconds (default: timeout)
+            adaptive_timeout: Latency-derived read timeouts (optional)
+            record_to: Cassette path to record HTTP exchanges to (optional)
         
         Raises:
             APIKeyError: If API key is invalid or missing
@@ -58,10 +173,67 @@ class FastCaptcha:
         self.api_key = api_key.strip()
         self.base_url = base_url or self.DEFAULT_API_URL
         self.timeout = timeout
-        self._session = requests.Session()
-        self._session.headers.update({
-            'User-Agent': f'FastCaptcha-Python/{self.__class__.__module__}'
-        })
+        self.connect_timeout = connect_timeout if connect_timeout is not None else timeout
+        self.read_timeout = read_timeout if read_timeout is not None else timeout
+        self.adaptive_timeout = (
+            AdaptiveTimeout.coerce(adaptive_timeout) if adaptive_timeout else None
+        )
+        self.pool_size = pool_size
+        self.rate_limiter = RateLimiter(rate_limit) if rate_limit else None
+        self.answer_format = (
+            AnswerFormat.coerce(answer_format) if answer_format is not None else None
+        )
+        self.max_resolves = max_resolves
+        self.validate_images = validate_images
+        self.max_image_bytes = max_image_bytes
+        self.max_image_pixels = max_image_pixels
+        self.near_duplicates = near_duplicates
+        self.hedge = HedgePolicy.coerce(hedge) if hedge else None
+        self.latencies = LatencyWindow()
+        self._counters: Counter = Counter()
+        self._counters_lock = threading.Lock()
+        self._transport = create_transport(transport, pool_size)
+        
+        # Headers are built once here rather than merged on every request
+        user_agent = f'FastCaptcha-Python/{self.__class__.__module__}'
+        self._solve_headers = {
+            'User-Agent': user_agent,
+            'X-API-Key': self.api_key,
+            'Content-Type': 'application/json'
+        }
+        self._balance_headers = {
+            'User-Agent': user_agent,
+            'X-API-Key': self.api_key
+        }
+        # Image hosts are third parties: never send them the API key
+        self._download_headers = {'User-Agent': user_agent}
+        self._balance_url = self.base_url.replace('/ocr/', '/balance/')
+        self._batch_url = self.base_url.replace('/ocr/', '/ocr/batch/')
+        if record_to is not None:
+            # Downloads are recorded too, so solve_url can be replayed
+            self._transport = RecordingTransport(self._transport, record_to)
+        
+        max_concurrency = max_concurrency or pool_size
+        self.concurrency = AdaptiveLimiter(
+            initial=min(4, max_concurrency),
+            max_limit=max_concurrency,
+            algorithm=concurrency_algorithm
+        )
+        self._batcher = None
+        if max_batch_size > 1:
+            self._batcher = MicroBatcher(self, max_batch_size, max_batch_wait)
+        self._warmer = None
+        if warm_connections > 0:
+            self._warmer = ConnectionWarmer(
+                self, warm_connections, keepalive_interval
+            )
+            self._warmer.start()
+        self._hedge_executor = None
+        if self.hedge is not None:
+            self._hedge_executor = ThreadPoolExecutor(
+                max_workers=pool_size * 2,
+                thread_name_prefix='fastcaptcha-hedge'
+            )
     
     def solve(self, image: Union[str, Path], **kwargs) -> str:
         """
@@ -69,13 +241,17 @@ class FastCaptcha:
         
         Args:
             image: Path to image file or image URL
-            **kwargs: Additional parameters to pass to the API
+            **kwargs: Additional parameters to pass to the API. Every
+                ``solve*`` method also accepts ``answer_format`` (an
+                AnswerFormat, dict or regex) and ``max_resolves``, which are
+                checked locally and not sent.
         
         Returns:
             str: Solved CAPTCHA text
         
         Raises:
             InvalidImageError: If image is invalid or cannot be read
+            AnswerFormatError: If answers keep violating ``answer_format``
             APIError: If API request fails
             TimeoutError: If request times out
         
@@ -85,6 +261,9 @@ class FastCaptcha:
             >>> result = solver.solve('captcha.jpg')
             >>> # From URL
             >>> result = solver.solve('https://example.com/captcha.png')
+            >>> # Exactly 6 uppercase alphanumerics, re-solved if not
+            >>> fmt = AnswerFormat(length=6, charset=UPPERCASE_ALPHANUMERIC)
+            >>> result = solver.solve('captcha.jpg', answer_format=fmt)
         """
         image_str = str(image)
         
@@ -124,12 +303,52 @@ class FastCaptcha:
             raise InvalidImageError(f"Invalid URL: {url}")
         
         try:
-            image_data = download_image(url, timeout=self.timeout)
+            image_data = self._download(url)
         except Exception as e:
             raise InvalidImageError(f"Failed to download image from URL: {str(e)}")
         
         return self._solve_image_data(image_data, **kwargs)
     
+    def _download(self, url: str, max_redirects: int = 5) -> bytes:
+        """
+        Internal method to download an image through the client's transport.
+        
+        Args:
+            url: Image URL
+            max_redirects: Redirects to follow (default: 5)
+        
+        Returns:
+            bytes: Image data
+        
+        Raises:
+            TransportError: If the download fails at the network level
+            ValueError: If the response is an error or not an image
+        """
+        for _ in range(max_redirects + 1):
+            response = self._transport.request(
+                'GET',
+                url,
+                self._download_headers,
+                timeout=(self.connect_timeout, self.read_timeout)
+            )
+            location = response.headers.get('location')
+            if response.status_code in (301, 302, 303, 307, 308) and location:
+                url = urljoin(url, location)
+                continue
+            break
+        else:
+            raise ValueError(f"Too many redirects (more than {max_redirects})")
+        
+        if response.status_code >= 400:
+            raise ValueError(f"HTTP {response.status_code} for url: {url}")
+        
+        # Verify content type
+        content_type = response.headers.get('content-type', '').lower()
+        if not content_type.startswith('image/'):
+            raise ValueError(f"URL does not point to an image. Content-Type: {content_type}")
+        
+        return response.content
+    
     def solve_base64(self, base64_string: str, **kwargs) -> str:
         """
         Solve a CAPTCHA from a base64-encoded image.
@@ -155,11 +374,187 @@ class FastCaptcha:
             if ',' in base64_string:
                 base64_string = base64_string.split(',')[1]
             
-            image_data = base64.b64decode(base64_string)
+            # Decode only to validate; the original string is sent as-is
+            # instead of being re-encoded from the decoded bytes.
+            image_base64 = ''.join(base64_string.split())
+            if (
+                self.validate_images and self.max_image_bytes is not None
+                and len(image_base64) // 4 * 3 > self.max_image_bytes + 2
+            ):
+                raise ValueError("image is over the byte limit")
+            image_data = base64.b64decode(image_base64, validate=True)
         except Exception as e:
+            self._count('validation_rejected')
             raise InvalidImageError(f"Invalid base64 string: {str(e)}")
         
-        return self._solve_image_data(image_data, **kwargs)
+        self._validate(image_data)
+        return self._solve_encoded(image_base64, image_data, **kwargs)
+    
+    def solve_bytes(self, image_data: bytes, **kwargs) -> str:
+        """
+        Solve a CAPTCHA from raw image bytes already held in memory.
+        
+        Args:
+            image_data: Raw image bytes (e.g. a PNG screenshot)
+            **kwargs: Additional parameters to pass to the API
+        
+        Returns:
+            str: Solved CAPTCHA text
+        
+        Raises:
+            InvalidImageError: If image data is empty or not bytes
+            APIError: If API request fails
+            TimeoutError: If request times out
+        
+        Example:
+            >>> solver = FastCaptcha(api_key='your-api-key')
+            >>> result = solver.solve_bytes(element.screenshot_as_png)
+        """
+        if not image_data or not isinstance(image_data, (bytes, bytearray)):
+            raise InvalidImageError("Image data must be non-empty bytes")
+        
+        return self._solve_image_data(bytes(image_data), **kwargs)
+    
+    def solve_stream(
+        self,
+        images: Iterable[Union[str, Path, bytes]],
+        concurrency: Optional[int] = None,
+        store: Optional[ResultStore] = None,
+        **kwargs
+    ) -> Iterator[Tuple[int, Union[str, FastCaptchaException]]]:
+        """
+        Solve many CAPTCHAs concurrently, yielding results as they finish.
+        
+        Images are read lazily from ``images``, so very long or unbounded
+        iterables can be streamed. Unless ``concurrency`` is given, the
+        number of requests in flight is tuned automatically from observed
+        latency and errors (see :attr:`concurrency`).
+        
+        Args:
+            images: File paths, URLs or raw image bytes
+            concurrency: Fixed number of requests in flight (optional)
+            store: Columnar store that also records every result with its
+                status and timings (optional)
+            **kwargs: Additional parameters to pass to the API
+        
+        Yields:
+            tuple: ``(index, result)`` in completion order, where ``result``
+            is the solved text or the FastCaptchaException raised
+        
+        Example:
+            >>> solver = FastCaptcha(api_key='your-api-key')
+            >>> for index, result in solver.solve_stream(glob.glob('*.jpg')):
+            ...     print(index, result)
+        """
+        if concurrency is not None:
+            limiter = AdaptiveLimiter(
+                initial=concurrency, min_limit=concurrency, max_limit=concurrency
+            )
+        else:
+            limiter = self.concurrency
+        
+        results: queue.Queue = queue.Queue()
+        stop = threading.Event()
+        executor = ThreadPoolExecutor(
+            max_workers=limiter.max_limit,
+            thread_name_prefix='fastcaptcha-solve'
+        )
+        
+        def run(index, image):
+            started = time.monotonic()
+            outcome = FastCaptchaException("Solve was interrupted")
+            try:
+                outcome = self._solve_any(image, **kwargs)
+            except FastCaptchaException as e:
+                outcome = e
+            except Exception as e:
+                outcome = FastCaptchaException(str(e))
+            finally:
+                # The consumer waits for exactly one result per image, so
+                # it must be delivered even if the bookkeeping fails
+                try:
+                    latency = time.monotonic() - started
+                    limiter.release(
+                        latency,
+                        overloaded=isinstance(outcome, (APIError, TimeoutError))
+                    )
+                    if store is not None:
+                        store.add(index, outcome, latency)
+                finally:
+                    results.put((index, outcome))
+        
+        def submit():
+            submitted = 0
+            try:
+                for index, image in enumerate(images):
+                    limiter.acquire()
+                    if stop.is_set():
+                        limiter.release(None)
+                        break
+                    executor.submit(run, index, image)
+                    submitted += 1
+            except BaseException as e:
+                results.put((None, e))
+            results.put((None, submitted))
+        
+        feeder = threading.Thread(
+            target=submit, name='fastcaptcha-feeder', daemon=True
+        )
+        feeder.start()
+        
+        received = 0
+        total = None
+        try:
+            while total is None or received < total:
+                index, outcome = results.get()
+                if index is None:
+                    if isinstance(outcome, BaseException):
+                        raise outcome
+                    total = outcome
+                    continue
+                received += 1
+                yield index, outcome
+        finally:
+            stop.set()
+            feeder.join()
+            executor.shutdown(wait=True)
+    
+    def solve_batch(
+        self,
+        images: Iterable[Union[str, Path, bytes]],
+        concurrency: Optional[int] = None,
+        store: Optional[ResultStore] = None,
+        **kwargs
+    ) -> List[Union[str, FastCaptchaException]]:
+        """
+        Solve many CAPTCHAs concurrently.
+        
+        Args:
+            images: File paths, URLs or raw image bytes
+            concurrency: Fixed number of requests in flight (optional,
+                adaptive by default)
+            store: Columnar store that also records every result with its
+                status and timings (optional)
+            **kwargs: Additional parameters to pass to the API
+        
+        Returns:
+            list: Solved text or the FastCaptchaException raised, in input
+            order
+        
+        Example:
+            >>> solver = FastCaptcha(api_key='your-api-key')
+            >>> results = solver.solve_batch(['a.jpg', 'b.jpg'])
+        """
+        results = {}
+        for index, outcome in self.solve_stream(images, concurrency, store, **kwargs):
+            results[index] = outcome
+        return [results[index] for index in range(len(results))]
+    
+    def _solve_any(self, image: Union[str, Path, bytes], **kwargs) -> str:
+        """Internal method to solve a path, URL or raw bytes."""
+        if isinstance(image, (bytes, bytearray)):
+            return self.solve_bytes(image, **kwargs)
+        return self.solve(image, **kwargs)
     
     def _solve_image_data(self, image_data: bytes, **kwargs) -> str:
         """
@@ -173,57 +568,360 @@ class FastCaptcha:
             str: Solved CAPTCHA text
         
         Raises:
+            InvalidImageError: If the image fails local validation
             APIError: If API request fails
             TimeoutError: If request times out
         """
+        self._validate(image_data)
+        
         # Encode image to base64
         image_base64 = base64.b64encode(image_data).decode('utf-8')
         
+        return self._solve_encoded(image_base64, image_data, **kwargs)
+    
+    def _solve_encoded(
+        self,
+        image_base64: str,
+        image_data: Optional[bytes] = None,
+        answer_format: Optional[AnswerFormat] = None,
+        max_resolves: Optional[int] = None,
+        hedge: Optional[bool] = None,
+        **kwargs
+    ) -> str:
+        """
+        Internal method to solve CAPTCHA from a base64-encoded image.
+        
+        Args:
+            image_base64: Base64-encoded image without data URI prefix
+            image_data: Decoded image bytes, for near-duplicate lookup
+            answer_format: Expected answer format (default: client's)
+            max_resolves: Re-solves on format violations (default: client's)
+            hedge: False to skip hedging for this solve (default: client's)
+            **kwargs: Additional parameters to pass to the API
+        
+        Returns:
+            str: Solved CAPTCHA text
+        
+        Raises:
+            AnswerFormatError: If every answer violates the expected format
+            APIError: If API request fails
+            TimeoutError: If request times out
+        """
         # Prepare request payload
         payload = {
             'image': image_base64,
             **kwargs
         }
         
-        headers = {
-            'X-API-Key': self.api_key,
-            'Content-Type': 'application/json'
-        }
+        if answer_format is None:
+            answer_format = self.answer_format
+        else:
+            answer_format = AnswerFormat.coerce(answer_format)
+        if max_resolves is None:
+            max_resolves = self.max_resolves
+        
+        index = self.near_duplicates
+        image_hash = None
+        if index is not None and image_data is not None:
+            namespace = json.dumps(kwargs, sort_keys=True) if kwargs else ''
+            try:
+                image_hash = index.hash_image(image_data)
+            except (OSError, ValueError):
+                self._count('unhashable')
+            else:
+                match = index.lookup(image_hash, namespace)
+                if match is not None and (
+                    answer_format is None or answer_format.check(match[0]) is None
+                ):
+                    return match[0]
+        
+        text = self._dispatch(payload, hedge)
+        
+        if answer_format is None:
+            if index is not None and image_hash is not None:
+                index.add(image_hash, text, namespace)
+            return text
+        
+        self._count('format_checked')
+        for attempt in range(max_resolves + 1):
+            violation = answer_format.check(text)
+            if violation is None:
+                if index is not None and image_hash is not None:
+                    index.add(image_hash, text, namespace)
+                return text
+            
+            self._count('format_violations')
+            if attempt == max_resolves:
+                break
+            self._count('format_resolves')
+            text = self._dispatch(payload, hedge)
+        
+        self._count('format_failures')
+        raise AnswerFormatError(
+            f"Answer {text!r} violates expected format: {violation}", text
+        )
+    
+    def _validate(self, image_data: bytes):
+        """
+        Internal method to check image bytes locally before uploading.
+        
+        Raises:
+            InvalidImageError: If the image fails validation
+        """
+        if not self.validate_images:
+            return
         
         try:
-            response = self._session.post(
-                self.base_url,
-                json=payload,
-                headers=headers,
-                timeout=self.timeout
+            validate_image_data(
+                image_data, self.max_image_bytes, self.max_image_pixels
             )
+        except InvalidImageError:
+            self._count('validation_rejected')
+            raise
+    
+    def _dispatch(self, payload: dict, hedge: Optional[bool] = None) -> str:
+        """Internal method to send a payload, batched or hedged when enabled."""
+        if self._batcher is not None:
+            return self._batcher.submit(payload)
+        if self.hedge is not None and hedge is not False:
+            return self._request_hedged(payload)
+        
+        return self._request_solve(payload)
+    
+    def _request_hedged(self, payload: dict) -> str:
+        """
+        Internal method to send a solve, duplicated if it is slow.
+        
+        The first successful response wins; the other request is cancelled
+        if it has not started and its response is discarded otherwise.
+        
+        Args:
+            payload: JSON request payload
+        
+        Returns:
+            str: Solved CAPTCHA text
+        
+        Raises:
+            APIError: If every request sent fails
+            TimeoutError: If every request sent times out
+        """
+        policy = self.hedge
+        executor = self._hedge_executor
+        if policy is None or executor is None:
+            return self._request_solve(payload)
+        
+        policy.record_request()
+        delay = policy.threshold(self.latencies)
+        if delay is None:
+            return self._request_solve(payload)
+        
+        primary = self._start_primary(payload)
+        done, _ = wait([primary], timeout=delay)
+        if done or not policy.reserve():
+            return primary.result()
+        if self.rate_limiter is not None and not self.rate_limiter.try_acquire():
+            policy.release('rate_limited')
+            return primary.result()
+        
+        hedged = executor.submit(
+            self._request_solve, payload, rate_limited=False
+        )
+        pending = {primary, hedged}
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                if future.exception() is None:
+                    for loser in pending:
+                        loser.cancel()
+                    if future is hedged:
+                        policy.record('hedge_wins')
+                    return future.result()
+        return primary.result()
+    
+    def _start_primary(self, payload: dict) -> 'Future[str]':
+        """
+        Internal method to send a hedgeable solve on a thread of its own.
+        
+        A blocking request cannot be abandoned, so the caller waits on the
+        returned future instead of sending the request itself, which lets
+        it return a hedge's answer first. Primaries do not go through the
+        bounded hedge executor, so they never queue behind each other.
+        """
+        future: 'Future[str]' = Future()
+        
+        def run():
+            future.set_running_or_notify_cancel()
+            try:
+                future.set_result(self._request_solve(payload))
+            except BaseException as e:
+                future.set_exception(e)
+        
+        threading.Thread(target=run, name='fastcaptcha-primary', daemon=True).start()
+        return future
+    
+    def _count(self, name: str, amount: int = 1):
+        """Internal method to increment a client counter."""
+        with self._counters_lock:
+            self._counters[name] += amount
+    
+    def _request_solve(self, payload: dict, rate_limited: bool = True) -> str:
+        """
+        Internal method to send one solve request to the API.
+        
+        Args:
+            payload: JSON request payload
+            rate_limited: Take a rate-limiter token first (default: True)
+        
+        Returns:
+            str: Solved CAPTCHA text
+        
+        Raises:
+            APIError: If API request fails
+            TimeoutError: If request times out
+        """
+        body = json.dumps(payload).encode('utf-8')
+        adaptive = self.adaptive_timeout
+        read_timeout = self.read_timeout
+        retries = 0
+        if adaptive is not None:
+            read_timeout = adaptive.read_timeout(self.latencies, self.read_timeout)
+            retries = adaptive.retries
+        
+        for attempt in range(retries + 1):
+            if (rate_limited or attempt) and self.rate_limiter is not None:
+                self.rate_limiter.acquire()
             
-            # Handle API errors
-            if response.status_code == 401:
-                raise APIKeyError("Invalid API key")
-            elif response.status_code == 400:
-                error_msg = response.json().get('error', 'Bad request')
-                raise InvalidImageError(f"API returned error: {error_msg}")
-            elif response.status_code != 200:
-                raise APIError(
-                    f"API request failed with status {response.status_code}: "
-                    f"{response.text}"
+            try:
+                started = time.perf_counter()
+                response = self._transport.request(
+                    'POST',
+                    self.base_url,
+                    self._solve_headers,
+                    body,
+                    (self.connect_timeout, read_timeout)
+                )
+                
+                # Handle API errors
+                if response.status_code != 200:
+                    raise self._error_for_status(response.status_code, response)
+                
+                # Parse response
+                result = response.json()
+                
+                if 'text' not in result:
+                    raise APIError("Invalid API response format")
+                
+                self.latencies.add(time.perf_counter() - started)
+                return Answer(result['text'], result.get('processing_time'))
+                
+            except TransportTimeout:
+                self._count('timeouts')
+                # The solve took at least this long; recording it as a
+                # censored sample lets the timeout grow back after a
+                # latency shift instead of cutting every request short
+                self.latencies.add(read_timeout)
+                # Only retry when the adaptive timeout cut the wait short
+                if attempt < retries and adaptive is not None:
+                    escalated = adaptive.escalate(
+                        read_timeout, self.read_timeout
+                    )
+                    if escalated > read_timeout:
+                        self._count('timeout_retries')
+                        read_timeout = escalated
+                        continue
+                raise TimeoutError(
+                    f"Request timed out after {read_timeout} seconds"
                 )
+            except TransportError as e:
+                raise APIError(f"Network error: {str(e)}")
+        
+        # Every attempt either returns, raises or continues to a next one
+        raise TimeoutError(f"Request timed out after {read_timeout} seconds")
+    
+    def _request_batch(self, payloads: List[dict]) -> Optional[list]:
+        """
+        Internal method to send several solve requests as one batch request.
+        
+        Args:
+            payloads: JSON payloads of the individual solve requests
+        
+        Returns:
+            list: Solved text or exception per payload, in order, or None
+            if the API has no batch endpoint
+        
+        Raises:
+            APIError: If the batch request itself fails
+            TimeoutError: If request times out
+        """
+        if self.rate_limiter is not None:
+            for _ in payloads:
+                self.rate_limiter.acquire()
+        
+        try:
+            response = self._transport.request(
+                'POST',
+                self._batch_url,
+                self._solve_headers,
+                json.dumps({'images': payloads}).encode('utf-8'),
+                (self.connect_timeout, self.read_timeout)
+            )
             
-            # Parse response
-            result = response.json()
+            if response.status_code in (404, 405, 501):
+                return None
+            elif response.status_code != 200:
+                raise self._error_for_status(response.status_code, response)
             
-            if 'text' not in result:
+            items = response.json().get('results')
+            if not isinstance(items, list) or len(items) != len(payloads):
                 raise APIError("Invalid API response format")
             
-            return result['text']
-            
-        except requests.exceptions.Timeout:
+        except TransportTimeout:
             raise TimeoutError(
-                f"Request timed out after {self.timeout} seconds"
+                f"Request timed out after {self.read_timeout} seconds"
             )
-        except requests.exceptions.RequestException as e:
+        except TransportError as e:
             raise APIError(f"Network error: {str(e)}")
+        
+        results = []
+        for item in items:
+            if 'text' in item:
+                results.append(Answer(item['text'], item.get('processing_time')))
+            else:
+                results.append(self._error_for_status(
+                    item.get('status_code', 500), message=item.get('error')
+                ))
+        return results
+    
+    @staticmethod
+    def _error_for_status(status_code: int, response=None, message=None):
+        """
+        Internal method to build the exception for a failed API status.
+        
+        Args:
+            status_code: HTTP status code
+            response: HTTP response to read the error from (optional)
+            message: Error message when there is no response (optional)
+        
+        Returns:
+            FastCaptchaException: Exception to raise
+        """
+        error: FastCaptchaException
+        if status_code == 401:
+            error = APIKeyError("Invalid API key")
+        elif status_code == 400:
+            if response is not None:
+                message = response.json().get('error')
+            error = InvalidImageError(
+                f"API returned error: {message or 'Bad request'}"
+            )
+        else:
+            if response is not None:
+                message = response.text
+            error = APIError(
+                f"API request failed with status {status_code}: {message}"
+            )
+        error.status_code = status_code
+        return error
     
     def get_balance(self) -> dict:
         """
@@ -240,15 +938,12 @@ class FastCaptcha:
             >>> balance = solver.get_balance()
             >>> print(f"Credits remaining: {balance['credits']}")
         """
-        headers = {
-            'X-API-Key': self.api_key
-        }
-        
         try:
-            response = self._session.get(
-                self.base_url.replace('/ocr/', '/balance/'),
-                headers=headers,
-                timeout=self.timeout
+            response = self._transport.request(
+                'GET',
+                self._balance_url,
+                self._balance_headers,
+                timeout=(self.connect_timeout, self.read_timeout)
             )
             
             if response.status_code == 401:
@@ -260,12 +955,98 @@ class FastCaptcha:
             
             return response.json()
             
-        except requests.exceptions.RequestException as e:
+        except TransportError as e:
             raise APIError(f"Network error: {str(e)}")
     
+    def warmup(
+        self,
+        connections: int = 4,
+        keepalive_interval: Optional[float] = None
+    ) -> int:
+        """
+        Open pooled connections to the API ahead of the first solve.
+        
+        Args:
+            connections: Number of connections to open (default: 4)
+            keepalive_interval: Keep the connections alive with background
+                pings after this many idle seconds (optional)
+        
+        Returns:
+            int: Number of connections newly opened
+        
+        Example:
+            >>> solver = FastCaptcha(api_key='your-api-key')
+            >>> solver.warmup(connections=4, keepalive_interval=30)
+            4
+        """
+        if self._warmer is None:
+            self._warmer = ConnectionWarmer(self, connections, keepalive_interval)
+        else:
+            self._warmer.connections = max(self._warmer.connections, connections)
+        
+        opened = self._warmer.warmup(connections)
+        if keepalive_interval:
+            self._warmer.keepalive_interval = keepalive_interval
+            self._warmer.start()
+        return opened
+    
+    def _connection_pool(self):
+        """Internal method to get the urllib3 connection pool for the API."""
+        return self._transport.connection_pool(self.base_url)
+    
+    def get_stats(self) -> dict:
+        """
+        Get client-side performance counters.
+        
+        Returns:
+            dict: Counters for each enabled feature, keyed by feature name
+        
+        Example:
+            >>> solver = FastCaptcha(api_key='your-api-key', max_batch_size=16)
+            >>> solver.get_stats()['batching']['batches']
+            0
+        """
+        stats = {}
+        if self._batcher is not None:
+            stats['batching'] = self._batcher.stats()
+        if self._warmer is not None:
+            stats['connections'] = self._warmer.stats()
+        stats['concurrency'] = self.concurrency.snapshot()
+        with self._counters_lock:
+            counters = dict(self._counters)
+        stats['validation_rejected'] = counters.get('validation_rejected', 0)
+        if self.hedge is not None:
+            stats['hedging'] = self.hedge.stats()
+            stats['hedging']['threshold'] = self.hedge.threshold(self.latencies)
+        if self.adaptive_timeout is not None:
+            stats['timeouts'] = {
+                'read_timeout': self.adaptive_timeout.read_timeout(
+                    self.latencies, self.read_timeout
+                ),
+                'timed_out': counters.get('timeouts', 0),
+                'retried': counters.get('timeout_retries', 0),
+            }
+        if self.near_duplicates is not None:
+            stats['near_duplicates'] = self.near_duplicates.stats()
+            stats['near_duplicates']['unhashable'] = counters.get('unhashable', 0)
+        stats['answer_format'] = {
+            name[len('format_'):]: counters.get(name, 0)
+            for name in (
+                'format_checked', 'format_violations',
+                'format_resolves', 'format_failures'
+            )
+        }
+        return stats
+    
     def close(self):
-        """Close the HTTP session."""
-        self._session.close()
+        """Close the HTTP transport and its connections."""
+        if self._batcher is not None:
+            self._batcher.close()
+        if self._warmer is not None:
+            self._warmer.stop()
+        if self._hedge_executor is not None:
+            self._hedge_executor.shutdown(wait=False)
+        self._transport.close()
     
     def __enter__(self):
         """Context manager entry."""
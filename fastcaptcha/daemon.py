@@ -0,0 +1,580 @@
+"""
+FastCaptcha Solver Daemon
+~~~~~~~~~~~~~~~~~~~~~~~~~
+
+A long-running local daemon that fronts one pooled :class:`FastCaptcha`
+client for many worker processes, plus a thin client with the same
+``solve*`` API.
+
+All workers on a host share the daemon's connection pool, rate limiter,
+result cache and in-flight request coalescing: identical images submitted
+concurrently are sent upstream once.
+
+The protocol is newline-delimited JSON over a Unix socket or a localhost
+TCP port. It has no authentication - anyone who can connect spends the
+daemon's credits - so Unix sockets are created owner-only and TCP
+addresses other than loopback are refused unless ``allow_remote`` is set.
+Each request is an object with an ``op`` (``solve``, ``solve_url``,
+``balance`` or ``stats``); each response is either
+``{"ok": true, "result": ...}`` or
+``{"ok": false, "error": "<exception class>", "message": "..."}``, plus
+the exception's ``status_code`` and rejected answer ``text`` when it has
+them.
+
+Start the daemon with ``fastcaptcha serve``, then in each worker:
+
+   >>> from fastcaptcha.daemon import DaemonClient
+   >>> solver = DaemonClient('127.0.0.1:8765')
+   >>> result = solver.solve('captcha.jpg')
+"""
+
+import base64
+import hashlib
+import ipaddress
+import json
+import os
+import re
+import socket
+import socketserver
+import stat
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple, Union, cast
+
+from . import exceptions
+from .exceptions import FastCaptchaException, InvalidImageError, APIError, TimeoutError
+from .formats import AnswerFormat
+from .utils import validate_image_path, is_valid_url
+
+DEFAULT_ADDRESS = '127.0.0.1:8765'
+
+# Exception attributes carried across the protocol
+_ERROR_ATTRIBUTES = ('status_code', 'text')
+
+
+def _json_default(value):
+    if isinstance(value, re.Pattern):
+        value = AnswerFormat(pattern=value)
+    if isinstance(value, AnswerFormat):
+        return value.to_dict()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def _is_loopback(host: str) -> bool:
+    if host == 'localhost':
+        return True
+    try:
+        return ipaddress.ip_address(host.strip('[]')).is_loopback
+    except ValueError:
+        # A hostname could resolve anywhere
+        return False
+
+
+def _remove_stale_socket(path: str):
+    """
+    Remove a socket left behind by a daemon that is no longer running.
+    
+    Raises:
+        ValueError: If the path is not a socket, or a daemon is listening on it
+    """
+    try:
+        mode = os.lstat(path).st_mode
+    except FileNotFoundError:
+        return
+    if not stat.S_ISSOCK(mode):
+        raise ValueError(f"Refusing to replace {path}: it is not a socket")
+    
+    probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        probe.connect(path)
+    except ConnectionRefusedError:
+        os.unlink(path)
+        return
+    except OSError as e:
+        raise ValueError(f"Cannot check socket {path}: {e}")
+    finally:
+        probe.close()
+    raise ValueError(f"Another daemon is already listening on {path}")
+
+
+def parse_address(address: str) -> Tuple[str, Union[str, Tuple[str, int]]]:
+    """
+    Parse a daemon address.
+    
+    Args:
+        address: ``unix:/path/to.sock``, a filesystem path, or ``host:port``
+    
+    Returns:
+        tuple: ``('unix', path)`` or ``('tcp', (host, port))``
+    
+    Raises:
+        ValueError: If the address cannot be parsed
+    """
+    if address.startswith('unix:'):
+        return 'unix', address[len('unix:'):]
+    if '/' in address:
+        return 'unix', address
+    
+    host, sep, port = address.rpartition(':')
+    if not sep or not port.isdigit():
+        raise ValueError(f"Invalid daemon address: {address}")
+    return 'tcp', (host or '127.0.0.1', int(port))
+
+
+class _Handler(socketserver.StreamRequestHandler):
+    """Serves newline-delimited JSON requests on one client connection."""
+    
+    def handle(self):
+        for line in self.rfile:
+            if not line.strip():
+                continue
+            try:
+                request = json.loads(line)
+                if not isinstance(request, dict):
+                    raise ValueError("expected a JSON object")
+            except ValueError as e:
+                response = {'ok': False, 'error': 'FastCaptchaException',
+                            'message': f"Malformed request: {e}"}
+            else:
+                response = self.server.daemon.handle(request)
+            self.wfile.write(json.dumps(response).encode('utf-8') + b'\n')
+            self.wfile.flush()
+
+
+class _TCPServer(socketserver.ThreadingMixIn, socketserver.TCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+    daemon: 'SolverDaemon'
+
+
+_HAS_UNIX_SOCKETS = hasattr(socketserver, 'UnixStreamServer')
+
+if _HAS_UNIX_SOCKETS:
+    class _UnixServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+        daemon_threads = True
+        daemon: 'SolverDaemon'
+
+
+class SolverDaemon:
+    """
+    Local daemon sharing one FastCaptcha client between many processes.
+    
+    Args:
+        solver (FastCaptcha): Client used for upstream requests. Configure
+            its ``pool_size`` and ``rate_limit`` for the whole fleet.
+        address (str, optional): ``unix:/path`` or ``host:port`` to listen
+            on. Defaults to ``127.0.0.1:8765``.
+        cache_size (int, optional): Maximum cached results. 0 disables the
+            cache. Defaults to 1024.
+        cache_ttl (float, optional): Seconds a cached result stays valid.
+            Defaults to 300.
+        allow_remote (bool, optional): Allow a TCP address other than
+            loopback. The protocol is unauthenticated, so only set this on
+            a trusted network. Defaults to False.
+    
+    Raises:
+        ValueError: If the address is invalid, or not loopback without
+            ``allow_remote``
+    
+    Example:
+        >>> daemon = SolverDaemon(FastCaptcha(api_key='your-api-key'))
+        >>> daemon.serve_forever()
+    """
+    
+    def __init__(
+        self,
+        solver,
+        address: str = DEFAULT_ADDRESS,
+        cache_size: int = 1024,
+        cache_ttl: float = 300.0,
+        allow_remote: bool = False
+    ):
+        self.solver = solver
+        self.address = address
+        self.cache_size = cache_size
+        self.cache_ttl = cache_ttl
+        self._cache: 'OrderedDict[str, Tuple[float, str]]' = OrderedDict()
+        self._inflight: Dict[str, 'Future[str]'] = {}
+        self._lock = threading.Lock()
+        self._stats = {
+            'requests': 0,
+            'upstream': 0,
+            'cache_hits': 0,
+            'coalesced': 0,
+            'errors': 0,
+        }
+        
+        self._server: Union[_TCPServer, '_UnixServer']
+        self._unix_path: Optional[str] = None
+        _, target = parse_address(address)
+        if isinstance(target, str):
+            if not _HAS_UNIX_SOCKETS:
+                raise ValueError("Unix sockets are not supported on this platform")
+            _remove_stale_socket(target)
+            # Create the socket owner-only, with no window in which other
+            # users could connect before a chmod
+            umask = os.umask(0o177)
+            try:
+                self._server = _UnixServer(target, _Handler)
+            finally:
+                os.umask(umask)
+            self._unix_path = target
+        else:
+            if not allow_remote and not _is_loopback(target[0]):
+                raise ValueError(
+                    f"Refusing to listen on non-loopback address {address}: "
+                    f"the daemon has no authentication, so anyone who can "
+                    f"connect can spend your credits (allow_remote=True or "
+                    f"--allow-remote to override)"
+                )
+            self._server = _TCPServer(target, _Handler)
+        self._server.daemon = self
+    
+    @property
+    def server_address(self):
+        """Address the daemon is bound to (path or ``(host, port)``)."""
+        return self._server.server_address
+    
+    def serve_forever(self):
+        """Serve requests until :meth:`shutdown` is called."""
+        self._server.serve_forever()
+    
+    def start(self) -> threading.Thread:
+        """
+        Serve requests from a background thread.
+        
+        Returns:
+            threading.Thread: The serving thread
+        """
+        thread = threading.Thread(
+            target=self.serve_forever, name='fastcaptcha-daemon', daemon=True
+        )
+        thread.start()
+        return thread
+    
+    def shutdown(self):
+        """
+        Stop serving, close the socket and the upstream client.
+        
+        Safe to call after :meth:`serve_forever` has already returned.
+        """
+        self._server.shutdown()
+        self._server.server_close()
+        if self._unix_path and os.path.exists(self._unix_path):
+            os.unlink(self._unix_path)
+        self.solver.close()
+    
+    def stats(self) -> dict:
+        """
+        Get daemon counters.
+        
+        Returns:
+            dict: Request, upstream, cache hit, coalesced and error counts
+        """
+        with self._lock:
+            stats = dict(self._stats)
+            stats['cache_entries'] = len(self._cache)
+        return stats
+    
+    def handle(self, request: dict) -> dict:
+        """
+        Handle one decoded protocol request.
+        
+        Args:
+            request: Request object with an ``op`` key
+        
+        Returns:
+            dict: Response object
+        """
+        with self._lock:
+            self._stats['requests'] += 1
+        
+        op = request.get('op')
+        params = request.get('params') or {}
+        result: Any
+        try:
+            if op == 'solve':
+                image = request['image']
+                result = self._solve_shared(
+                    self._cache_key(image, params),
+                    lambda: self.solver.solve_base64(image, **params)
+                )
+            elif op == 'solve_url':
+                result = self._upstream(
+                    lambda: self.solver.solve_url(request['url'], **params)
+                )
+            elif op == 'balance':
+                result = self._upstream(self.solver.get_balance)
+            elif op == 'stats':
+                result = self.stats()
+            else:
+                raise FastCaptchaException(f"Unknown operation: {op}")
+        except Exception as e:
+            with self._lock:
+                self._stats['errors'] += 1
+            name = type(e).__name__
+            if not isinstance(e, FastCaptchaException):
+                name = 'FastCaptchaException'
+            response = {'ok': False, 'error': name, 'message': str(e)}
+            for attribute in _ERROR_ATTRIBUTES:
+                value = getattr(e, attribute, None)
+                if value is not None:
+                    response[attribute] = value
+            return response
+        
+        return {'ok': True, 'result': result}
+    
+    @staticmethod
+    def _cache_key(image: str, params: dict) -> str:
+        digest = hashlib.sha256(image.encode('ascii', 'replace'))
+        digest.update(json.dumps(params, sort_keys=True).encode('utf-8'))
+        return digest.hexdigest()
+    
+    def _upstream(self, func):
+        with self._lock:
+            self._stats['upstream'] += 1
+        return func()
+    
+    def _solve_shared(self, key: str, func) -> str:
+        """Serve from cache, join an identical in-flight solve, or lead one."""
+        with self._lock:
+            entry = self._cache.get(key)
+            if entry is not None and entry[0] > time.monotonic():
+                self._cache.move_to_end(key)
+                self._stats['cache_hits'] += 1
+                return entry[1]
+            
+            future = self._inflight.get(key)
+            leader = future is None
+            if future is None:
+                future = self._inflight[key] = Future()
+            else:
+                self._stats['coalesced'] += 1
+        
+        if not leader:
+            return future.result()
+        
+        try:
+            text: str = self._upstream(func)
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        else:
+            future.set_result(text)
+            self._store(key, text)
+            return text
+        finally:
+            with self._lock:
+                self._inflight.pop(key, None)
+    
+    def _store(self, key: str, text: str):
+        if self.cache_size <= 0 or self.cache_ttl <= 0:
+            return
+        with self._lock:
+            self._cache[key] = (time.monotonic() + self.cache_ttl, text)
+            self._cache.move_to_end(key)
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+    
+    def __repr__(self):
+        return f"<SolverDaemon(address='{self.address}')>"
+
+
+class DaemonClient:
+    """
+    Thin client for a :class:`SolverDaemon` with the FastCaptcha API.
+    
+    Each thread keeps its own connection to the daemon, so one client can
+    be shared by all threads of a worker process.
+    
+    Args:
+        address (str, optional): Daemon address. Defaults to
+            ``127.0.0.1:8765``.
+        timeout (float, optional): Socket timeout in seconds. Defaults to 60.
+    
+    Example:
+        >>> with DaemonClient('unix:/run/fastcaptcha.sock') as solver:
+        ...     result = solver.solve('captcha.jpg')
+    """
+    
+    def __init__(self, address: str = DEFAULT_ADDRESS, timeout: float = 60):
+        self.address = address
+        self.timeout = timeout
+        self._target = parse_address(address)
+        self._local = threading.local()
+        self._connections: list = []
+        self._lock = threading.Lock()
+    
+    def _connection(self):
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            kind, target = self._target
+            family = socket.AF_UNIX if kind == 'unix' else socket.AF_INET
+            sock = socket.socket(family, socket.SOCK_STREAM)
+            sock.settimeout(self.timeout)
+            try:
+                sock.connect(target)
+            except OSError:
+                sock.close()
+                raise
+            conn = (sock, sock.makefile('rb'))
+            self._local.conn = conn
+            with self._lock:
+                self._connections.append(conn)
+        return conn
+    
+    def _drop_connection(self):
+        conn = getattr(self._local, 'conn', None)
+        if conn is not None:
+            self._local.conn = None
+            with self._lock:
+                if conn in self._connections:
+                    self._connections.remove(conn)
+            conn[1].close()
+            conn[0].close()
+    
+    def _call(self, request: dict):
+        try:
+            sock, reader = self._connection()
+            sock.sendall(
+                json.dumps(request, default=_json_default).encode('utf-8') + b'\n'
+            )
+            line = reader.readline()
+            if not line:
+                raise ConnectionError("daemon closed the connection")
+        except socket.timeout:
+            self._drop_connection()
+            raise TimeoutError(
+                f"Daemon request timed out after {self.timeout} seconds"
+            )
+        except OSError as e:
+            self._drop_connection()
+            raise APIError(f"Daemon connection error: {str(e)}")
+        
+        response = json.loads(line)
+        if response.get('ok'):
+            return response['result']
+        
+        error = getattr(exceptions, response.get('error', ''), None)
+        if not (isinstance(error, type) and issubclass(error, FastCaptchaException)):
+            error = FastCaptchaException
+        exception = error(response.get('message', 'Daemon request failed'))
+        for attribute in _ERROR_ATTRIBUTES:
+            if attribute in response:
+                setattr(exception, attribute, response[attribute])
+        raise exception
+    
+    def solve(self, image: Union[str, Path], **kwargs) -> str:
+        """
+        Solve a CAPTCHA from a file path or URL through the daemon.
+        
+        Args:
+            image: Path to image file or image URL
+            **kwargs: Additional parameters to pass to the API
+        
+        Returns:
+            str: Solved CAPTCHA text
+        """
+        image_str = str(image)
+        
+        if is_valid_url(image_str):
+            return self.solve_url(image_str, **kwargs)
+        
+        if not validate_image_path(image_str):
+            raise InvalidImageError(f"Invalid image path: {image_str}")
+        
+        with open(image_str, 'rb') as f:
+            return self.solve_bytes(f.read(), **kwargs)
+    
+    def solve_url(self, url: str, **kwargs) -> str:
+        """
+        Solve a CAPTCHA from a URL; the daemon downloads the image.
+        
+        Args:
+            url: URL of the CAPTCHA image
+            **kwargs: Additional parameters to pass to the API
+        
+        Returns:
+            str: Solved CAPTCHA text
+        """
+        if not is_valid_url(url):
+            raise InvalidImageError(f"Invalid URL: {url}")
+        
+        request = {'op': 'solve_url', 'url': url, 'params': kwargs}
+        return cast(str, self._call(request))
+    
+    def solve_base64(self, base64_string: str, **kwargs) -> str:
+        """
+        Solve a CAPTCHA from a base64-encoded image through the daemon.
+        
+        Args:
+            base64_string: Base64-encoded image string
+            **kwargs: Additional parameters to pass to the API
+        
+        Returns:
+            str: Solved CAPTCHA text
+        """
+        if ',' in base64_string:
+            base64_string = base64_string.split(',')[1]
+        
+        request = {'op': 'solve', 'image': base64_string, 'params': kwargs}
+        return cast(str, self._call(request))
+    
+    def solve_bytes(self, image_data: bytes, **kwargs) -> str:
+        """
+        Solve a CAPTCHA from raw image bytes through the daemon.
+        
+        Args:
+            image_data: Raw image bytes
+            **kwargs: Additional parameters to pass to the API
+        
+        Returns:
+            str: Solved CAPTCHA text
+        """
+        if not image_data or not isinstance(image_data, (bytes, bytearray)):
+            raise InvalidImageError("Image data must be non-empty bytes")
+        
+        image_base64 = base64.b64encode(image_data).decode('ascii')
+        request = {'op': 'solve', 'image': image_base64, 'params': kwargs}
+        return cast(str, self._call(request))
+    
+    def get_balance(self) -> dict:
+        """
+        Get account balance through the daemon.
+        
+        Returns:
+            dict: Account balance information
+        """
+        return cast(dict, self._call({'op': 'balance'}))
+    
+    def stats(self) -> dict:
+        """
+        Get the daemon's shared counters.
+        
+        Returns:
+            dict: Daemon statistics
+        """
+        return cast(dict, self._call({'op': 'stats'}))
+    
+    def close(self):
+        """Close all connections to the daemon."""
+        with self._lock:
+            connections, self._connections = self._connections, []
+        for sock, reader in connections:
+            reader.close()
+            sock.close()
+        self._local = threading.local()
+    
+    def __enter__(self):
+        """Context manager entry."""
+        return self
+    
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        """Context manager exit."""
+        self.close()
+    
+    def __repr__(self):
+        return f"<DaemonClient(address='{self.address}')>"
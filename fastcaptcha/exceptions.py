@@ -5,10 +5,14 @@ FastCaptcha Exceptions
 Custom exceptions for FastCaptcha library.
 """
 
+from typing import Optional
+
 
 class FastCaptchaException(Exception):
     """Base exception for all FastCaptcha errors."""
-    pass
+    
+    #: HTTP status of the API response that caused the error, if any
+    status_code: Optional[int] = None
 
 
 class APIKeyError(FastCaptchaException):
@@ -29,3 +33,11 @@ class APIError(FastCaptchaException):
 class TimeoutError(FastCaptchaException):
     """Raised when API request times out."""
     pass
+
+
+class AnswerFormatError(FastCaptchaException):
+    """Raised when answers keep violating the expected answer format."""
+    
+    def __init__(self, message: str, text: Optional[str] = None):
+        super().__init__(message)
+        self.text = text
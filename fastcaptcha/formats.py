@@ -0,0 +1,148 @@
+"""
+FastCaptcha Answer Formats
+~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+Expected answer formats, checked locally so a malformed answer can be
+re-solved at once instead of failing a form submission later.
+
+   >>> from fastcaptcha.formats import AnswerFormat, UPPERCASE_ALPHANUMERIC
+   >>> fmt = AnswerFormat(length=6, charset=UPPERCASE_ALPHANUMERIC)
+   >>> fmt.check('AB12CD') is None
+   True
+   >>> fmt.check('ab12')
+   'length 4 not in 6..6'
+"""
+
+import re
+import string
+from typing import Optional, Pattern, Tuple, Union
+
+DIGITS = string.digits
+UPPERCASE = string.ascii_uppercase
+LOWERCASE = string.ascii_lowercase
+LETTERS = string.ascii_letters
+UPPERCASE_ALPHANUMERIC = string.ascii_uppercase + string.digits
+ALPHANUMERIC = string.ascii_letters + string.digits
+
+_INLINE_FLAGS = (
+    (re.ASCII, 'a'), (re.IGNORECASE, 'i'), (re.MULTILINE, 'm'),
+    (re.DOTALL, 's'), (re.VERBOSE, 'x'),
+)
+
+
+def _pattern_source(pattern: Pattern) -> str:
+    # Carry compile flags as an inline group so they survive serialization
+    flags = ''.join(letter for flag, letter in _INLINE_FLAGS if pattern.flags & flag)
+    return f"(?{flags}){pattern.pattern}" if flags else pattern.pattern
+
+
+class AnswerFormat:
+    """
+    Constraints a solved answer must satisfy.
+    
+    Args:
+        length (int or tuple, optional): Exact length, or ``(min, max)``
+            range (either bound may be None)
+        charset (str, optional): Characters the answer may contain
+        pattern (str or Pattern, optional): Regular expression the whole
+            answer must match
+    
+    Example:
+        >>> AnswerFormat(length=(4, 6), charset=DIGITS)
+        >>> AnswerFormat(pattern=r'[A-Z]{3}\\d{3}')
+    """
+    
+    def __init__(
+        self,
+        length: Union[int, Tuple[Optional[int], Optional[int]], None] = None,
+        charset: Optional[str] = None,
+        pattern: Union[str, Pattern, None] = None
+    ):
+        if isinstance(length, int):
+            length = (length, length)
+        self.length = tuple(length) if length is not None else None
+        self.charset = charset
+        self._allowed = frozenset(charset) if charset is not None else None
+        if isinstance(pattern, str):
+            pattern = re.compile(pattern)
+        self.pattern = pattern
+    
+    def check(self, text: str) -> Optional[str]:
+        """
+        Check an answer against this format.
+        
+        Args:
+            text: Solved answer
+        
+        Returns:
+            str: Description of the first violation, or None if it conforms
+        """
+        if not isinstance(text, str):
+            return f"answer is {type(text).__name__}, not str"
+        
+        if self.length is not None:
+            low, high = self.length
+            if (low is not None and len(text) < low) or (
+                high is not None and len(text) > high
+            ):
+                return (
+                    f"length {len(text)} not in "
+                    f"{'' if low is None else low}..{'' if high is None else high}"
+                )
+        
+        if self._allowed is not None:
+            invalid = sorted(set(text) - self._allowed)
+            if invalid:
+                return f"characters {''.join(invalid)!r} not in charset"
+        
+        if self.pattern is not None and not self.pattern.fullmatch(text):
+            return f"does not match pattern {self.pattern.pattern!r}"
+        
+        return None
+    
+    def to_dict(self) -> dict:
+        """
+        Convert to a JSON-serializable dict.
+        
+        Returns:
+            dict: ``length``, ``charset`` and ``pattern`` keys
+        """
+        return {
+            'length': list(self.length) if self.length is not None else None,
+            'charset': self.charset,
+            'pattern': (
+                _pattern_source(self.pattern) if self.pattern is not None else None
+            ),
+        }
+    
+    @classmethod
+    def coerce(cls, value) -> 'AnswerFormat':
+        """
+        Build an AnswerFormat from an instance, a dict, or a regex string.
+        
+        Args:
+            value: AnswerFormat, dict of constructor arguments, or pattern
+        
+        Returns:
+            AnswerFormat: The format
+        
+        Raises:
+            TypeError: If ``value`` cannot be converted
+        """
+        if isinstance(value, cls):
+            return value
+        if isinstance(value, dict):
+            return cls(**value)
+        if isinstance(value, (str, re.Pattern)):
+            return cls(pattern=value)
+        raise TypeError(f"Cannot use {type(value).__name__} as an answer format")
+    
+    def __repr__(self):
+        parts = []
+        if self.length is not None:
+            parts.append(f"length={self.length}")
+        if self.charset is not None:
+            parts.append(f"charset={self.charset!r}")
+        if self.pattern is not None:
+            parts.append(f"pattern={self.pattern.pattern!r}")
+        return f"<AnswerFormat({', '.join(parts)})>"
@@ -0,0 +1,164 @@
+"""
+FastCaptcha Hedged Requests
+~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+Cuts tail latency by sending a duplicate of a slow request.
+
+If a solve has not finished within the hedge threshold - fixed, or the
+observed p95 latency - an identical request is sent and whichever answers
+first wins. Hedges are capped to a fraction of total traffic and take a
+rate-limiter token without waiting, so they are skipped rather than
+allowed to cause throttling.
+
+A request already on the wire cannot be aborted over a synchronous HTTP
+connection; the losing request is cancelled if it has not started and
+its response is discarded otherwise.
+"""
+
+import threading
+from typing import Optional
+
+from .metrics import LatencyWindow
+
+
+class HedgePolicy:
+    """
+    When and how often to hedge solve requests.
+    
+    Args:
+        delay (float, optional): Fixed seconds before hedging. Defaults to
+            None (use the observed ``percentile`` latency).
+        percentile (float, optional): Latency percentile used as the
+            threshold when ``delay`` is None. Defaults to 0.95.
+        max_extra_fraction (float, optional): Largest share of extra
+            requests hedging may add. Defaults to 0.05.
+        min_samples (int, optional): Latency samples needed before an
+            adaptive threshold is used. Defaults to 20.
+        min_delay (float, optional): Lower bound on the threshold.
+            Defaults to 0.05.
+    
+    Example:
+        >>> solver = FastCaptcha(api_key='your-api-key', hedge=HedgePolicy())
+    """
+    
+    def __init__(
+        self,
+        delay: Optional[float] = None,
+        percentile: float = 0.95,
+        max_extra_fraction: float = 0.05,
+        min_samples: int = 20,
+        min_delay: float = 0.05
+    ):
+        self.delay = delay
+        self.percentile = percentile
+        self.max_extra_fraction = max_extra_fraction
+        self.min_samples = min_samples
+        self.min_delay = min_delay
+        self._lock = threading.Lock()
+        self._stats = {
+            'requests': 0,
+            'hedged': 0,
+            'hedge_wins': 0,
+            'budget_denied': 0,
+            'rate_limited': 0,
+        }
+    
+    @classmethod
+    def coerce(cls, value) -> 'HedgePolicy':
+        """
+        Build a HedgePolicy from an instance, True, or a fixed delay.
+        
+        Args:
+            value: HedgePolicy, True for the adaptive defaults, or seconds
+        
+        Returns:
+            HedgePolicy: The policy
+        
+        Raises:
+            TypeError: If ``value`` cannot be converted
+        """
+        if isinstance(value, cls):
+            return value
+        if value is True:
+            return cls()
+        if isinstance(value, (int, float)) and not isinstance(value, bool):
+            return cls(delay=float(value))
+        raise TypeError(f"Cannot use {type(value).__name__} as a hedge policy")
+    
+    def threshold(self, latencies: LatencyWindow) -> Optional[float]:
+        """
+        Get the current hedge threshold.
+        
+        Args:
+            latencies: Recently observed solve latencies
+        
+        Returns:
+            float: Seconds to wait before hedging, or None to not hedge yet
+        """
+        if self.delay is not None:
+            return self.delay
+        if len(latencies) < self.min_samples:
+            return None
+        value = latencies.percentile(self.percentile)
+        if value is None:
+            return None
+        return max(self.min_delay, value)
+    
+    def record_request(self):
+        """Count a primary request toward the hedge budget."""
+        with self._lock:
+            self._stats['requests'] += 1
+    
+    def reserve(self) -> bool:
+        """
+        Claim one hedge if it stays within ``max_extra_fraction``.
+        
+        The check and the count are one step, so concurrent callers cannot
+        overshoot the budget between them.
+        
+        Returns:
+            bool: True if a hedge may be sent
+        """
+        with self._lock:
+            allowance = self.max_extra_fraction * self._stats['requests']
+            if self._stats['hedged'] + 1 > allowance:
+                self._stats['budget_denied'] += 1
+                return False
+            self._stats['hedged'] += 1
+            return True
+    
+    def release(self, reason: str):
+        """
+        Give back a hedge claimed with :meth:`reserve` but not sent.
+        
+        Args:
+            reason: Counter to increment instead, e.g. ``'rate_limited'``
+        """
+        with self._lock:
+            self._stats['hedged'] -= 1
+            self._stats[reason] += 1
+    
+    def record(self, name: str):
+        """Increment a hedging counter."""
+        with self._lock:
+            self._stats[name] += 1
+    
+    def stats(self) -> dict:
+        """
+        Get hedging counters.
+        
+        Returns:
+            dict: Requests, hedges sent, hedge wins, denials and the
+            fraction of extra traffic added
+        """
+        with self._lock:
+            stats: dict = dict(self._stats)
+        requests = stats['requests']
+        stats['extra_fraction'] = stats['hedged'] / requests if requests else 0.0
+        return stats
+    
+    def __repr__(self):
+        return (
+            f"<HedgePolicy(delay={self.delay}, percentile={self.percentile}, "
+            f"max_extra_fraction={self.max_extra_fraction})>"
+        )
@@ -0,0 +1,7 @@
+"""
+FastCaptcha Integrations
+~~~~~~~~~~~~~~~~~~~~~~~~
+
+Helpers for solving CAPTCHAs directly from third-party automation tools.
+Each integration is imported on demand so its dependencies stay optional.
+"""
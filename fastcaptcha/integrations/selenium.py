@@ -0,0 +1,189 @@
+"""
+FastCaptcha Selenium Integration
+~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+Solve CAPTCHAs straight from Selenium WebElements without touching disk.
+
+The image is taken, in order of preference, from a raster ``data:`` URI in
+the element's ``src`` attribute (sent to the API without re-encoding), from
+a crop of an already captured page screenshot, or from the element's own
+``screenshot_as_png`` bytes.
+
+Example:
+    >>> from fastcaptcha import FastCaptcha
+    >>> from fastcaptcha.integrations.selenium import solve_element
+    >>> solver = FastCaptcha(api_key='your-api-key')
+    >>> element = driver.find_element(By.ID, 'captcha-image')
+    >>> result = solve_element(solver, element)
+"""
+
+import io
+from typing import Optional
+
+from ..exceptions import InvalidImageError
+
+# Vector images are rendered by the browser; only their pixels can be solved
+_VECTOR_TYPES = frozenset({'image/svg+xml'})
+
+_RECT_SCRIPT = (
+    "var r = arguments[0].getBoundingClientRect();"
+    "return [r.left, r.top, r.width, r.height, window.devicePixelRatio || 1];"
+)
+
+
+def data_uri_payload(src: Optional[str]) -> Optional[str]:
+    """
+    Extract the base64 payload from a raster image ``data:`` URI.
+    
+    Args:
+        src: Value of an element's ``src`` attribute
+    
+    Returns:
+        str: Base64 payload, or None if ``src`` is not a base64 data URI
+        of a raster ``image/*`` type
+    """
+    if not src or not src.startswith('data:'):
+        return None
+    
+    header, sep, payload = src.partition(',')
+    if not sep or not header.endswith(';base64'):
+        return None
+    
+    media_type = header[len('data:'):].split(';', 1)[0].strip().lower()
+    if not media_type.startswith('image/') or media_type in _VECTOR_TYPES:
+        return None
+    
+    return payload
+
+
+class PageScreenshot:
+    """
+    A single full-page screenshot that CAPTCHA elements are cropped from.
+    
+    Taking one viewport screenshot and cropping every element out of it
+    replaces one WebDriver screenshot round trip per element. Cropping
+    requires Pillow (``pip install fastcaptcha-api[selenium]``).
+    
+    Args:
+        driver: Selenium WebDriver instance
+    
+    Example:
+        >>> page = PageScreenshot(driver)
+        >>> png = page.crop(driver.find_element(By.ID, 'captcha-image'))
+    """
+    
+    def __init__(self, driver):
+        self.driver = driver
+        self.png = driver.get_screenshot_as_png()
+        self._image = None
+    
+    def _load(self):
+        if self._image is None:
+            try:
+                from PIL import Image
+            except ImportError:
+                raise ImportError(
+                    "Cropping from a page screenshot requires Pillow. "
+                    "Install it with: pip install fastcaptcha-api[selenium]"
+                )
+            self._image = Image.open(io.BytesIO(self.png))
+            self._image.load()
+        return self._image
+    
+    def crop(self, element) -> bytes:
+        """
+        Crop an element out of the page screenshot.
+        
+        Args:
+            element: Selenium WebElement visible in the viewport
+        
+        Returns:
+            bytes: PNG-encoded image of the element
+        
+        Raises:
+            InvalidImageError: If the element lies outside the screenshot
+        """
+        image = self._load()
+        left, top, width, height, ratio = self.driver.execute_script(
+            _RECT_SCRIPT, element
+        )
+        box = (
+            max(0, int(round(left * ratio))),
+            max(0, int(round(top * ratio))),
+            min(image.width, int(round((left + width) * ratio))),
+            min(image.height, int(round((top + height) * ratio))),
+        )
+        if box[2] <= box[0] or box[3] <= box[1]:
+            raise InvalidImageError(
+                "CAPTCHA element is outside the captured viewport"
+            )
+        
+        buffer = io.BytesIO()
+        image.crop(box).save(buffer, format='PNG')
+        return buffer.getvalue()
+
+
+def element_image(element, screenshot: Optional[PageScreenshot] = None) -> bytes:
+    """
+    Get the PNG bytes of an element from memory.
+    
+    Args:
+        element: Selenium WebElement
+        screenshot: Page screenshot to crop from instead of capturing the
+            element separately (optional)
+    
+    Returns:
+        bytes: PNG-encoded image of the element
+    """
+    if screenshot is not None:
+        return screenshot.crop(element)
+    png: bytes = element.screenshot_as_png
+    return png
+
+
+def solve_element(
+    solver,
+    element,
+    screenshot: Optional[PageScreenshot] = None,
+    use_src: bool = True,
+    **kwargs
+) -> str:
+    """
+    Solve the CAPTCHA shown by a WebElement entirely in memory.
+    
+    Args:
+        solver: FastCaptcha instance
+        element: Selenium WebElement showing the CAPTCHA
+        screenshot: Page screenshot to crop from (optional)
+        use_src: Send a base64 raster ``data:`` URI from ``src`` directly
+            when present; a payload failing local validation falls back to
+            the screenshot (default: True)
+        **kwargs: Additional parameters to pass to the API
+    
+    Returns:
+        str: Solved CAPTCHA text
+    
+    Raises:
+        InvalidImageError: If no image can be taken from the element
+        APIError: If API request fails
+        TimeoutError: If request times out
+    
+    Example:
+        >>> page = PageScreenshot(driver)
+        >>> for element in driver.find_elements(By.CSS_SELECTOR, 'img.captcha'):
+        ...     print(solve_element(solver, element, screenshot=page))
+    """
+    text: str
+    if use_src:
+        payload = data_uri_payload(element.get_attribute('src'))
+        if payload:
+            try:
+                text = solver.solve_base64(payload, **kwargs)
+                return text
+            except InvalidImageError as e:
+                # Rejected by the API, not by local validation
+                if e.status_code is not None:
+                    raise
+    
+    text = solver.solve_bytes(element_image(element, screenshot), **kwargs)
+    return text
@@ -0,0 +1,308 @@
+"""
+FastCaptcha Load Generator
+~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+Open-loop load generation for soak and scaling tests of a solver.
+
+Requests are issued at a target arrival rate whether or not earlier
+requests have finished, so latency includes any queueing inside the client
+and saturation shows up as growing latency and in-flight counts instead of
+silently lowering the offered load. Throughput, latency percentiles, error
+mix, memory (tracemalloc and RSS) and open file descriptors are reported
+for every interval.
+
+Run it against the local stand-in server with ``fastcaptcha loadgen``, or:
+
+   >>> from fastcaptcha import FastCaptcha
+   >>> from fastcaptcha.loadgen import LoadGenerator, ramp
+   >>> from fastcaptcha.testing import FakeAPIServer
+   >>> with FakeAPIServer(latency=0.3) as server:
+   ...     solver = FastCaptcha(api_key='test-key', base_url=server.url)
+   ...     report = LoadGenerator(solver, ramp(10, 100, 10, 5)).run(print)
+"""
+
+import random
+import threading
+import time
+import tracemalloc
+from collections import Counter, namedtuple
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, List, Optional, Sequence
+
+from .metrics import LatencyHistogram, open_fd_count, rss_bytes
+from .testing import make_image
+
+Stage = namedtuple('Stage', ['rate', 'duration'])
+Stage.__doc__ = "Constant arrival ``rate`` (requests/second) for ``duration`` seconds."
+
+
+def ramp(
+    start_rate: float,
+    stop_rate: float,
+    step: float,
+    step_duration: float
+) -> List[Stage]:
+    """
+    Build stages that raise the arrival rate step by step.
+    
+    Args:
+        start_rate: First arrival rate in requests per second
+        stop_rate: Last arrival rate in requests per second
+        step: Rate increase between stages
+        step_duration: Seconds spent at each rate
+    
+    Returns:
+        list: Stages from ``start_rate`` up to ``stop_rate``
+    """
+    if step <= 0:
+        raise ValueError("step must be positive")
+    
+    stages = []
+    rate = start_rate
+    while rate <= stop_rate + 1e-9:
+        stages.append(Stage(rate, step_duration))
+        rate += step
+    return stages
+
+
+class LoadGenerator:
+    """
+    Drives a solver at target arrival rates and reports how it copes.
+    
+    Args:
+        solver: FastCaptcha (or DaemonClient) to drive via ``solve_bytes``
+        stages (list): Stages of ``(rate, duration)`` to run in order
+        images (list, optional): Image bytes to cycle through. Defaults to
+            synthetic images the fake server answers directly.
+        max_concurrency (int, optional): Worker threads issuing requests;
+            arrivals beyond this wait in a queue. Defaults to 256.
+        report_interval (float, optional): Seconds per report. Defaults to 1.
+        poisson (bool, optional): Exponentially distributed gaps between
+            arrivals instead of even spacing. Defaults to True.
+        trace_memory (bool, optional): Track Python allocations with
+            tracemalloc. Defaults to True.
+        seed (int, optional): Random seed for arrival times.
+    """
+    
+    def __init__(
+        self,
+        solver,
+        stages: Sequence[Stage],
+        images: Optional[Sequence[bytes]] = None,
+        max_concurrency: int = 256,
+        report_interval: float = 1.0,
+        poisson: bool = True,
+        trace_memory: bool = True,
+        seed: Optional[int] = None
+    ):
+        self.solver = solver
+        self.stages = [Stage(*stage) for stage in stages]
+        self.images = list(images) if images else [
+            make_image('LOAD%02d' % i) for i in range(64)
+        ]
+        self.max_concurrency = max_concurrency
+        self.report_interval = report_interval
+        self.poisson = poisson
+        self.trace_memory = trace_memory
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self._reset_totals()
+    
+    def _reset_totals(self):
+        # Histograms keep the tool's own memory flat over long soak runs
+        self._latencies = LatencyHistogram()
+        self._service = LatencyHistogram()
+        self._errors = Counter()
+        self._offered = 0
+        self._completed = 0
+        self._interval = self._new_interval()
+        self._target_rate = 0.0
+    
+    @staticmethod
+    def _new_interval() -> dict:
+        return {'offered': 0, 'latencies': LatencyHistogram(), 'errors': Counter()}
+    
+    def _task(self, image: bytes, intended: float):
+        started = time.monotonic()
+        error = None
+        try:
+            self.solver.solve_bytes(image)
+        except Exception as e:
+            error = type(e).__name__
+        finished = time.monotonic()
+        
+        with self._lock:
+            latency = finished - intended
+            self._latencies.add(latency)
+            self._service.add(finished - started)
+            self._completed += 1
+            self._interval['latencies'].add(latency)
+            if error is not None:
+                self._errors[error] += 1
+                self._interval['errors'][error] += 1
+    
+    def _snapshot(self, started: float, interval_start: float) -> dict:
+        now = time.monotonic()
+        with self._lock:
+            interval, self._interval = self._interval, self._new_interval()
+            in_flight = self._offered - self._completed
+            target_rate = self._target_rate
+        
+        elapsed = max(now - interval_start, 1e-9)
+        report = {
+            'elapsed': now - started,
+            'target_rate': target_rate,
+            'offered': interval['offered'],
+            'completed': len(interval['latencies']),
+            'throughput': len(interval['latencies']) / elapsed,
+            'latency': interval['latencies'].summary(),
+            'errors': dict(interval['errors']),
+            'in_flight': in_flight,
+            'threads': threading.active_count(),
+            'rss': rss_bytes(),
+            'open_fds': open_fd_count(),
+        }
+        if tracemalloc.is_tracing():
+            report['traced_memory'], report['traced_peak'] = (
+                tracemalloc.get_traced_memory()
+            )
+        return report
+    
+    def run(self, on_report: Optional[Callable[[dict], None]] = None) -> dict:
+        """
+        Run all stages and return the final report.
+        
+        Args:
+            on_report: Called with each interval report while running
+        
+        Returns:
+            dict: Totals, latency summaries, error mix, resource growth and
+            the ``timeline`` of interval reports
+        """
+        self._reset_totals()
+        started_tracing = False
+        if self.trace_memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            started_tracing = True
+        
+        rss_start = rss_bytes()
+        fds_start = open_fd_count()
+        traced_start = None
+        if tracemalloc.is_tracing():
+            traced_start = tracemalloc.get_traced_memory()[0]
+        timeline = []
+        done = threading.Event()
+        started = time.monotonic()
+        
+        def report_loop():
+            interval_start = started
+            while not done.wait(self.report_interval):
+                report = self._snapshot(started, interval_start)
+                interval_start = time.monotonic()
+                timeline.append(report)
+                if on_report is not None:
+                    on_report(report)
+        
+        reporter = threading.Thread(
+            target=report_loop, name='fastcaptcha-loadgen-report', daemon=True
+        )
+        reporter.start()
+        
+        executor = ThreadPoolExecutor(
+            max_workers=self.max_concurrency,
+            thread_name_prefix='fastcaptcha-loadgen'
+        )
+        try:
+            self._schedule(executor, started)
+            executor.shutdown(wait=True)
+        finally:
+            done.set()
+            reporter.join()
+        
+        duration = time.monotonic() - started
+        rss_end = rss_bytes()
+        fds_end = open_fd_count()
+        errors = sum(self._errors.values())
+        summary = {
+            'duration': duration,
+            'offered': self._offered,
+            'completed': self._completed,
+            'throughput': self._completed / duration if duration else 0.0,
+            'latency': self._latencies.summary(),
+            'service_latency': self._service.summary(),
+            'errors': dict(self._errors),
+            'error_rate': errors / self._completed if self._completed else 0.0,
+            'rss_start': rss_start,
+            'rss_end': rss_end,
+            'rss_growth': (
+                rss_end - rss_start
+                if rss_start is not None and rss_end is not None else None
+            ),
+            'open_fds_start': fds_start,
+            'open_fds_end': fds_end,
+            'timeline': timeline,
+        }
+        if traced_start is not None:
+            current, peak = tracemalloc.get_traced_memory()
+            summary['traced_growth'] = current - traced_start
+            summary['traced_peak'] = peak
+        if started_tracing:
+            tracemalloc.stop()
+        return summary
+    
+    def _schedule(self, executor: ThreadPoolExecutor, started: float):
+        next_arrival = started
+        count = 0
+        for stage in self.stages:
+            stage_end = next_arrival + stage.duration
+            with self._lock:
+                self._target_rate = stage.rate
+            
+            if stage.rate <= 0:
+                time.sleep(max(0.0, stage_end - time.monotonic()))
+                next_arrival = stage_end
+                continue
+            
+            while next_arrival < stage_end:
+                delay = next_arrival - time.monotonic()
+                if delay > 0:
+                    time.sleep(delay)
+                # Arrivals that are due are submitted even when the client is
+                # behind, so the offered load never adapts to the client.
+                image = self.images[count % len(self.images)]
+                count += 1
+                with self._lock:
+                    self._offered += 1
+                    self._interval['offered'] += 1
+                executor.submit(self._task, image, next_arrival)
+                
+                if self.poisson:
+                    next_arrival += self._random.expovariate(stage.rate)
+                else:
+                    next_arrival += 1.0 / stage.rate
+            next_arrival = stage_end
+
+
+def format_report(report: dict) -> str:
+    """
+    Format an interval report as one line of text.
+    
+    Args:
+        report: Interval report from :meth:`LoadGenerator.run`
+    
+    Returns:
+        str: Human-readable summary line
+    """
+    latency = report['latency']
+    rss = report.get('rss')
+    errors = ', '.join(
+        f"{name}={count}" for name, count in sorted(report['errors'].items())
+    )
+    return (
+        f"[{report['elapsed']:7.1f}s] target={report['target_rate']:.0f}/s "
+        f"done={report['throughput']:.1f}/s in_flight={report['in_flight']} "
+        f"p50={latency['p50'] * 1000:.0f}ms p99={latency['p99'] * 1000:.0f}ms "
+        f"rss={(rss or 0) / 1048576:.1f}MB fds={report.get('open_fds')} "
+        f"threads={report['threads']}"
+        + (f" errors[{errors}]" if errors else '')
+    )
@@ -0,0 +1,242 @@
+"""
+FastCaptcha Metrics Helpers
+~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+Small helpers for latency statistics and process resource usage.
+"""
+
+import math
+import os
+import sys
+import threading
+from array import array
+from collections import deque
+from typing import Deque, Optional, Sequence
+
+
+def percentile(sorted_values: Sequence[float], q: float) -> float:
+    """
+    Get a percentile from already sorted values by linear interpolation.
+    
+    Args:
+        sorted_values: Values sorted in ascending order
+        q: Percentile as a fraction between 0 and 1 (e.g. 0.99)
+    
+    Returns:
+        float: The percentile, or 0.0 if there are no values
+    """
+    if not sorted_values:
+        return 0.0
+    
+    position = (len(sorted_values) - 1) * q
+    lower = int(position)
+    upper = min(lower + 1, len(sorted_values) - 1)
+    fraction = position - lower
+    return sorted_values[lower] + (sorted_values[upper] - sorted_values[lower]) * fraction
+
+
+def latency_summary(values: Sequence[float]) -> dict:
+    """
+    Summarize latencies with the usual percentiles.
+    
+    Args:
+        values: Latencies in seconds, in any order
+    
+    Returns:
+        dict: ``count``, ``mean``, ``p50``, ``p90``, ``p99`` and ``max``
+    """
+    ordered = sorted(values)
+    return {
+        'count': len(ordered),
+        'mean': sum(ordered) / len(ordered) if ordered else 0.0,
+        'p50': percentile(ordered, 0.50),
+        'p90': percentile(ordered, 0.90),
+        'p99': percentile(ordered, 0.99),
+        'max': ordered[-1] if ordered else 0.0,
+    }
+
+
+def rss_bytes() -> Optional[int]:
+    """
+    Get the resident set size of this process.
+    
+    Returns:
+        int: RSS in bytes, or None if it cannot be determined
+    """
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError, AttributeError):
+        pass
+    
+    try:
+        import resource
+    except ImportError:
+        return None
+    # Peak rather than current RSS; reported in bytes on macOS, KiB elsewhere
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak if sys.platform == 'darwin' else peak * 1024
+
+
+def open_fd_count() -> Optional[int]:
+    """
+    Count the open file descriptors of this process.
+    
+    Returns:
+        int: Open descriptors, or None if they cannot be listed
+    """
+    for path in ('/proc/self/fd', '/dev/fd'):
+        try:
+            return len(os.listdir(path))
+        except OSError:
+            continue
+    return None
+
+
+class LatencyWindow:
+    """
+    Thread-safe rolling window of recent latencies.
+    
+    Args:
+        size (int, optional): Number of most recent samples kept.
+            Defaults to 1000.
+    
+    Example:
+        >>> window = LatencyWindow()
+        >>> window.add(0.28)
+        >>> window.percentile(0.95)
+        0.28
+    """
+    
+    def __init__(self, size: int = 1000):
+        self._samples: Deque[float] = deque(maxlen=size)
+        self._lock = threading.Lock()
+    
+    def add(self, latency: float):
+        """Record one latency in seconds."""
+        with self._lock:
+            self._samples.append(latency)
+    
+    def __len__(self):
+        return len(self._samples)
+    
+    def percentile(self, q: float) -> Optional[float]:
+        """
+        Get a percentile of the window.
+        
+        Args:
+            q: Percentile as a fraction between 0 and 1
+        
+        Returns:
+            float: The percentile, or None if the window is empty
+        """
+        with self._lock:
+            ordered = sorted(self._samples)
+        if not ordered:
+            return None
+        return percentile(ordered, q)
+    
+    def summary(self) -> dict:
+        """Summarize the window with :func:`latency_summary`."""
+        with self._lock:
+            samples = list(self._samples)
+        return latency_summary(samples)
+
+
+class LatencyHistogram:
+    """
+    Fixed-size histogram of latencies in logarithmic buckets.
+    
+    Memory does not grow with the number of samples, so long soak runs can
+    record every request without adding to the growth they measure.
+    Percentiles are accurate to within ``precision``; the count, mean and
+    maximum are exact. Not thread-safe; callers serialize :meth:`add`.
+    
+    Args:
+        precision (float, optional): Relative width of each bucket.
+            Defaults to 0.01.
+        lowest (float, optional): Smallest latency told apart from zero, in
+            seconds. Defaults to 1e-6.
+        highest (float, optional): Largest latency given its own bucket;
+            longer ones share the top bucket. Defaults to 3600.
+    
+    Example:
+        >>> histogram = LatencyHistogram()
+        >>> histogram.add(0.28)
+        >>> histogram.summary()['p99']
+        0.28
+    """
+    
+    def __init__(
+        self,
+        precision: float = 0.01,
+        lowest: float = 1e-6,
+        highest: float = 3600.0
+    ):
+        self.lowest = lowest
+        self._log_growth = math.log1p(precision)
+        self._log_lowest = math.log(lowest)
+        self._scale = 1.0 / self._log_growth
+        self._top = self._index(highest)
+        self._counts = array('Q', bytes(8 * (self._top + 1)))
+        self.count = 0
+        self.total = 0.0
+        self.min = math.inf
+        self.max = 0.0
+    
+    def _index(self, value: float) -> int:
+        if value <= self.lowest:
+            return 0
+        return int((math.log(value) - self._log_lowest) * self._scale) + 1
+    
+    def add(self, latency: float):
+        """Record one latency in seconds."""
+        # Inlined _index and min/max: this runs once per request
+        index = 0
+        if latency > self.lowest:
+            index = int((math.log(latency) - self._log_lowest) * self._scale) + 1
+            if index > self._top:
+                index = self._top
+        self._counts[index] += 1
+        self.count += 1
+        self.total += latency
+        if latency < self.min:
+            self.min = latency
+        if latency > self.max:
+            self.max = latency
+    
+    def __len__(self):
+        return self.count
+    
+    def percentile(self, q: float) -> float:
+        """
+        Get an approximate percentile.
+        
+        Args:
+            q: Percentile as a fraction between 0 and 1
+        
+        Returns:
+            float: The percentile, or 0.0 if nothing was recorded
+        """
+        if not self.count:
+            return 0.0
+        rank = q * (self.count - 1)
+        seen = 0
+        for index, count in enumerate(self._counts):
+            seen += count
+            if seen > rank:
+                break
+        # Geometric middle of the bucket, clamped to what was observed
+        value = self.lowest * math.exp((index - 0.5) * self._log_growth)
+        return min(self.max, max(self.min, value))
+    
+    def summary(self) -> dict:
+        """Summarize like :func:`latency_summary`."""
+        return {
+            'count': self.count,
+            'mean': self.total / self.count if self.count else 0.0,
+            'p50': self.percentile(0.50),
+            'p90': self.percentile(0.90),
+            'p99': self.percentile(0.99),
+            'max': self.max,
+        }
@@ -0,0 +1,85 @@
+"""
+FastCaptcha Rate Limiting
+~~~~~~~~~~~~~~~~~~~~~~~~~
+
+Client-side token-bucket rate limiter shared by all threads using a solver.
+"""
+
+import threading
+import time
+from typing import Optional
+
+
+class RateLimiter:
+    """
+    Thread-safe token bucket limiting requests per second.
+    
+    Args:
+        rate (float): Sustained requests per second
+        burst (int, optional): Bucket capacity. Defaults to ``max(1, rate)``.
+    
+    Example:
+        >>> limiter = RateLimiter(rate=5)
+        >>> limiter.acquire()  # blocks until a token is available
+        True
+    """
+    
+    def __init__(self, rate: float, burst: Optional[int] = None):
+        if rate <= 0:
+            raise ValueError("rate must be positive")
+        
+        self.rate = float(rate)
+        self.burst = float(burst if burst is not None else max(1, int(rate)))
+        self._tokens = self.burst
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+    
+    def _refill(self, now: float):
+        elapsed = now - self._updated
+        if elapsed > 0:
+            self._tokens = min(self.burst, self._tokens + elapsed * self.rate)
+            self._updated = now
+    
+    def try_acquire(self) -> bool:
+        """
+        Take a token without waiting.
+        
+        Returns:
+            bool: True if a token was taken, False if the bucket is empty
+        """
+        with self._lock:
+            self._refill(time.monotonic())
+            if self._tokens >= 1:
+                self._tokens -= 1
+                return True
+            return False
+    
+    def acquire(self, timeout: Optional[float] = None) -> bool:
+        """
+        Take a token, waiting for one to become available.
+        
+        Args:
+            timeout: Maximum seconds to wait (optional, waits forever)
+        
+        Returns:
+            bool: True if a token was taken, False if timeout expired
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._refill(now)
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return True
+                wait = (1 - self._tokens) / self.rate
+            
+            if deadline is not None:
+                remaining = deadline - now
+                if remaining <= 0:
+                    return False
+                wait = min(wait, remaining)
+            time.sleep(wait)
+    
+    def __repr__(self):
+        return f"<RateLimiter(rate={self.rate}, burst={int(self.burst)})>"
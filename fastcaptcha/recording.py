@@ -0,0 +1,284 @@
+"""
+FastCaptcha Record and Replay
+~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+Capture API traffic to a cassette file and serve it back offline.
+
+:class:`RecordingTransport` wraps any transport and appends every exchange
+- method, URL, request-body hash, status, response and the real elapsed
+time - to a JSON-lines cassette, gzip-compressed when the path ends in
+``.gz``. Request headers and bodies are never written, so cassettes hold
+no API keys or uploaded images. Query strings, which often carry tokens in
+signed image URLs, are replaced by their hash in URLs and redirect
+``Location`` headers. Response bodies are written, so images downloaded by
+:meth:`FastCaptcha.solve_url` are stored (base64 encoded) and can be
+replayed; pass ``url_prefix`` to record only exchanges with the API.
+
+:class:`ReplayTransport` answers from a cassette, either at the recorded
+latency or as fast as possible, so the whole client stack can be
+benchmarked repeatably without network, credits or rate limits:
+
+   >>> solver = FastCaptcha(api_key='your-api-key', record_to='solves.jsonl.gz')
+   >>> solver.solve('captcha.png')
+   >>> solver.close()
+   >>> offline = FastCaptcha(api_key='your-api-key',
+   ...                       transport=ReplayTransport('solves.jsonl.gz'))
+   >>> offline.solve('captcha.png')
+
+Exchanges are matched on method, URL path, query hash and request-body
+hash; requests with no exact match get the recorded responses for the same method and
+path in turn, so a replay can drive different images than the recording.
+A recorded exchange slower than the caller's read timeout is replayed as a
+timeout.
+"""
+
+import base64
+import gzip
+import hashlib
+import json
+import re
+import threading
+import time
+from collections import defaultdict
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Union
+from urllib.parse import urlsplit, urlunsplit
+
+from .transport import (
+    Response, Transport, TransportError, TransportTimeout, _split_timeout
+)
+
+CASSETTE_VERSION = 1
+
+_HASHED_QUERY = re.compile(r'~[0-9a-f]{16}')
+
+
+def body_hash(body: Optional[bytes]) -> Optional[str]:
+    """
+    Get the short hash identifying a request body in a cassette.
+    
+    Args:
+        body: Encoded request body
+    
+    Returns:
+        str: First 16 hex digits of the SHA-256, or None for no body
+    """
+    if not body:
+        return None
+    return hashlib.sha256(body).hexdigest()[:16]
+
+
+def _open(path: Union[str, Path], mode: str):
+    if str(path).endswith('.gz'):
+        return gzip.open(path, mode + 't', encoding='utf-8')
+    return open(path, mode, encoding='utf-8')
+
+
+def redact_url(url: str) -> str:
+    """
+    Replace a URL's query string by its hash, as written to cassettes.
+    
+    Args:
+        url: Request URL
+    
+    Returns:
+        str: The URL with the query replaced by ``~`` and 16 hex digits of
+        its SHA-256; URLs without a query, or already redacted, unchanged
+    """
+    parts = urlsplit(url)
+    if not parts.query or _HASHED_QUERY.fullmatch(parts.query):
+        return url
+    digest = hashlib.sha256(parts.query.encode('utf-8')).hexdigest()[:16]
+    return urlunsplit(parts._replace(query='~' + digest, fragment=''))
+
+
+def _path_of(url: str) -> str:
+    parts = urlsplit(url)
+    return parts.path + ('?' + parts.query if parts.query else '')
+
+
+def read_cassette(path: Union[str, Path]) -> Iterator[dict]:
+    """
+    Iterate over the exchanges recorded in a cassette.
+    
+    Args:
+        path: Cassette file path
+    
+    Yields:
+        dict: One recorded exchange
+    
+    Raises:
+        ValueError: If the file is not a cassette of a supported version
+    """
+    with _open(path, 'r') as f:
+        header = json.loads(f.readline() or '{}')
+        if header.get('cassette') != CASSETTE_VERSION:
+            raise ValueError(f"Not a version {CASSETTE_VERSION} cassette: {path}")
+        for line in f:
+            if line.strip():
+                yield json.loads(line)
+
+
+class RecordingTransport(Transport):
+    """
+    Transport that records every exchange of another transport.
+    
+    Args:
+        inner (Transport): Transport that sends the requests
+        path (str or Path): Cassette to write; ``.gz`` paths are compressed
+        url_prefix (str, optional): Only record exchanges whose URL starts
+            with this; others are sent but not written. Defaults to None
+            (record everything, including image downloads).
+    
+    Example:
+        >>> transport = RecordingTransport(create_transport('urllib3'), 'run.jsonl.gz')
+        >>> solver = FastCaptcha(api_key='your-api-key', transport=transport)
+    """
+    
+    name = 'recording'
+    
+    def __init__(
+        self,
+        inner: Transport,
+        path: Union[str, Path],
+        url_prefix: Optional[str] = None
+    ):
+        super().__init__()
+        self.inner = inner
+        self.path = path
+        self.url_prefix = url_prefix
+        self._lock = threading.Lock()
+        self._started = time.monotonic()
+        self._file = _open(path, 'w')
+        self._write({'cassette': CASSETTE_VERSION, 'created': time.time()})
+    
+    def _write(self, entry: dict):
+        line = json.dumps(entry, separators=(',', ':')) + '\n'
+        with self._lock:
+            if self._file is not None:
+                self._file.write(line)
+    
+    def request(self, method, url, headers, body=None, timeout=None):
+        self._count()
+        if self.url_prefix is not None and not url.startswith(self.url_prefix):
+            return self.inner.request(method, url, headers, body, timeout)
+        entry = {
+            't': round(time.monotonic() - self._started, 6),
+            'method': method,
+            'url': redact_url(url),
+            'body_hash': body_hash(body),
+        }
+        started = time.perf_counter()
+        try:
+            response = self.inner.request(method, url, headers, body, timeout)
+        except TransportTimeout as e:
+            entry.update(error='timeout', message=str(e))
+            raise
+        except TransportError as e:
+            entry.update(error='error', message=str(e))
+            raise
+        else:
+            entry['status'] = response.status_code
+            entry['headers'] = {
+                key.lower(): value for key, value in response.headers.items()
+            }
+            if 'location' in entry['headers']:
+                entry['headers']['location'] = redact_url(entry['headers']['location'])
+            try:
+                entry['body'] = response.content.decode('utf-8')
+            except UnicodeDecodeError:
+                entry['body_b64'] = base64.b64encode(response.content).decode('ascii')
+            return response
+        finally:
+            entry['elapsed'] = round(time.perf_counter() - started, 6)
+            self._write(entry)
+    
+    def connection_pool(self, url):
+        return self.inner.connection_pool(url)
+    
+    def close(self):
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+        self.inner.close()
+    
+    def __repr__(self):
+        return f"<RecordingTransport(inner={self.inner!r}, path='{self.path}')>"
+
+
+class ReplayTransport(Transport):
+    """
+    Transport answering from a recorded cassette without any network.
+    
+    Args:
+        path (str or Path): Cassette written by :class:`RecordingTransport`
+        speed (float, optional): Replay latency as recorded divided by this
+            factor; None answers immediately. Defaults to 1.0.
+    
+    Raises:
+        ValueError: If the file is not a cassette
+    
+    Example:
+        >>> solver = FastCaptcha(api_key='your-api-key',
+        ...                      transport=ReplayTransport('run.jsonl.gz', speed=None))
+    """
+    
+    name = 'replay'
+    
+    def __init__(self, path: Union[str, Path], speed: Optional[float] = 1.0):
+        super().__init__()
+        self.path = path
+        self.speed = speed
+        self._lock = threading.Lock()
+        self._exact = defaultdict(list)
+        self._by_path = defaultdict(list)
+        for entry in read_cassette(path):
+            key = (entry['method'], _path_of(entry['url']))
+            self._exact[key + (entry.get('body_hash'),)].append(entry)
+            self._by_path[key].append(entry)
+        self._cursors: Dict[tuple, int] = defaultdict(int)
+        self.misses = 0
+    
+    def _next(self, key: tuple, entries: List[dict]) -> dict:
+        with self._lock:
+            index = self._cursors[key]
+            self._cursors[key] = index + 1
+        return entries[index % len(entries)]
+    
+    def request(self, method, url, headers, body=None, timeout=None):
+        self._count()
+        key = (method, _path_of(redact_url(url)))
+        exact = key + (body_hash(body),)
+        if exact in self._exact:
+            entry = self._next(exact, self._exact[exact])
+        elif key in self._by_path:
+            with self._lock:
+                self.misses += 1
+            entry = self._next(key, self._by_path[key])
+        else:
+            raise TransportError(f"No recorded response for {method} {_path_of(url)}")
+        
+        elapsed = entry['elapsed']
+        read_timeout = _split_timeout(timeout)[1]
+        timed_out = read_timeout is not None and elapsed > read_timeout
+        if timed_out:
+            elapsed = read_timeout
+        if self.speed:
+            time.sleep(elapsed / self.speed)
+        
+        if timed_out:
+            raise TransportTimeout(f"Read timed out after {read_timeout} seconds")
+        if entry.get('error') == 'timeout':
+            raise TransportTimeout(entry.get('message', 'Recorded timeout'))
+        if 'error' in entry:
+            raise TransportError(entry.get('message', 'Recorded error'))
+        
+        if 'body_b64' in entry:
+            content = base64.b64decode(entry['body_b64'])
+        else:
+            content = entry.get('body', '').encode('utf-8')
+        return Response(entry['status'], content, entry.get('headers'))
+    
+    def __repr__(self):
+        return f"<ReplayTransport(path='{self.path}', speed={self.speed})>"
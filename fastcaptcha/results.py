@@ -0,0 +1,328 @@
+"""
+FastCaptcha Batch Results
+~~~~~~~~~~~~~~~~~~~~~~~~~
+
+Compact, columnar storage for the results of large batch runs.
+
+A list of dicts costs several hundred bytes per solve. :class:`ResultStore`
+keeps each field in its own typed ``array`` buffer instead - answers as
+one UTF-8 byte buffer with offsets, error classes as small integer codes -
+so a result takes a few dozen bytes and millions fit comfortably in
+memory. Results stream out to JSONL or CSV row by row, convert to Arrow or
+Parquet when pyarrow is installed (``pip install fastcaptcha-api[arrow]``),
+and summarize cheaply:
+
+   >>> from fastcaptcha.results import ResultStore
+   >>> store = ResultStore(labels=files)
+   >>> for _ in solver.solve_stream(files, store=store):
+   ...     pass
+   >>> store.stats()['success_rate']
+   0.998
+   >>> store.to_csv('results.csv')
+"""
+
+import csv
+import json
+import math
+import threading
+from array import array
+from collections import Counter, namedtuple
+from pathlib import Path
+from typing import IO, Iterator, List, Optional, Sequence, Union
+
+from .metrics import LatencyHistogram
+
+Result = namedtuple(
+    'Result',
+    ['id', 'answer', 'status_code', 'latency', 'processing_time', 'error']
+)
+Result.__doc__ = "One stored solve; ``answer`` is None and ``error`` set on failure."
+
+FIELDS = Result._fields
+
+
+class Answer(str):
+    """
+    Solved CAPTCHA text, with what the API reported about the solve.
+    
+    Behaves exactly like ``str``.
+    
+    Attributes:
+        processing_time (float): Server-side solve time in seconds, or
+            None if the API did not report it
+    """
+    
+    processing_time: Optional[float] = None
+    
+    def __new__(cls, text: str, processing_time: Optional[float] = None):
+        answer = super().__new__(cls, text)
+        answer.processing_time = processing_time
+        return answer
+
+
+def _open_text(target: Union[str, Path, IO], newline: Optional[str] = None):
+    if hasattr(target, 'write'):
+        return target, False
+    return open(target, 'w', encoding='utf-8', newline=newline), True
+
+
+class ResultStore:
+    """
+    Thread-safe columnar collector for batch results.
+    
+    Args:
+        labels (sequence, optional): Input identifiers by index, such as the
+            file list passed to :meth:`FastCaptcha.solve_stream`; exported
+            in place of the index. Defaults to None.
+    
+    Example:
+        >>> store = ResultStore()
+        >>> results = solver.solve_batch(images, store=store)
+        >>> store.stats()['latency']['p99']
+    """
+    
+    def __init__(self, labels: Optional[Sequence] = None):
+        self.labels = labels
+        self._ids = array('q')
+        self._answer_offsets = array('Q', [0])
+        self._answers = bytearray()
+        self._status = array('H')
+        self._latency = array('d')
+        self._processing = array('d')
+        self._errors = array('H')
+        self._error_names: List[Optional[str]] = [None]
+        # Running aggregates keep stats() independent of the row count
+        self._latency_histogram = LatencyHistogram()
+        self._processing_histogram = LatencyHistogram()
+        self._status_counts: Counter = Counter()
+        self._error_counts: Counter = Counter()
+        self._lock = threading.Lock()
+    
+    def add(
+        self,
+        index: int,
+        outcome: Union[str, Exception],
+        latency: float,
+        status_code: Optional[int] = None
+    ):
+        """
+        Record one result.
+        
+        Args:
+            index: Position of the input in the batch
+            outcome: Solved text, or the exception raised
+            latency: Client-side seconds the solve took
+            status_code: HTTP status (default: 200 for answers, the
+                exception's ``status_code`` otherwise, 0 if unknown)
+        """
+        error_name: Optional[str] = None
+        if isinstance(outcome, Exception):
+            answer = b''
+            if status_code is None:
+                status_code = getattr(outcome, 'status_code', None) or 0
+            processing_time = math.nan
+            error_name = type(outcome).__name__
+        else:
+            answer = outcome.encode('utf-8')
+            if status_code is None:
+                status_code = 200
+            reported = getattr(outcome, 'processing_time', None)
+            processing_time = math.nan if reported is None else reported
+        
+        with self._lock:
+            try:
+                error = self._error_names.index(error_name)
+            except ValueError:
+                self._error_names.append(error_name)
+                error = len(self._error_names) - 1
+            self._ids.append(index)
+            self._answers += answer
+            self._answer_offsets.append(len(self._answers))
+            self._status.append(status_code)
+            self._latency.append(latency)
+            self._processing.append(processing_time)
+            self._errors.append(error)
+            self._latency_histogram.add(latency)
+            if not math.isnan(processing_time):
+                self._processing_histogram.add(processing_time)
+            self._status_counts[status_code] += 1
+            self._error_counts[error] += 1
+    
+    def __len__(self):
+        return len(self._ids)
+    
+    def _label(self, index: int):
+        if self.labels is None:
+            return index
+        return str(self.labels[index])
+    
+    def _row(self, position: int) -> Result:
+        error = self._error_names[self._errors[position]]
+        processing_time = self._processing[position]
+        start = self._answer_offsets[position]
+        end = self._answer_offsets[position + 1]
+        return Result(
+            self._label(self._ids[position]),
+            None if error else self._answers[start:end].decode('utf-8'),
+            self._status[position],
+            self._latency[position],
+            None if math.isnan(processing_time) else processing_time,
+            error
+        )
+    
+    def __iter__(self) -> Iterator[Result]:
+        """Iterate over the stored results in the order they were added."""
+        for position in range(len(self)):
+            yield self._row(position)
+    
+    @property
+    def nbytes(self) -> int:
+        """Approximate memory used by the column buffers, in bytes."""
+        columns = (
+            self._ids, self._answer_offsets, self._status,
+            self._latency, self._processing, self._errors
+        )
+        return len(self._answers) + sum(
+            column.itemsize * len(column) for column in columns
+        )
+    
+    def stats(self) -> dict:
+        """
+        Summarize the stored results.
+        
+        Aggregates are kept up to date by :meth:`add`, so this takes the
+        same short time however many results are stored. Percentiles come
+        from :class:`~fastcaptcha.metrics.LatencyHistogram` and are accurate
+        to within 1%.
+        
+        Returns:
+            dict: ``count``, ``succeeded``, ``failed``, ``success_rate``,
+            ``latency`` and ``processing_time`` summaries (see
+            :func:`~fastcaptcha.metrics.latency_summary`), ``status_codes``
+            and ``errors`` by class
+        """
+        with self._lock:
+            count = len(self._ids)
+            codes = dict(self._error_counts)
+            statuses = dict(self._status_counts)
+            latency = self._latency_histogram.summary()
+            processing = self._processing_histogram.summary()
+        
+        failed = count - codes.get(0, 0)
+        return {
+            'count': count,
+            'succeeded': count - failed,
+            'failed': failed,
+            'success_rate': (count - failed) / count if count else 0.0,
+            'latency': latency,
+            'processing_time': processing,
+            'status_codes': statuses,
+            'errors': {
+                self._error_names[code]: n for code, n in codes.items() if code
+            },
+        }
+    
+    def to_jsonl(self, target: Union[str, Path, IO]):
+        """
+        Write one JSON object per result, streaming row by row.
+        
+        Args:
+            target: File path or writable text file
+        """
+        f, owned = _open_text(target)
+        try:
+            for row in self:
+                f.write(json.dumps(row._asdict()) + '\n')
+        finally:
+            if owned:
+                f.close()
+    
+    def to_csv(self, target: Union[str, Path, IO]):
+        """
+        Write the results as CSV with a header row, streaming row by row.
+        
+        Args:
+            target: File path or writable text file
+        """
+        f, owned = _open_text(target, newline='')
+        try:
+            writer = csv.writer(f)
+            writer.writerow(FIELDS)
+            writer.writerows(self)
+        finally:
+            if owned:
+                f.close()
+    
+    def to_arrow(self):
+        """
+        Convert the results to a pyarrow Table.
+        
+        Each column is copied once, as a raw buffer, without creating a
+        Python object per row (except for ``labels``). The table does not
+        share memory with the store, so results can still be added while
+        it is in use.
+        
+        Returns:
+            pyarrow.Table: One column per field
+        
+        Raises:
+            ImportError: If pyarrow is not installed
+        """
+        try:
+            import pyarrow as pa
+            import pyarrow.compute as pc
+        except ImportError:
+            raise ImportError(
+                "Arrow export requires pyarrow. "
+                "Install it with: pip install fastcaptcha-api[arrow]"
+            )
+        
+        def column(arrow_type, values):
+            # A view of the array itself would stop it from growing
+            buffer = pa.py_buffer(values.tobytes())
+            return pa.Array.from_buffers(arrow_type, len(values), [None, buffer])
+        
+        with self._lock:
+            count = len(self._ids)
+            errors = column(pa.uint16(), self._errors)
+            if self.labels is None:
+                ids = column(pa.int64(), self._ids)
+            else:
+                ids = pa.array([self._label(index) for index in self._ids])
+            # Answers already have the Arrow layout: offsets into one buffer
+            answers = pa.LargeStringArray.from_buffers(
+                count,
+                pa.py_buffer(self._answer_offsets.tobytes()),
+                pa.py_buffer(bytes(self._answers))
+            )
+            status = column(pa.uint16(), self._status)
+            latency = column(pa.float64(), self._latency)
+            processing = column(pa.float64(), self._processing)
+            error_names = pa.array(self._error_names, type=pa.string())
+        
+        columns = [
+            ids,
+            pc.if_else(pc.not_equal(errors, 0), None, answers),
+            status,
+            latency,
+            pc.if_else(pc.is_nan(processing), None, processing),
+            pa.DictionaryArray.from_arrays(errors, error_names).dictionary_decode(),
+        ]
+        return pa.Table.from_arrays(columns, names=list(FIELDS))
+    
+    def to_parquet(self, path: Union[str, Path]):
+        """
+        Write the results to a Parquet file.
+        
+        Args:
+            path: Output file path
+        
+        Raises:
+            ImportError: If pyarrow is not installed
+        """
+        table = self.to_arrow()
+        import pyarrow.parquet as pq
+        pq.write_table(table, str(path))
+    
+    def __repr__(self):
+        return f"<ResultStore(results={len(self)}, nbytes={self.nbytes})>"
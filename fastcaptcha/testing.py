@@ -0,0 +1,595 @@
+"""
+FastCaptcha Testing Helpers
+~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+A local stand-in for the FastCaptcha API for tests and benchmarks that
+must run without network access or credits.
+
+The fake server answers ``/api/v1/ocr/``, ``/api/v1/ocr/batch/`` and
+``/api/v1/balance/`` with the documented response formats. Images built
+with :func:`make_image` are "solved" as the answer embedded in them; any
+other image gets a stable six-character answer derived from its hash.
+
+Latency can follow a distribution (:func:`lognormal`, :func:`bimodal`,
+:func:`uniform`), and 500 errors, 429 throttling, per-key rate limits and
+per-key credit accounting can be switched on to exercise retry, backoff
+and concurrency behavior. :class:`FakeAPIProcess` runs the same server in
+a child process (``fastcaptcha fake-server``) so it does not compete for
+the GIL with the client under test.
+
+   >>> from fastcaptcha import FastCaptcha
+   >>> from fastcaptcha.testing import FakeAPIServer, make_image
+   >>> with FakeAPIServer() as server:
+   ...     solver = FastCaptcha(api_key='test-key', base_url=server.url)
+   ...     solver.solve_bytes(make_image('ABC123'))
+   'ABC123'
+"""
+
+import base64
+import binascii
+import hashlib
+import json
+import math
+import random
+import struct
+import subprocess
+import sys
+import threading
+import time
+import zlib
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, Dict, Optional, Set, Union
+
+from .ratelimit import RateLimiter
+
+_ALPHABET = 'ABCDEFGHJKLMNPQRSTUVWXYZ23456789'
+
+
+_ANSWER_KEY = b'fastcaptcha-answer'
+
+
+def _png_chunk(kind: bytes, data: bytes) -> bytes:
+    return (
+        struct.pack('>I', len(data)) + kind + data
+        + struct.pack('>I', zlib.crc32(kind + data) & 0xFFFFFFFF)
+    )
+
+
+def make_image(answer: str, width: int = 1, height: int = 1) -> bytes:
+    """
+    Build a small valid PNG that the fake server solves as ``answer``.
+    
+    Args:
+        answer: Text the fake server returns for this image
+        width: Image width in pixels (default: 1)
+        height: Image height in pixels (default: 1)
+    
+    Returns:
+        bytes: PNG image with the answer in a ``tEXt`` chunk
+    """
+    header = struct.pack('>IIBBBBB', width, height, 8, 0, 0, 0, 0)
+    pixels = zlib.compress(b'\x00' * ((width + 1) * height))
+    return (
+        b'\x89PNG\r\n\x1a\n'
+        + _png_chunk(b'IHDR', header)
+        + _png_chunk(b'tEXt', _ANSWER_KEY + b'\x00' + answer.encode('latin-1'))
+        + _png_chunk(b'IDAT', pixels)
+        + _png_chunk(b'IEND', b'')
+    )
+
+
+def answer_for(image_data: bytes) -> str:
+    """
+    Get the answer the fake server gives for an image.
+    
+    Args:
+        image_data: Raw image bytes
+    
+    Returns:
+        str: Answer embedded by :func:`make_image`, or a stable
+        six-character answer
+    """
+    marker = image_data.find(b'tEXt' + _ANSWER_KEY + b'\x00')
+    if marker >= 4:
+        length = struct.unpack('>I', image_data[marker - 4:marker])[0]
+        start = marker + 4 + len(_ANSWER_KEY) + 1
+        end = marker + 4 + length
+        return image_data[start:end].decode('latin-1')
+    
+    digest = hashlib.sha256(image_data).digest()
+    return ''.join(_ALPHABET[b % len(_ALPHABET)] for b in digest[:6])
+
+
+def uniform(low: float, high: float, seed: Optional[int] = None) -> Callable[[], float]:
+    """
+    Latency drawn uniformly between ``low`` and ``high`` seconds.
+    
+    Args:
+        low: Shortest latency in seconds
+        high: Longest latency in seconds
+        seed: Random seed for repeatable runs (optional)
+    
+    Returns:
+        callable: Function returning one latency per call
+    """
+    rng = random.Random(seed)
+    return lambda: rng.uniform(low, high)
+
+
+def lognormal(median: float, sigma: float = 0.5, seed: Optional[int] = None) -> Callable[[], float]:
+    """
+    Log-normally distributed latency, the long-tailed shape of real APIs.
+    
+    Args:
+        median: Median latency in seconds
+        sigma: Shape; larger values give a heavier tail (default: 0.5)
+        seed: Random seed for repeatable runs (optional)
+    
+    Returns:
+        callable: Function returning one latency per call
+    """
+    rng = random.Random(seed)
+    mu = math.log(median)
+    return lambda: rng.lognormvariate(mu, sigma)
+
+
+def bimodal(
+    fast: float,
+    slow: float,
+    slow_fraction: float,
+    seed: Optional[int] = None
+) -> Callable[[], float]:
+    """
+    Latency that is usually ``fast`` and occasionally ``slow`` (stalls).
+    
+    Args:
+        fast: Usual latency in seconds
+        slow: Stall latency in seconds
+        slow_fraction: Fraction of requests that stall
+        seed: Random seed for repeatable runs (optional)
+    
+    Returns:
+        callable: Function returning one latency per call
+    """
+    rng = random.Random(seed)
+    return lambda: slow if rng.random() < slow_fraction else fast
+
+
+LATENCY_DISTRIBUTIONS: Dict[str, Callable[..., Callable[[], float]]] = {
+    'uniform': uniform,
+    'lognormal': lognormal,
+    'bimodal': bimodal,
+}
+
+
+def parse_latency(spec: Union[str, float], seed: Optional[int] = None) -> Callable[[], float]:
+    """
+    Build a latency function from a command-line style specification.
+    
+    Args:
+        spec: Seconds (``'0.3'``) or ``name:arg:...`` for a distribution,
+            e.g. ``'lognormal:0.3:0.5'``, ``'uniform:0.1:0.5'`` or
+            ``'bimodal:0.05:3:0.01'``
+        seed: Random seed for repeatable runs (optional)
+    
+    Returns:
+        callable: Function returning one latency per call
+    
+    Raises:
+        ValueError: If the specification is not understood
+    """
+    if isinstance(spec, (int, float)):
+        return lambda: float(spec)
+    name, _, args = spec.partition(':')
+    if not args:
+        try:
+            value = float(spec)
+        except ValueError:
+            raise ValueError(f"Invalid latency: {spec!r}")
+        return lambda: value
+    if name not in LATENCY_DISTRIBUTIONS:
+        raise ValueError(
+            f"Unknown latency distribution '{name}'. "
+            f"Choose from: {', '.join(sorted(LATENCY_DISTRIBUTIONS))}"
+        )
+    try:
+        values = [float(arg) for arg in args.split(':')]
+        return LATENCY_DISTRIBUTIONS[name](*values, seed=seed)
+    except (TypeError, ValueError):
+        raise ValueError(f"Invalid latency: {spec!r}")
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    # Headers and body are written separately; without this, Nagle's
+    # algorithm and delayed ACKs add ~40 ms to every response.
+    disable_nagle_algorithm = True
+    server: '_Server'
+    
+    def log_message(self, format, *args):
+        pass
+    
+    def _send_json(self, status: int, body: dict, headers: Optional[dict] = None):
+        self.server.fake._count_status(status)
+        data = json.dumps(body).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(data)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(data)
+    
+    def _read_json(self):
+        length = int(self.headers.get('Content-Length') or 0)
+        raw = self.rfile.read(length) if length else b''
+        try:
+            return json.loads(raw or b'{}')
+        except ValueError:
+            return None
+    
+    def _api_key(self, body: Optional[dict] = None) -> str:
+        return self.headers.get('X-API-Key') or (body or {}).get('api_key') or ''
+    
+    def _authorized(self, key: str) -> bool:
+        keys = self.server.fake.api_keys
+        return keys is None or key in keys
+    
+    def _send_unauthorized(self):
+        self._send_json(401, {
+            'success': False,
+            'error': 'Invalid API key',
+            'error_code': 'INVALID_API_KEY'
+        })
+    
+    def do_HEAD(self):
+        self.server.fake._count('HEAD ' + self.path)
+        self.send_response(200)
+        self.send_header('Content-Length', '0')
+        self.end_headers()
+    
+    def do_GET(self):
+        fake = self.server.fake
+        fake._count('GET ' + self.path)
+        if not self.path.rstrip('/').endswith('/balance'):
+            return self._send_json(404, {'success': False, 'error': 'Not found'})
+        key = self._api_key()
+        if not self._authorized(key):
+            return self._send_unauthorized()
+        fake._delay()
+        credits = fake.balance(key)
+        self._send_json(200, {
+            'success': True,
+            'credits': credits,
+            'credits_remaining': credits
+        })
+    
+    def do_POST(self):
+        fake = self.server.fake
+        fake._count('POST ' + self.path)
+        body = self._read_json()
+        path = self.path.rstrip('/')
+        
+        if path.endswith('/ocr/batch'):
+            if not fake.batch:
+                return self._send_json(404, {'success': False, 'error': 'Not found'})
+            if body is None or not isinstance(body.get('images'), list):
+                return self._send_json(400, {
+                    'success': False, 'error': 'Invalid request body'
+                })
+            key = self._api_key(body)
+            if not self._authorized(key):
+                return self._send_unauthorized()
+            rejected = fake._admit(key)
+            if rejected is not None:
+                return self._send_json(*rejected)
+            started = time.monotonic()
+            fake._delay()
+            results = []
+            for item in body['images']:
+                status, result = fake._solve(item, key, started)
+                if status != 200:
+                    result['status_code'] = status
+                results.append(result)
+            return self._send_json(200, {'success': True, 'results': results})
+        
+        if path.endswith('/ocr'):
+            if body is None:
+                return self._send_json(400, {
+                    'success': False, 'error': 'Invalid request body'
+                })
+            key = self._api_key(body)
+            if not self._authorized(key):
+                return self._send_unauthorized()
+            rejected = fake._admit(key)
+            if rejected is not None:
+                return self._send_json(*rejected)
+            started = time.monotonic()
+            fake._delay()
+            status, result = fake._solve(body, key, started)
+            return self._send_json(status, result)
+        
+        self._send_json(404, {'success': False, 'error': 'Not found'})
+
+
+class _Server(ThreadingHTTPServer):
+    daemon_threads = True
+    request_queue_size = 128
+    fake: 'FakeAPIServer'
+    
+    def handle_error(self, request, client_address):
+        # Clients abandoning timed-out requests are expected, not errors
+        if isinstance(sys.exc_info()[1], ConnectionError):
+            return
+        super().handle_error(request, client_address)
+
+
+class FakeAPIServer:
+    """
+    In-process stand-in for the FastCaptcha API.
+    
+    Args:
+        host (str, optional): Interface to bind. Defaults to ``127.0.0.1``.
+        port (int, optional): Port to bind, 0 for any free port.
+            Defaults to 0.
+        latency (float, str or callable, optional): Seconds each request
+            takes: a number, a spec such as ``'lognormal:0.3:0.5'`` (see
+            :func:`parse_latency`), or a function returning seconds.
+            Defaults to 0.
+        batch (bool, optional): Serve the batch endpoint. Defaults to True.
+        api_keys (set, optional): Accepted API keys. Defaults to any key.
+        credits (int or dict, optional): Starting credit balance of every
+            key, or a dict of balances per key. Defaults to 1000000.
+        rate_limit (float, optional): Solve requests per second allowed
+            per key before answering 429. Defaults to unlimited.
+        error_rate (float, optional): Fraction of solve requests answered
+            with 500. Defaults to 0.
+        throttle_rate (float, optional): Fraction of solve requests answered
+            with 429 regardless of ``rate_limit``. Defaults to 0.
+        seed (int, optional): Random seed for repeatable latency and error
+            injection. Defaults to None.
+    
+    Example:
+        >>> server = FakeAPIServer(latency='lognormal:0.3:0.5', error_rate=0.01).start()
+        >>> solver = FastCaptcha(api_key='test-key', base_url=server.url)
+        >>> server.stop()
+    """
+    
+    def __init__(
+        self,
+        host: str = '127.0.0.1',
+        port: int = 0,
+        latency: Union[float, str, Callable[[], float]] = 0.0,
+        batch: bool = True,
+        api_keys: Optional[Set[str]] = None,
+        credits: Union[int, Dict[str, int]] = 1000000,
+        rate_limit: Optional[float] = None,
+        error_rate: float = 0.0,
+        throttle_rate: float = 0.0,
+        seed: Optional[int] = None
+    ):
+        self.latency = latency if callable(latency) else parse_latency(latency, seed)
+        self.batch = batch
+        self.api_keys = set(api_keys) if api_keys is not None else None
+        self.rate_limit = rate_limit
+        self.error_rate = error_rate
+        self.throttle_rate = throttle_rate
+        self.requests: Counter = Counter()
+        self.responses: Counter = Counter()
+        self._random = random.Random(seed)
+        if isinstance(credits, dict):
+            self._credits = dict(credits)
+            self._default_credits = 0
+        else:
+            self._credits = {}
+            self._default_credits = credits
+        self._limiters: Dict[str, RateLimiter] = {}
+        self._lock = threading.Lock()
+        self._httpd = _Server((host, port), _Handler)
+        self._httpd.fake = self
+        self._host = host
+        self._thread: Optional[threading.Thread] = None
+    
+    @property
+    def url(self) -> str:
+        """Solve endpoint URL to use as ``FastCaptcha(base_url=...)``."""
+        return f"http://{self._host}:{self._httpd.server_port}/api/v1/ocr/"
+    
+    def start(self) -> 'FakeAPIServer':
+        """
+        Start serving from a background thread.
+        
+        Returns:
+            FakeAPIServer: This server
+        """
+        thread = threading.Thread(
+            target=self._httpd.serve_forever, name='fastcaptcha-fake-api',
+            daemon=True
+        )
+        thread.start()
+        self._thread = thread
+        return self
+    
+    def stop(self):
+        """Stop serving and release the port."""
+        if self._thread is not None:
+            self._httpd.shutdown()
+            self._thread.join()
+            self._thread = None
+        self._httpd.server_close()
+    
+    def serve_forever(self):
+        """Serve from the calling thread until interrupted."""
+        try:
+            self._httpd.serve_forever()
+        finally:
+            self._httpd.server_close()
+    
+    def balance(self, api_key: str) -> int:
+        """
+        Get the remaining credits of an API key.
+        
+        Args:
+            api_key: The key
+        
+        Returns:
+            int: Credits remaining
+        """
+        with self._lock:
+            return self._credits.get(api_key, self._default_credits)
+    
+    def _count(self, key: str):
+        with self._lock:
+            self.requests[key] += 1
+    
+    def _count_status(self, status: int):
+        with self._lock:
+            self.responses[status] += 1
+    
+    def _delay(self):
+        seconds = self.latency()
+        if seconds > 0:
+            time.sleep(seconds)
+    
+    def _admit(self, api_key: str):
+        if self.rate_limit:
+            with self._lock:
+                limiter = self._limiters.get(api_key)
+                if limiter is None:
+                    limiter = self._limiters[api_key] = RateLimiter(self.rate_limit)
+            if not limiter.try_acquire():
+                return self._throttled()
+        
+        roll = self._random.random()
+        if roll < self.throttle_rate:
+            return self._throttled()
+        if roll < self.throttle_rate + self.error_rate:
+            self._delay()
+            return 500, {'success': False, 'error': 'Internal server error'}
+        return None
+    
+    def _throttled(self):
+        retry_after = max(1, math.ceil(1 / self.rate_limit)) if self.rate_limit else 1
+        return 429, {
+            'success': False,
+            'error': 'Rate limit exceeded',
+            'error_code': 'RATE_LIMIT_EXCEEDED'
+        }, {'Retry-After': str(retry_after)}
+    
+    def _solve(self, body: dict, api_key: str, started: float):
+        try:
+            image_data = base64.b64decode(body.get('image') or '', validate=True)
+        except (binascii.Error, ValueError, TypeError):
+            image_data = b''
+        if not image_data:
+            return 400, {'success': False, 'error': 'Invalid image'}
+        
+        with self._lock:
+            credits = self._credits.get(api_key, self._default_credits)
+            if credits <= 0:
+                return 402, {'success': False, 'error': 'Insufficient credits'}
+            self._credits[api_key] = remaining = credits - 1
+        
+        return 200, {
+            'success': True,
+            'text': answer_for(image_data),
+            'credits_remaining': remaining,
+            'processing_time': round(time.monotonic() - started, 4)
+        }
+    
+    def __enter__(self):
+        """Context manager entry; starts the server."""
+        return self.start()
+    
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        """Context manager exit; stops the server."""
+        self.stop()
+    
+    def __repr__(self):
+        return f"<FakeAPIServer(url='{self.url}')>"
+
+
+class FakeAPIProcess:
+    """
+    The fake API server running in a separate Python process.
+    
+    Keeps the server's request handling off the GIL of the process being
+    benchmarked. Takes the same options as :class:`FakeAPIServer`, except
+    that ``latency`` must be a number or a spec string and ``credits`` a
+    number.
+    
+    Args:
+        **options: :class:`FakeAPIServer` options
+    
+    Example:
+        >>> with FakeAPIProcess(latency='lognormal:0.3:0.5') as server:
+        ...     solver = FastCaptcha(api_key='test-key', base_url=server.url)
+    """
+    
+    def __init__(self, **options):
+        self.options = options
+        self.url = None
+        self._process = None
+    
+    def _argv(self) -> list:
+        argv = [sys.executable, '-m', 'fastcaptcha', 'fake-server']
+        options = dict(self.options)
+        if not options.pop('batch', True):
+            argv.append('--no-batch')
+        for key in options.pop('api_keys', None) or ():
+            argv += ['--api-key', key]
+        for name, value in options.items():
+            if value is not None:
+                argv += ['--' + name.replace('_', '-'), str(value)]
+        return argv
+    
+    def start(self, timeout: float = 10.0) -> 'FakeAPIProcess':
+        """
+        Start the server process and wait until it is listening.
+        
+        Args:
+            timeout: Seconds to wait for the server (default: 10)
+        
+        Returns:
+            FakeAPIProcess: This server
+        
+        Raises:
+            RuntimeError: If the server does not start
+        """
+        self._process = subprocess.Popen(
+            self._argv(), stdout=subprocess.PIPE, universal_newlines=True
+        )
+        # The server prints its URL once it is listening
+        ready = threading.Event()
+        line = []
+        
+        def read_url():
+            line.append(self._process.stdout.readline())
+            ready.set()
+        
+        threading.Thread(target=read_url, daemon=True).start()
+        if not ready.wait(timeout) or not line[0].startswith('http'):
+            self.stop()
+            raise RuntimeError("Fake API server process failed to start")
+        self.url = line[0].strip()
+        return self
+    
+    def stop(self):
+        """Terminate the server process."""
+        if self._process is not None:
+            self._process.terminate()
+            self._process.wait()
+            self._process.stdout.close()
+            self._process = None
+    
+    def __enter__(self):
+        """Context manager entry; starts the server."""
+        return self.start()
+    
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        """Context manager exit; stops the server."""
+        self.stop()
+    
+    def __repr__(self):
+        return f"<FakeAPIProcess(url='{self.url}')>"
@@ -0,0 +1,130 @@
+"""
+FastCaptcha Adaptive Timeouts
+~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+Read timeouts derived from observed solve latency.
+
+A fixed 30 second timeout keeps a worker stuck on a dead connection for 30
+seconds even when healthy solves take a fraction of one. An adaptive
+timeout sets the read timeout to a multiple of a high latency percentile,
+clamped between a floor and a ceiling. A request that exceeds it is
+abandoned and retried with a longer timeout, so genuinely slow solves
+still complete.
+
+A timed-out attempt is recorded at the timeout it hit, a lower bound on
+its real latency. If the API slows down for good, those samples raise the
+percentile and the timeout grows to match; without them the window would
+only hold the old fast solves and every request would keep timing out.
+
+Retries are not free: the API may still finish the abandoned solve and
+charge for it, so each retry can spend another credit.
+"""
+
+from typing import Optional
+
+from .metrics import LatencyWindow
+
+
+class AdaptiveTimeout:
+    """
+    Read-timeout policy driven by a rolling latency distribution.
+    
+    Args:
+        percentile (float, optional): Latency percentile the timeout is
+            based on. Defaults to 0.99.
+        multiplier (float, optional): Factor applied to that percentile.
+            Defaults to 3.0.
+        floor (float, optional): Shortest read timeout in seconds.
+            Defaults to 1.0.
+        ceiling (float, optional): Longest read timeout in seconds.
+            Defaults to None (the client's read timeout).
+        min_samples (int, optional): Latency samples needed before the
+            timeout adapts. Defaults to 20.
+        retries (int, optional): Times a timed-out solve is retried; each
+            retry can spend another credit. Defaults to 1.
+        backoff (float, optional): Factor the read timeout grows by on each
+            retry. Defaults to 2.0.
+    
+    Example:
+        >>> solver = FastCaptcha(api_key='your-api-key',
+        ...                      adaptive_timeout=AdaptiveTimeout(floor=2.0))
+    """
+    
+    def __init__(
+        self,
+        percentile: float = 0.99,
+        multiplier: float = 3.0,
+        floor: float = 1.0,
+        ceiling: Optional[float] = None,
+        min_samples: int = 20,
+        retries: int = 1,
+        backoff: float = 2.0
+    ):
+        self.percentile = percentile
+        self.multiplier = multiplier
+        self.floor = floor
+        self.ceiling = ceiling
+        self.min_samples = min_samples
+        self.retries = retries
+        self.backoff = backoff
+    
+    @classmethod
+    def coerce(cls, value) -> 'AdaptiveTimeout':
+        """
+        Build an AdaptiveTimeout from an instance, True, or a dict.
+        
+        Args:
+            value: AdaptiveTimeout, True for the defaults, or dict of
+                constructor arguments
+        
+        Returns:
+            AdaptiveTimeout: The policy
+        
+        Raises:
+            TypeError: If ``value`` cannot be converted
+        """
+        if isinstance(value, cls):
+            return value
+        if value is True:
+            return cls()
+        if isinstance(value, dict):
+            return cls(**value)
+        raise TypeError(f"Cannot use {type(value).__name__} as an adaptive timeout")
+    
+    def read_timeout(self, latencies: LatencyWindow, default: float) -> float:
+        """
+        Get the read timeout for the next request.
+        
+        Args:
+            latencies: Recently observed solve latencies
+            default: The client's configured read timeout
+        
+        Returns:
+            float: Read timeout in seconds
+        """
+        ceiling = self.ceiling if self.ceiling is not None else default
+        value = latencies.percentile(self.percentile)
+        if value is None or len(latencies) < self.min_samples:
+            return ceiling
+        return min(ceiling, max(self.floor, value * self.multiplier))
+    
+    def escalate(self, timeout: float, default: float) -> float:
+        """
+        Get the read timeout for a retry after ``timeout`` expired.
+        
+        Args:
+            timeout: The read timeout that expired
+            default: The client's configured read timeout
+        
+        Returns:
+            float: Longer read timeout, capped at the ceiling
+        """
+        ceiling = self.ceiling if self.ceiling is not None else default
+        return min(ceiling, timeout * self.backoff)
+    
+    def __repr__(self):
+        return (
+            f"<AdaptiveTimeout(percentile={self.percentile}, "
+            f"multiplier={self.multiplier}, floor={self.floor}, "
+            f"ceiling={self.ceiling})>"
+        )
@@ -0,0 +1,341 @@
+"""
+FastCaptcha HTTP Transports
+~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+Pluggable HTTP backends used by :class:`FastCaptcha` for API requests.
+
+* ``'requests'`` (default) - a ``requests.Session``; honours proxy and CA
+  bundle environment settings.
+* ``'urllib3'`` - a lean backend sending straight through a urllib3
+  connection pool, skipping the session's hooks, adapter lookup, cookie
+  handling and per-call header merging.
+* ``'http2'`` - multiplexes concurrent requests over one HTTP/2
+  connection using httpx (``pip install fastcaptcha-api[http2]``).
+
+Custom backends subclass :class:`Transport` and raise
+:class:`TransportTimeout` or :class:`TransportError` on failure.
+"""
+
+import json
+import threading
+from typing import Callable, Dict, Optional, Tuple, Union
+
+Timeout = Union[float, Tuple[float, float]]
+
+
+class TransportError(Exception):
+    """Raised by a transport when a request fails at the network level."""
+    pass
+
+
+class TransportTimeout(TransportError):
+    """Raised by a transport when a request times out."""
+    pass
+
+
+class Response:
+    """
+    Minimal HTTP response returned by every transport.
+    
+    Args:
+        status_code (int): HTTP status code
+        content (bytes): Response body
+        headers (dict, optional): Response headers
+    """
+    
+    __slots__ = ('status_code', 'content', 'headers')
+    
+    def __init__(self, status_code: int, content: bytes, headers: Optional[dict] = None):
+        self.status_code = status_code
+        self.content = content
+        self.headers = headers or {}
+    
+    @property
+    def text(self) -> str:
+        """Response body decoded as UTF-8."""
+        return self.content.decode('utf-8', 'replace')
+    
+    def json(self):
+        """Response body parsed as JSON."""
+        try:
+            return json.loads(self.content)
+        except ValueError as e:
+            raise TransportError(f"Invalid JSON response: {str(e)}")
+    
+    def __repr__(self):
+        return f"<Response [{self.status_code}]>"
+
+
+def _split_timeout(timeout: Optional[Timeout]) -> Tuple[Optional[float], Optional[float]]:
+    if isinstance(timeout, tuple):
+        return timeout
+    return timeout, timeout
+
+
+class Transport:
+    """
+    Base class for HTTP transports.
+    
+    Attributes:
+        requests_sent (int): Requests sent through this transport
+    """
+    
+    name = 'base'
+    
+    def __init__(self):
+        self.requests_sent = 0
+        self._count_lock = threading.Lock()
+    
+    def _count(self):
+        with self._count_lock:
+            self.requests_sent += 1
+    
+    def request(
+        self,
+        method: str,
+        url: str,
+        headers: dict,
+        body: Optional[bytes] = None,
+        timeout: Optional[Timeout] = None
+    ) -> Response:
+        """
+        Send one HTTP request.
+        
+        Args:
+            method: HTTP method
+            url: Absolute URL
+            headers: Complete request headers
+            body: Encoded request body (optional)
+            timeout: Seconds, or a ``(connect, read)`` tuple (optional)
+        
+        Returns:
+            Response: The HTTP response
+        
+        Raises:
+            TransportTimeout: If the request times out
+            TransportError: If the request fails
+        """
+        raise NotImplementedError
+    
+    def connection_pool(self, url: str):
+        """
+        Get the urllib3 connection pool serving ``url``, if there is one.
+        
+        Args:
+            url: Absolute URL
+        
+        Returns:
+            HTTPConnectionPool: The pool, or None for unpooled backends
+        """
+        return None
+    
+    def close(self):
+        """Release all connections."""
+        pass
+    
+    def __repr__(self):
+        return f"<{self.__class__.__name__}()>"
+
+
+class RequestsTransport(Transport):
+    """
+    Transport backed by a ``requests.Session``.
+    
+    Args:
+        pool_size (int, optional): Maximum pooled connections per host.
+            Defaults to 10.
+        session (requests.Session, optional): Session to use instead of a
+            new one
+    """
+    
+    name = 'requests'
+    
+    def __init__(self, pool_size: int = 10, session=None):
+        super().__init__()
+        import requests
+        from requests.adapters import HTTPAdapter
+        
+        self._requests = requests
+        self.session = session or requests.Session()
+        if session is None:
+            adapter = HTTPAdapter(pool_maxsize=pool_size)
+            self.session.mount('https://', adapter)
+            self.session.mount('http://', adapter)
+    
+    def request(self, method, url, headers, body=None, timeout=None):
+        self._count()
+        try:
+            # Redirects are left to the caller, as with the other backends
+            response = self.session.request(
+                method, url, data=body, headers=headers, timeout=timeout,
+                allow_redirects=False
+            )
+        except self._requests.exceptions.Timeout as e:
+            raise TransportTimeout(str(e))
+        except self._requests.exceptions.RequestException as e:
+            raise TransportError(str(e))
+        return Response(response.status_code, response.content, response.headers)
+    
+    def connection_pool(self, url):
+        adapter = self.session.get_adapter(url)
+        # Look the pool up the same way requests does when sending, so a
+        # warmed pool is the one requests are served from.
+        if hasattr(adapter, 'get_connection_with_tls_context'):
+            request = self._requests.Request('POST', url).prepare()
+            settings = self.session.merge_environment_settings(
+                url, {}, None, None, None
+            )
+            return adapter.get_connection_with_tls_context(
+                request, settings['verify'], settings['proxies'], settings['cert']
+            )
+        return adapter.get_connection(url)
+    
+    def close(self):
+        self.session.close()
+
+
+class Urllib3Transport(Transport):
+    """
+    Lean transport sending directly through urllib3 connection pools.
+    
+    Args:
+        pool_size (int, optional): Maximum pooled connections per host.
+            Defaults to 10.
+        ca_certs (str, optional): CA bundle path. Defaults to certifi's
+            bundle when installed.
+    """
+    
+    name = 'urllib3'
+    
+    def __init__(self, pool_size: int = 10, ca_certs: Optional[str] = None):
+        super().__init__()
+        import urllib3
+        
+        if ca_certs is None:
+            try:
+                import certifi
+                ca_certs = certifi.where()
+            except ImportError:
+                pass
+        
+        self._urllib3 = urllib3
+        self._manager = urllib3.PoolManager(
+            maxsize=pool_size, cert_reqs='CERT_REQUIRED', ca_certs=ca_certs
+        )
+    
+    def request(self, method, url, headers, body=None, timeout=None):
+        self._count()
+        exceptions = self._urllib3.exceptions
+        connect, read = _split_timeout(timeout)
+        try:
+            response = self._manager.urlopen(
+                method,
+                url,
+                body=body,
+                headers=headers,
+                timeout=self._urllib3.Timeout(connect=connect, read=read),
+                retries=False,
+                redirect=False,
+                preload_content=True
+            )
+        except exceptions.NewConnectionError as e:
+            # Subclasses ConnectTimeoutError in urllib3, but is a refusal
+            raise TransportError(str(e))
+        except exceptions.TimeoutError as e:
+            raise TransportTimeout(str(e))
+        except exceptions.HTTPError as e:
+            raise TransportError(str(e))
+        return Response(response.status, response.data, response.headers)
+    
+    def connection_pool(self, url):
+        return self._manager.connection_from_url(url)
+    
+    def close(self):
+        self._manager.clear()
+
+
+class HTTP2Transport(Transport):
+    """
+    Transport multiplexing requests over HTTP/2 using httpx.
+    
+    Args:
+        pool_size (int, optional): Maximum connections per host.
+            Defaults to 10.
+    
+    Raises:
+        ImportError: If httpx with HTTP/2 support is not installed
+    """
+    
+    name = 'http2'
+    
+    def __init__(self, pool_size: int = 10):
+        super().__init__()
+        try:
+            import httpx
+            import h2  # noqa: F401 - required by httpx for HTTP/2
+        except ImportError:
+            raise ImportError(
+                "The HTTP/2 transport requires httpx with HTTP/2 support. "
+                "Install it with: pip install fastcaptcha-api[http2]"
+            )
+        
+        self._httpx = httpx
+        self._client = httpx.Client(
+            http2=True,
+            limits=httpx.Limits(max_connections=pool_size),
+            follow_redirects=False
+        )
+    
+    def request(self, method, url, headers, body=None, timeout=None):
+        self._count()
+        connect, read = _split_timeout(timeout)
+        try:
+            response = self._client.request(
+                method,
+                url,
+                content=body,
+                headers=headers,
+                timeout=self._httpx.Timeout(read, connect=connect)
+            )
+        except self._httpx.TimeoutException as e:
+            raise TransportTimeout(str(e))
+        except self._httpx.HTTPError as e:
+            raise TransportError(str(e))
+        return Response(response.status_code, response.content, response.headers)
+    
+    def close(self):
+        self._client.close()
+
+
+TRANSPORTS: Dict[str, Callable[..., Transport]] = {
+    'requests': RequestsTransport,
+    'urllib3': Urllib3Transport,
+    'http2': HTTP2Transport,
+}
+
+
+def create_transport(transport: Union[str, Transport], pool_size: int = 10) -> Transport:
+    """
+    Build a transport from a backend name, or pass an instance through.
+    
+    Args:
+        transport: ``'requests'``, ``'urllib3'``, ``'http2'`` or a Transport
+        pool_size: Maximum pooled connections per host (default: 10)
+    
+    Returns:
+        Transport: The transport
+    
+    Raises:
+        ValueError: If the backend name is unknown
+    """
+    if isinstance(transport, Transport):
+        return transport
+    
+    try:
+        cls = TRANSPORTS[transport]
+    except KeyError:
+        raise ValueError(
+            f"Unknown transport '{transport}'. "
+            f"Choose from: {', '.join(sorted(TRANSPORTS))}"
+        )
+    return cls(pool_size=pool_size)
@@ -8,7 +8,7 @@ Helper functions for image validation and processing.
 import os
 import re
 from pathlib import Path
-from typing import Union
+from typing import Tuple, Union
 import requests
 
 
@@ -69,13 +69,13 @@ def is_valid_url(url: str) -> bool:
     return bool(url_pattern.match(url))
 
 
-def download_image(url: str, timeout: int = 30) -> bytes:
+def download_image(url: str, timeout: Union[float, Tuple[float, float]] = 30) -> bytes:
     """
     Download image from URL.
     
     Args:
         url: Image URL
-        timeout: Request timeout in seconds
+        timeout: Request timeout in seconds, or a (connect, read) tuple
     
     Returns:
         bytes: Image data
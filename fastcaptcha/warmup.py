@@ -0,0 +1,271 @@
+"""
+FastCaptcha Connection Warm-up
+~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+Opens pooled connections to the API ahead of demand and keeps them alive,
+so the first solve after start-up or an idle gap does not pay for DNS,
+TCP and TLS setup.
+
+The warmer works on the urllib3 connection pool that serves ``base_url``.
+Connections are checked out, connected and returned to the pool directly;
+keep-alive pings are ``HEAD`` requests, which cost no credits. Both use the
+client's connect and read timeouts, so an unresponsive server cannot hold
+the warmer, or :meth:`FastCaptcha.close`, indefinitely. Transports
+without a urllib3 pool (HTTP/2) are warmed and pinged with a ``HEAD``
+request through the transport itself.
+"""
+
+import threading
+import time
+import weakref
+from typing import Optional
+from urllib.parse import urlsplit
+
+from urllib3.exceptions import HTTPError
+
+# urllib3 2.x raises NewConnectionError, which is not an OSError
+_CONNECT_ERRORS = (OSError, HTTPError)
+
+
+class ConnectionWarmer:
+    """
+    Pre-opens and maintains pooled connections for a FastCaptcha client.
+    
+    Args:
+        solver (FastCaptcha): Client whose connection pool is warmed
+        connections (int, optional): Connections to keep open. Defaults to 4.
+        keepalive_interval (float, optional): Seconds of pool inactivity
+            after which idle connections are pinged. None disables pings.
+            Defaults to 30.
+    
+    Example:
+        >>> warmer = ConnectionWarmer(solver, connections=8)
+        >>> warmer.warmup()
+        8
+    """
+    
+    def __init__(
+        self,
+        solver,
+        connections: int = 4,
+        keepalive_interval: Optional[float] = 30.0
+    ):
+        self.solver = solver
+        self.connections = connections
+        self.keepalive_interval = keepalive_interval
+        self._connected_at: weakref.WeakKeyDictionary = weakref.WeakKeyDictionary()
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+        self._pings = 0
+        self._reconnects = 0
+        self._last_requests = -1
+        self._last_activity = time.monotonic()
+    
+    def _pool(self):
+        return self.solver._connection_pool()
+    
+    def _connect(self, conn) -> bool:
+        if conn.sock is not None:
+            return False
+        conn.timeout = self.solver.connect_timeout
+        conn.connect()
+        with self._lock:
+            self._connected_at[conn] = time.monotonic()
+        return True
+    
+    def _set_read_timeout(self, conn):
+        # Raw connections bypass urllib3's per-request timeout handling
+        conn.timeout = self.solver.read_timeout
+        if conn.sock is not None:
+            conn.sock.settimeout(self.solver.read_timeout)
+    
+    def _checkout(self, pool, count: int) -> list:
+        # urllib3 has no public API for holding idle connections, so they
+        # are taken out of and put back into the pool's queue directly.
+        conns = []
+        for _ in range(min(count, pool.pool.maxsize)):
+            conns.append(pool._get_conn())
+        return conns
+    
+    def warmup(self, connections: Optional[int] = None) -> int:
+        """
+        Open pooled connections to the API now.
+        
+        Args:
+            connections: Connections to open (default: ``self.connections``)
+        
+        Returns:
+            int: Number of connections newly opened
+        """
+        count = connections or self.connections
+        pool = self._pool()
+        if pool is None:
+            return self._head()
+        conns = self._checkout(pool, count)
+        opened = 0
+        try:
+            for conn in conns:
+                try:
+                    opened += self._connect(conn)
+                except _CONNECT_ERRORS:
+                    conn.close()
+        finally:
+            for conn in conns:
+                pool._put_conn(conn)
+        return opened
+    
+    def ping(self) -> int:
+        """
+        Send a keep-alive ``HEAD`` over each idle connection.
+        
+        Connections the server has dropped are reopened.
+        
+        Returns:
+            int: Number of connections pinged
+        """
+        pool = self._pool()
+        if pool is None:
+            pinged = self._head()
+            with self._lock:
+                self._pings += pinged
+            return pinged
+        path = urlsplit(self.solver.base_url).path or '/'
+        conns = self._checkout(pool, self.connections)
+        pinged = 0
+        try:
+            for conn in conns:
+                try:
+                    if self._connect(conn):
+                        with self._lock:
+                            self._reconnects += 1
+                        continue
+                    self._set_read_timeout(conn)
+                    conn.request('HEAD', path)
+                    conn.getresponse().read()
+                    pinged += 1
+                except Exception:
+                    conn.close()
+                    try:
+                        self._connect(conn)
+                        with self._lock:
+                            self._reconnects += 1
+                    except _CONNECT_ERRORS:
+                        conn.close()
+        finally:
+            for conn in conns:
+                pool._put_conn(conn)
+        
+        with self._lock:
+            self._pings += pinged
+        return pinged
+    
+    def _head(self) -> int:
+        transport = self.solver._transport
+        try:
+            transport.request(
+                'HEAD', self.solver.base_url, self.solver._balance_headers,
+                timeout=(self.solver.connect_timeout, self.solver.read_timeout)
+            )
+        except Exception:
+            return 0
+        finally:
+            # Pings are not traffic; don't let them look like activity
+            self._last_requests = transport.requests_sent
+        return 1
+    
+    def start(self):
+        """Warm up and maintain connections from a background thread."""
+        if self._thread is not None:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(
+            target=self._run, name='fastcaptcha-warmer', daemon=True
+        )
+        self._thread.start()
+    
+    def stop(self, timeout: Optional[float] = None):
+        """
+        Stop the background thread.
+        
+        Args:
+            timeout: Seconds to wait for an in-flight warm-up or ping to
+                finish (default: the client's connect plus read timeout).
+                The thread is a daemon, so one still running afterwards
+                does not keep the process alive.
+        """
+        self._stop.set()
+        if self._thread is not None:
+            if timeout is None:
+                timeout = self.solver.connect_timeout + self.solver.read_timeout
+            self._thread.join(timeout)
+            self._thread = None
+    
+    def _run(self):
+        try:
+            self.warmup()
+        except Exception:
+            pass
+        
+        if not self.keepalive_interval:
+            return
+        
+        while not self._stop.wait(self.keepalive_interval):
+            requests_made = self.solver._transport.requests_sent
+            now = time.monotonic()
+            if requests_made != self._last_requests:
+                # Real traffic kept the pool alive during this interval
+                self._last_requests = requests_made
+                self._last_activity = now
+                continue
+            if now - self._last_activity >= self.keepalive_interval:
+                try:
+                    self.ping()
+                except Exception:
+                    pass
+    
+    def stats(self) -> dict:
+        """
+        Get connection age and reuse figures for the API pool.
+        
+        Returns:
+            dict: Connections opened, requests sent, reuse ratio, open
+            connection ages, pings and reconnects
+        """
+        pool = self._pool()
+        now = time.monotonic()
+        if pool is None:
+            with self._lock:
+                return {
+                    'requests': self.solver._transport.requests_sent,
+                    'pings': self._pings,
+                }
+        with self._lock:
+            ages = [
+                now - connected_at
+                for conn, connected_at in self._connected_at.items()
+                if conn.sock is not None
+            ]
+            pings = self._pings
+            reconnects = self._reconnects
+        
+        opened = pool.num_connections
+        requests_made = pool.num_requests
+        return {
+            'connections_opened': opened,
+            'requests': requests_made,
+            'reuse_ratio': (
+                1 - opened / requests_made if requests_made > opened else 0.0
+            ),
+            'warm_connections': len(ages),
+            'oldest_connection_age': max(ages) if ages else 0.0,
+            'mean_connection_age': sum(ages) / len(ages) if ages else 0.0,
+            'pings': pings,
+            'reconnects': reconnects,
+        }
+    
+    def __repr__(self):
+        return (
+            f"<ConnectionWarmer(connections={self.connections}, "
+            f"keepalive_interval={self.keepalive_interval})>"
+        )
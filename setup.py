@@ -76,6 +76,24 @@ setup(
             'flake8>=3.9',
             'mypy>=0.900',
         ],
+        'arrow': [
+            'pyarrow>=7.0',
+        ],
+        'dedup': [
+            'Pillow>=8.0',
+        ],
+        'http2': [
+            'httpx[http2]>=0.23',
+        ],
+        'selenium': [
+            'selenium>=4.0',
+            'Pillow>=8.0',
+        ],
+    },
+    entry_points={
+        'console_scripts': [
+            'fastcaptcha=fastcaptcha.cli:main',
+        ],
     },
     include_package_data=True,
     zip_safe=False,
@@ -0,0 +1,109 @@
+import json
+import threading
+import time
+
+import pytest
+
+from fastcaptcha import FastCaptcha
+from fastcaptcha.transport import Response, Transport, TransportError, TransportTimeout
+
+PNG = b'\x89PNG\r\n\x1a\n'
+
+
+class StubTransport(Transport):
+    """
+    Configurable stand-in for the API.
+
+    Solves answer ``answer`` (a string, or a function of the request's
+    base64 image), batch requests answer each image the same way, balance
+    checks return 42 credits and any other GET returns a small PNG.
+
+    Args:
+        answer: Answer text, or callable taking the base64 image
+        status: HTTP status for solves, or callable taking the base64 image
+        latency: Seconds each request takes; one longer than the read
+            timeout raises TransportTimeout
+        stall: Latency of the first request only
+        sleep: Really wait for the latency rather than only simulate it
+        batch_status: Status of the batch endpoint, or ``'error'`` to
+            raise a TransportError
+        processing_time: Server-side time reported with each answer
+    """
+
+    def __init__(self, answer='ABC123', status=200, latency=0.0, stall=None,
+                 sleep=True, batch_status=200, processing_time=None):
+        super().__init__()
+        self.answer = answer
+        self.status = status
+        self.latency = latency
+        self.stall = stall
+        self.sleep = sleep
+        self.batch_status = batch_status
+        self.processing_time = processing_time
+        self.urls = []
+        self.read_timeouts = []
+        self._lock = threading.Lock()
+
+    def request(self, method, url, headers, body=None, timeout=None):
+        read_timeout = timeout[1] if timeout else None
+        with self._lock:
+            first = self.requests_sent == 0
+            self.urls.append(url)
+            self.read_timeouts.append(read_timeout)
+        self._count()
+
+        latency = self.stall if first and self.stall is not None else self.latency
+        if self.sleep:
+            time.sleep(min(latency, read_timeout or latency))
+        if read_timeout is not None and latency > read_timeout:
+            raise TransportTimeout("read timed out")
+
+        if method == 'GET':
+            if '/balance/' in url:
+                return Response(200, b'{"credits": 42}')
+            return Response(200, PNG + b'image', {'content-type': 'image/png'})
+
+        payload = json.loads(body)
+        if '/batch/' in url:
+            if self.batch_status == 'error':
+                raise TransportError("connection reset")
+            if self.batch_status != 200:
+                return Response(self.batch_status, b'{}')
+            results = [self._result(item['image']) for item in payload['images']]
+            return Response(200, json.dumps({'results': results}).encode())
+
+        image = payload['image']
+        status = self.status(image) if callable(self.status) else self.status
+        if status != 200:
+            return Response(status, b'{"error": "upstream failed"}')
+        return Response(200, json.dumps(self._result(image)).encode())
+
+    def _result(self, image):
+        text = self.answer(image) if callable(self.answer) else self.answer
+        result = {'text': text}
+        if self.processing_time is not None:
+            result['processing_time'] = self.processing_time
+        return result
+
+
+@pytest.fixture
+def stub_transport():
+    """The :class:`StubTransport` class."""
+    return StubTransport
+
+
+@pytest.fixture
+def make_solver():
+    """Build clients with image validation off; they are closed afterwards."""
+    solvers = []
+
+    def make(transport=None, **options):
+        options.setdefault('api_key', 'key')
+        options.setdefault('validate_images', False)
+        solver = FastCaptcha(transport=transport or StubTransport(), **options)
+        solvers.append(solver)
+        return solver
+
+    yield make
+    for solver in solvers:
+        solver.close()
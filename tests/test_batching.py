@@ -0,0 +1,79 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from fastcaptcha.exceptions import APIError
+
+# Batch concurrent calls into requests of up to eight images
+BATCHING = {'max_batch_size': 8, 'max_batch_wait': 0.05}
+
+
+def echo(image):
+    return image
+
+
+def solve_concurrently(solver, count):
+    with ThreadPoolExecutor(max_workers=count) as pool:
+        return list(pool.map(solver.solve_base64, [f'img{i}' for i in range(count)]))
+
+
+def test_concurrent_calls_share_a_batch(make_solver, stub_transport):
+    transport = stub_transport(answer=echo, latency=0.01)
+    solver = make_solver(transport, **BATCHING)
+
+    assert solve_concurrently(solver, 8) == [f'img{i}' for i in range(8)]
+    stats = solver._batcher.stats()
+    assert stats['batched'] == 8
+    assert stats['batches'] < 8
+    solver.close()
+
+
+def test_missing_batch_endpoint_falls_back_to_single_requests(make_solver, stub_transport):
+    transport = stub_transport(answer=echo, latency=0.01, batch_status=404)
+    solver = make_solver(transport, **BATCHING)
+
+    assert solve_concurrently(solver, 8) == [f'img{i}' for i in range(8)]
+    stats = solver._batcher.stats()
+    assert not stats['available']
+    assert stats['single'] == 8
+
+    # Later calls skip the batcher entirely
+    transport.urls.clear()
+    assert solver.solve_base64('last') == 'last'
+    assert not any('/batch/' in url for url in transport.urls)
+    solver.close()
+
+
+def test_failed_batch_gives_each_caller_its_own_exception(make_solver, stub_transport):
+    solver = make_solver(stub_transport(answer=echo, batch_status='error'), **BATCHING)
+    errors = []
+    barrier = threading.Barrier(4)
+
+    def call(i):
+        barrier.wait()
+        try:
+            solver.solve_base64(f'img{i}')
+        except APIError as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=call, args=(i,)) for i in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(5)
+
+    batched = [e for e in errors if 'connection reset' in str(e)]
+    assert batched
+    assert len({id(e) for e in errors}) == len(errors)
+    solver.close()
+
+
+def test_submit_racing_close_never_hangs(make_solver, stub_transport):
+    for _ in range(20):
+        solver = make_solver(stub_transport(answer=echo), **BATCHING)
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            futures = [pool.submit(solver.solve_base64, f'img{i}') for i in range(8)]
+            solver.close()
+            assert [f.result(timeout=5) for f in futures] == [f'img{i}' for i in range(8)]
+
+    # After close, calls are sent on their own
+    assert solver.solve_base64('late') == 'late'
@@ -0,0 +1,116 @@
+import threading
+import time
+
+import pytest
+
+from fastcaptcha.concurrency import AdaptiveLimiter
+from fastcaptcha.ratelimit import RateLimiter
+
+
+def run_saturated(limiter, latency, rounds, overloaded=False):
+    """Fill every slot, then release them all, ``rounds`` times."""
+    for _ in range(rounds):
+        slots = limiter.limit
+        for _ in range(slots):
+            limiter.acquire()
+        for _ in range(slots):
+            limiter.release(latency, overloaded=overloaded)
+
+
+def test_aimd_grows_while_saturated():
+    limiter = AdaptiveLimiter(initial=4, max_limit=16)
+    run_saturated(limiter, 0.1, rounds=20)
+
+    assert limiter.limit > 4
+    assert limiter.snapshot()['increases'] > 0
+
+
+def test_aimd_does_not_grow_when_unused():
+    limiter = AdaptiveLimiter(initial=4, max_limit=16)
+    for _ in range(100):
+        limiter.acquire()
+        limiter.release(0.1)
+
+    assert limiter.limit == 4
+
+
+def test_aimd_backs_off_on_overload():
+    limiter = AdaptiveLimiter(initial=10, max_limit=16, backoff=0.5)
+    limiter.acquire()
+    limiter.release(0.1, overloaded=True)
+
+    assert limiter.limit == 5
+    assert limiter.snapshot()['decreases'] == 1
+
+
+def test_aimd_backs_off_on_latency_spike():
+    limiter = AdaptiveLimiter(initial=10, max_limit=16, tolerance=2.0)
+    for _ in range(10):
+        limiter.acquire()
+        limiter.release(0.01)
+    time.sleep(0.02)
+    for _ in range(10):
+        limiter.acquire()
+        limiter.release(0.5)
+
+    assert limiter.limit < 10
+
+
+def test_limits_are_respected():
+    limiter = AdaptiveLimiter(initial=2, min_limit=2, max_limit=3, backoff=0.1)
+    run_saturated(limiter, 0.01, rounds=50)
+    assert limiter.limit == 3
+
+    time.sleep(0.02)
+    limiter.acquire()
+    limiter.release(0.01, overloaded=True)
+    assert limiter.limit == 2
+
+
+def test_gradient_shrinks_when_latency_rises():
+    limiter = AdaptiveLimiter(initial=16, max_limit=64, algorithm='gradient')
+    for _ in range(50):
+        limiter.acquire()
+        limiter.release(0.1)
+    grown = limiter.limit
+    for _ in range(50):
+        limiter.acquire()
+        limiter.release(1.0)
+
+    assert limiter.limit < grown
+
+
+def test_acquire_blocks_at_limit():
+    limiter = AdaptiveLimiter(initial=1, max_limit=1)
+    limiter.acquire()
+    acquired = threading.Event()
+
+    def waiter():
+        limiter.acquire()
+        acquired.set()
+
+    threading.Thread(target=waiter, daemon=True).start()
+    assert not acquired.wait(0.05)
+    limiter.release(None)
+    assert acquired.wait(1)
+
+
+def test_rejects_bad_configuration():
+    with pytest.raises(ValueError):
+        AdaptiveLimiter(algorithm='vegas')
+    with pytest.raises(ValueError):
+        AdaptiveLimiter(min_limit=5, max_limit=2)
+
+
+def test_rate_limiter_burst_then_refill():
+    limiter = RateLimiter(rate=100, burst=3)
+
+    assert [limiter.try_acquire() for _ in range(4)] == [True, True, True, False]
+    time.sleep(0.02)
+    assert limiter.try_acquire()
+
+
+def test_rate_limiter_acquire_timeout():
+    limiter = RateLimiter(rate=1, burst=1)
+    assert limiter.acquire()
+    assert not limiter.acquire(timeout=0.01)
@@ -0,0 +1,161 @@
+import json
+import os
+import re
+import socket
+import stat
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from fastcaptcha.daemon import DaemonClient, SolverDaemon, parse_address
+from fastcaptcha.exceptions import APIError, AnswerFormatError
+
+
+@pytest.fixture
+def serve(make_solver):
+    daemons = []
+
+    def start(transport, **options):
+        solver = make_solver(transport)
+        daemon = SolverDaemon(solver, '127.0.0.1:0', **options)
+        daemon.start()
+        daemons.append(daemon)
+        host, port = daemon.server_address
+        return daemon, f"{host}:{port}"
+
+    yield start
+    for daemon in daemons:
+        daemon.shutdown()
+
+
+def test_identical_concurrent_solves_are_sent_once(serve, stub_transport):
+    transport = stub_transport(latency=0.2)
+    daemon, address = serve(transport)
+
+    def solve(_):
+        with DaemonClient(address) as client:
+            return client.solve_base64('aW1hZ2U=')
+
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        assert list(pool.map(solve, range(8))) == ['ABC123'] * 8
+
+    stats = daemon.stats()
+    assert transport.requests_sent == 1
+    assert stats['coalesced'] + stats['cache_hits'] == 7
+
+
+def test_compiled_pattern_answer_format_is_sent(serve, stub_transport):
+    daemon, address = serve(stub_transport(answer='abc123'))
+
+    with DaemonClient(address) as client:
+        fmt = re.compile('[A-Z]{3}[0-9]{3}', re.IGNORECASE)
+        assert client.solve_base64('aW1hZ2U=', answer_format=fmt) == 'abc123'
+
+
+def test_answer_format_error_carries_text(serve, stub_transport):
+    daemon, address = serve(stub_transport(answer='abc'), cache_size=0)
+
+    with DaemonClient(address) as client:
+        with pytest.raises(AnswerFormatError) as caught:
+            client.solve_base64('aW1hZ2U=', answer_format={'pattern': '[0-9]+'}, max_resolves=0)
+    assert caught.value.text == 'abc'
+
+
+def test_api_error_carries_status_code(serve, stub_transport):
+    daemon, address = serve(stub_transport(status=503))
+
+    with DaemonClient(address) as client:
+        with pytest.raises(APIError) as caught:
+            client.solve_base64('aW1hZ2U=')
+    assert caught.value.status_code == 503
+
+
+@pytest.mark.parametrize('address, expected', [
+    ('unix:/tmp/fc.sock', ('unix', '/tmp/fc.sock')),
+    ('/run/fc.sock', ('unix', '/run/fc.sock')),
+    ('127.0.0.1:8765', ('tcp', ('127.0.0.1', 8765))),
+    (':9000', ('tcp', ('127.0.0.1', 9000))),
+])
+def test_parse_address(address, expected):
+    assert parse_address(address) == expected
+
+
+@pytest.mark.parametrize('address', ['0.0.0.0:0', '10.1.2.3:8765', 'example.com:8765'])
+def test_non_loopback_address_is_refused(address, make_solver):
+    solver = make_solver()
+    with pytest.raises(ValueError, match='non-loopback'):
+        SolverDaemon(solver, address)
+
+
+def test_allow_remote_binds_any_address(make_solver):
+    solver = make_solver()
+    daemon = SolverDaemon(solver, '0.0.0.0:0', allow_remote=True)
+    daemon.start()
+    assert daemon.server_address[1] > 0
+    daemon.shutdown()
+
+
+@pytest.mark.skipif(not hasattr(socket, 'AF_UNIX'), reason='no Unix sockets')
+def test_unix_socket_is_owner_only(tmp_path, make_solver):
+    path = tmp_path / 'fc.sock'
+    umask = os.umask(0o022)
+    try:
+        daemon = SolverDaemon(make_solver(), f'unix:{path}')
+        daemon.start()
+        assert stat.S_IMODE(os.stat(path).st_mode) == 0o600
+        daemon.shutdown()
+    finally:
+        os.umask(umask)
+
+
+def test_non_object_request_gets_an_error_reply(serve, stub_transport):
+    daemon, address = serve(stub_transport())
+    host, port = address.rsplit(':', 1)
+
+    with socket.create_connection((host, int(port)), timeout=5) as sock:
+        reader = sock.makefile('rb')
+        sock.sendall(b'[1, 2]\n{"op": "stats"}\n')
+        error = json.loads(reader.readline())
+        stats = json.loads(reader.readline())
+
+    assert error['ok'] is False
+    assert 'Malformed request' in error['message']
+    assert stats['ok'] is True
+
+
+@pytest.mark.skipif(not hasattr(socket, 'AF_UNIX'), reason='no Unix sockets')
+def test_listen_path_that_is_not_a_socket_is_kept(tmp_path, make_solver):
+    path = tmp_path / 'important.txt'
+    path.write_text('keep me')
+
+    with pytest.raises(ValueError, match='not a socket'):
+        SolverDaemon(make_solver(), str(path))
+    assert path.read_text() == 'keep me'
+
+
+@pytest.mark.skipif(not hasattr(socket, 'AF_UNIX'), reason='no Unix sockets')
+def test_live_daemon_socket_is_not_replaced(tmp_path, make_solver):
+    path = tmp_path / 'fc.sock'
+    daemon = SolverDaemon(make_solver(), f'unix:{path}')
+    daemon.start()
+    try:
+        with pytest.raises(ValueError, match='already listening'):
+            SolverDaemon(make_solver(), f'unix:{path}')
+        with DaemonClient(f'unix:{path}') as client:
+            assert client.stats()['requests'] == 1
+    finally:
+        daemon.shutdown()
+
+
+@pytest.mark.skipif(not hasattr(socket, 'AF_UNIX'), reason='no Unix sockets')
+def test_stale_socket_is_replaced(tmp_path, make_solver):
+    path = tmp_path / 'fc.sock'
+    stale = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    stale.bind(str(path))
+    stale.close()
+
+    daemon = SolverDaemon(make_solver(), f'unix:{path}')
+    daemon.start()
+    with DaemonClient(f'unix:{path}') as client:
+        assert client.stats()['requests'] == 1
+    daemon.shutdown()
@@ -0,0 +1,93 @@
+import io
+import random
+
+import pytest
+
+Image = pytest.importorskip('PIL.Image')
+ImageDraw = pytest.importorskip('PIL.ImageDraw')
+ImageFont = pytest.importorskip('PIL.ImageFont')
+
+from fastcaptcha.dedup import NearDuplicateIndex
+
+
+def render(text, seed=0):
+    """Draw a noisy CAPTCHA-like image whose background depends only on ``seed``."""
+    rng = random.Random(seed)
+    image = Image.new('RGB', (200, 70), (rng.randint(200, 255),) * 3)
+    draw = ImageDraw.Draw(image)
+    for _ in range(6):
+        points = [(rng.randint(0, 200), rng.randint(0, 70)) for _ in range(2)]
+        draw.line(points, fill=(rng.randint(80, 180),) * 3, width=2)
+    for _ in range(300):
+        draw.point((rng.randrange(200), rng.randrange(70)), fill=(rng.randrange(256),) * 3)
+    try:
+        font = ImageFont.load_default(36)
+    except TypeError:
+        pytest.skip("Pillow too old for sized default font")
+    for i, char in enumerate(text):
+        draw.text((10 + 30 * i, 12 + rng.randint(-4, 4)), char, font=font, fill=(40,) * 3)
+    return image
+
+
+def encode(image, fmt='PNG', **options):
+    buffer = io.BytesIO()
+    image.save(buffer, fmt, **options)
+    return buffer.getvalue()
+
+
+def test_default_reuses_identical_image():
+    index = NearDuplicateIndex()
+    data = encode(render('ABC123'))
+    index.add(index.hash_image(data), 'ABC123')
+
+    assert index.lookup(index.hash_image(data)) == ('ABC123', 0)
+
+
+@pytest.mark.parametrize('original, other', [
+    ('ABC123', 'ABC124'),
+    ('ABCQ23', 'ABCO23'),
+    ('HHHHHH', 'HHHHHN'),
+])
+def test_one_character_difference_is_not_a_hit(original, other):
+    index = NearDuplicateIndex(max_distance=8)
+    index.add(index.hash_image(encode(render(original))), original)
+
+    assert index.lookup(index.hash_image(encode(render(other), 'JPEG', quality=75))) is None
+    # The coarse hash alone would have matched; the thumbnail check rejected it
+    assert index.stats()['rejected'] == 1
+
+
+@pytest.mark.parametrize('quality', [30, 60, 90])
+def test_lossy_reencode_is_a_hit(quality):
+    index = NearDuplicateIndex(max_distance=8)
+    image = render('K7M2PX', seed=3)
+    index.add(index.hash_image(encode(image)), 'K7M2PX')
+
+    match = index.lookup(index.hash_image(encode(image, 'JPEG', quality=quality)))
+    assert match is not None and match[0] == 'K7M2PX'
+
+
+def test_namespaces_are_kept_apart():
+    index = NearDuplicateIndex()
+    fingerprint = index.hash_image(encode(render('ABC123')))
+    index.add(fingerprint, 'abc123', namespace='{"case": "lower"}')
+
+    assert index.lookup(fingerprint) is None
+
+
+def test_save_and_load_round_trip(tmp_path):
+    path = str(tmp_path / 'answers.json')
+    index = NearDuplicateIndex(path=path)
+    fingerprint = index.hash_image(encode(render('ABC123')))
+    index.add(fingerprint, 'ABC123')
+    index.save()
+
+    assert NearDuplicateIndex(path=path).lookup(fingerprint) == ('ABC123', 0)
+
+
+def test_load_rejects_old_format(tmp_path):
+    path = tmp_path / 'answers.json'
+    path.write_text('{"version": 1, "entries": []}')
+
+    with pytest.raises(ValueError):
+        NearDuplicateIndex(path=str(path))
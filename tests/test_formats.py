@@ -0,0 +1,120 @@
+import io
+import re
+
+import pytest
+
+from fastcaptcha import AnswerFormat, AnswerFormatError
+from fastcaptcha.formats import DIGITS, UPPERCASE_ALPHANUMERIC
+
+
+def answers(*texts):
+    """Answer each solve with the next of ``texts``."""
+    remaining = iter(texts)
+    return lambda image: next(remaining)
+
+
+def format_stats(solver):
+    return solver.get_stats()['answer_format']
+
+
+@pytest.mark.parametrize('fmt, text, violation', [
+    (AnswerFormat(length=6), 'ABC123', None),
+    (AnswerFormat(length=6), 'ABC', 'length 3 not in 6..6'),
+    (AnswerFormat(length=(4, None)), 'ABC', 'length 3 not in 4..'),
+    (AnswerFormat(length=(None, 2)), 'ABC', 'length 3 not in ..2'),
+    (AnswerFormat(charset=DIGITS), '12a4b', "characters 'ab' not in charset"),
+    (AnswerFormat(pattern=r'[A-Z]{3}\d{3}'), 'ABC12', r"does not match pattern '[A-Z]{3}\\d{3}'"),
+    (AnswerFormat(pattern=r'[A-Z]{3}\d{3}'), 'ABC123', None),
+    (AnswerFormat(length=6), None, 'answer is NoneType, not str'),
+])
+def test_check(fmt, text, violation):
+    assert fmt.check(text) == violation
+
+
+def test_pattern_must_match_whole_answer():
+    assert AnswerFormat(pattern=r'\d+').check('123x') is not None
+
+
+def test_coerce():
+    fmt = AnswerFormat(length=6)
+
+    assert AnswerFormat.coerce(fmt) is fmt
+    assert AnswerFormat.coerce({'length': [4, 6]}).length == (4, 6)
+    assert AnswerFormat.coerce(r'\d+').check('123') is None
+    assert AnswerFormat.coerce(re.compile('abc', re.I)).check('ABC') is None
+    with pytest.raises(TypeError):
+        AnswerFormat.coerce(6)
+
+
+def test_to_dict_round_trip():
+    fmt = AnswerFormat(length=(4, 6), charset=DIGITS, pattern=re.compile('[a-z0-9]+', re.I))
+    data = fmt.to_dict()
+
+    assert data == {'length': [4, 6], 'charset': DIGITS, 'pattern': '(?i)[a-z0-9]+'}
+    assert AnswerFormat.coerce(data).check('12AB') == "characters 'AB' not in charset"
+    assert AnswerFormat.coerce(data).pattern.fullmatch('AbC1')
+
+
+def test_violation_is_resolved(make_solver, stub_transport):
+    transport = stub_transport(answer=answers('abc', 'ABC123'))
+    solver = make_solver(transport, answer_format=AnswerFormat(length=6))
+
+    assert solver.solve_bytes(b'image') == 'ABC123'
+    assert transport.requests_sent == 2
+    assert format_stats(solver) == {
+        'checked': 1, 'violations': 1, 'resolves': 1, 'failures': 0,
+    }
+
+
+def test_gives_up_after_max_resolves(make_solver, stub_transport):
+    transport = stub_transport(answer='abc')
+    solver = make_solver(transport, answer_format=AnswerFormat(length=6), max_resolves=2)
+
+    with pytest.raises(AnswerFormatError) as excinfo:
+        solver.solve_bytes(b'image')
+
+    assert excinfo.value.text == 'abc'
+    assert transport.requests_sent == 3
+    assert format_stats(solver) == {
+        'checked': 1, 'violations': 3, 'resolves': 2, 'failures': 1,
+    }
+
+
+def test_per_call_overrides(make_solver, stub_transport):
+    transport = stub_transport(answer=answers('abc', 'abcd', 'ABC123'))
+    solver = make_solver(transport, max_resolves=0)
+
+    with pytest.raises(AnswerFormatError):
+        solver.solve_bytes(b'image', answer_format={'length': 6}, max_resolves=0)
+    assert solver.solve_bytes(b'image', answer_format={'length': 6}, max_resolves=1) == 'ABC123'
+    assert transport.requests_sent == 3
+
+
+def test_no_format_is_not_checked(make_solver, stub_transport):
+    solver = make_solver(stub_transport(answer='abc'))
+
+    assert solver.solve_bytes(b'image') == 'abc'
+    assert format_stats(solver)['checked'] == 0
+
+
+def test_near_duplicate_violating_format_is_ignored(make_solver, stub_transport):
+    Image = pytest.importorskip('PIL.Image')
+    from fastcaptcha.dedup import NearDuplicateIndex
+
+    buffer = io.BytesIO()
+    Image.new('RGB', (200, 70), (200, 120, 40)).save(buffer, 'PNG')
+    image = buffer.getvalue()
+    index = NearDuplicateIndex()
+    index.add(index.hash_image(image), 'abc')
+    transport = stub_transport(answer='ABC123')
+    solver = make_solver(
+        transport,
+        near_duplicates=index,
+        answer_format=AnswerFormat(length=6, charset=UPPERCASE_ALPHANUMERIC)
+    )
+
+    assert solver.solve_bytes(image) == 'ABC123'
+    assert transport.requests_sent == 1
+    # The conforming answer is reused
+    assert solver.solve_bytes(image) == 'ABC123'
+    assert transport.requests_sent == 1
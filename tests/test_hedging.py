@@ -0,0 +1,56 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from fastcaptcha.hedging import HedgePolicy
+
+
+def test_hedging_does_not_cap_concurrency(make_solver, stub_transport):
+    solver = make_solver(
+        stub_transport(latency=0.2), hedge=HedgePolicy(delay=5.0), pool_size=2
+    )
+    started = time.monotonic()
+    with ThreadPoolExecutor(max_workers=40) as pool:
+        answers = list(pool.map(lambda _: solver.solve_base64('aW1hZ2U='), range(40)))
+    elapsed = time.monotonic() - started
+
+    assert answers == ['ABC123'] * 40
+    # 40 concurrent 0.2 s solves; a 4-worker cap would need 2 s
+    assert elapsed < 1.0
+
+
+def test_hedge_wins_over_stalled_primary(make_solver, stub_transport):
+    solver = make_solver(
+        stub_transport(latency=0.05, stall=2.0),
+        hedge=HedgePolicy(delay=0.1, max_extra_fraction=1.0)
+    )
+    started = time.monotonic()
+
+    assert solver.solve_base64('aW1hZ2U=') == 'ABC123'
+    assert time.monotonic() - started < 1.0
+    assert solver.hedge.stats()['hedge_wins'] == 1
+
+
+def test_budget_holds_under_concurrency():
+    policy = HedgePolicy(delay=0.0, max_extra_fraction=0.1)
+    for _ in range(100):
+        policy.record_request()
+
+    with ThreadPoolExecutor(max_workers=32) as pool:
+        granted = sum(pool.map(lambda _: policy.reserve(), range(200)))
+
+    assert granted == 10
+    stats = policy.stats()
+    assert stats['hedged'] == 10
+    assert stats['budget_denied'] == 190
+
+
+def test_release_returns_reserved_hedge():
+    policy = HedgePolicy(max_extra_fraction=1.0)
+    policy.record_request()
+
+    assert policy.reserve()
+    policy.release('rate_limited')
+
+    stats = policy.stats()
+    assert stats['hedged'] == 0
+    assert stats['rate_limited'] == 1
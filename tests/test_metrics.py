@@ -0,0 +1,72 @@
+import random
+
+import pytest
+
+from fastcaptcha.loadgen import LoadGenerator, Stage
+from fastcaptcha.metrics import LatencyHistogram, LatencyWindow, latency_summary
+
+
+def test_histogram_matches_exact_summary():
+    rng = random.Random(1)
+    values = [rng.lognormvariate(-1, 0.6) for _ in range(20000)]
+    histogram = LatencyHistogram()
+    for value in values:
+        histogram.add(value)
+
+    approximate, exact = histogram.summary(), latency_summary(values)
+    assert approximate['count'] == exact['count']
+    assert approximate['mean'] == pytest.approx(exact['mean'])
+    assert approximate['max'] == exact['max']
+    for key in ('p50', 'p90', 'p99'):
+        assert approximate[key] == pytest.approx(exact[key], rel=0.02)
+
+
+def test_histogram_memory_is_fixed():
+    histogram = LatencyHistogram()
+    size = len(histogram._counts)
+    for i in range(10000):
+        histogram.add(i * 0.001)
+    histogram.add(0.0)
+    histogram.add(1e9)
+
+    assert len(histogram._counts) == size
+    assert histogram.summary()['max'] == 1e9
+
+
+def test_empty_histogram():
+    assert LatencyHistogram().summary() == latency_summary([])
+
+
+def test_latency_window_keeps_recent_samples():
+    window = LatencyWindow(size=3)
+    for value in (5.0, 1.0, 2.0, 3.0):
+        window.add(value)
+
+    assert len(window) == 3
+    assert window.percentile(1.0) == 3.0
+
+
+class InstantSolver:
+    def __init__(self):
+        self.calls = 0
+
+    def solve_bytes(self, image):
+        self.calls += 1
+        if self.calls % 10 == 0:
+            raise ValueError("bad image")
+        return 'ABC123'
+
+
+def test_load_generator_reports_totals():
+    solver = InstantSolver()
+    generator = LoadGenerator(
+        solver, [Stage(200, 0.2)], max_concurrency=4,
+        report_interval=0.05, poisson=False, trace_memory=False
+    )
+
+    report = generator.run()
+
+    assert report['offered'] == report['completed'] == solver.calls
+    assert report['latency']['count'] == report['completed']
+    assert report['errors'] == {'ValueError': solver.calls // 10}
+    assert report['timeline']
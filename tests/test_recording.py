@@ -0,0 +1,95 @@
+import json
+
+import pytest
+
+from fastcaptcha.recording import (
+    RecordingTransport, ReplayTransport, read_cassette, redact_url
+)
+from fastcaptcha.transport import TransportTimeout
+
+
+def answer(image):
+    return 'answer-' + image[:4]
+
+
+@pytest.mark.parametrize('name', ['run.jsonl', 'run.jsonl.gz'])
+def test_round_trip(tmp_path, name, make_solver, stub_transport):
+    path = tmp_path / name
+    with make_solver(stub_transport(answer=answer), record_to=path) as solver:
+        recorded = [solver.solve_base64(image) for image in ('aaaa', 'bbbb')]
+        solver.get_balance()
+
+    replay = ReplayTransport(path, speed=None)
+    offline = make_solver(replay)
+    assert [offline.solve_base64(image) for image in ('bbbb', 'aaaa')] == recorded[::-1]
+    assert replay.misses == 0
+
+    # An unseen image falls back to the responses recorded for the same path
+    assert offline.solve_base64('cccc') in recorded
+    assert replay.misses == 1
+
+
+def test_cassette_holds_no_api_key_or_image(tmp_path, make_solver, stub_transport):
+    path = tmp_path / 'run.jsonl'
+    transport = stub_transport(answer=answer)
+    with make_solver(transport, record_to=path, api_key='secret-key') as solver:
+        solver.solve_base64('aaaa')
+
+    text = path.read_text()
+    assert 'secret-key' not in text
+    assert 'aaaa' not in json.dumps([entry.get('body_hash') for entry in read_cassette(path)])
+
+
+def test_solve_url_round_trip(tmp_path, make_solver, stub_transport):
+    path = tmp_path / 'run.jsonl'
+    url = 'https://images.example.com/captcha.png?token=secret-token'
+    with make_solver(stub_transport(answer=answer), record_to=path) as solver:
+        recorded = solver.solve_url(url)
+
+    assert 'secret-token' not in path.read_text()
+
+    replay = ReplayTransport(path, speed=None)
+    assert make_solver(replay).solve_url(url) == recorded
+    assert replay.misses == 0
+
+
+def test_redact_url():
+    redacted = redact_url('https://example.com/c.png?token=abc#top')
+
+    assert 'token' not in redacted and '#' not in redacted
+    assert redact_url(redacted) == redacted
+    assert redact_url('https://example.com/c.png?token=xyz') != redacted
+    assert redact_url('https://example.com/api/v1/ocr/') == 'https://example.com/api/v1/ocr/'
+
+
+def test_recording_transport_without_prefix_records_downloads(tmp_path, stub_transport):
+    path = tmp_path / 'run.jsonl'
+    transport = RecordingTransport(stub_transport(answer=answer), path)
+    transport.request('GET', 'https://images.example.com/c.png', {})
+    transport.close()
+
+    (entry,) = read_cassette(path)
+    assert 'body_b64' in entry
+
+
+def test_replay_honours_read_timeout(tmp_path, stub_transport):
+    path = tmp_path / 'run.jsonl'
+    transport = RecordingTransport(stub_transport(answer=answer, latency=0.2), path)
+    transport.request('POST', 'https://api.example.com/api/v1/ocr/', {}, b'{"image": "aaaa"}')
+    transport.close()
+
+    replay = ReplayTransport(path, speed=None)
+    with pytest.raises(TransportTimeout):
+        replay.request('POST', 'https://api.example.com/api/v1/ocr/', {},
+                       b'{"image": "aaaa"}', timeout=(1.0, 0.05))
+    response = replay.request('POST', 'https://api.example.com/api/v1/ocr/', {},
+                              b'{"image": "aaaa"}', timeout=(1.0, 5.0))
+    assert response.status_code == 200
+
+
+def test_rejects_non_cassette(tmp_path):
+    path = tmp_path / 'other.jsonl'
+    path.write_text('{"something": "else"}\n')
+
+    with pytest.raises(ValueError):
+        ReplayTransport(path)
@@ -0,0 +1,75 @@
+import pytest
+
+from fastcaptcha.exceptions import APIError
+from fastcaptcha.results import Answer, ResultStore
+
+
+@pytest.fixture
+def pa():
+    return pytest.importorskip('pyarrow')
+
+
+def make_store():
+    store = ResultStore()
+    store.add(0, Answer('ABC', 0.12), 0.3)
+    error = APIError('server error')
+    error.status_code = 500
+    store.add(1, error, 0.5)
+    store.add(2, 'héllo', 0.2)
+    return store
+
+
+def test_to_arrow_columns(pa):
+    table = make_store().to_arrow()
+
+    assert table.schema.field('answer').type == pa.large_string()
+    assert table.to_pylist() == [
+        {'id': 0, 'answer': 'ABC', 'status_code': 200, 'latency': 0.3,
+         'processing_time': 0.12, 'error': None},
+        {'id': 1, 'answer': None, 'status_code': 500, 'latency': 0.5,
+         'processing_time': None, 'error': 'APIError'},
+        {'id': 2, 'answer': 'héllo', 'status_code': 200, 'latency': 0.2,
+         'processing_time': None, 'error': None},
+    ]
+
+
+def test_store_keeps_growing_after_export(pa):
+    store = make_store()
+    table = store.to_arrow()
+    store.add(3, 'XYZ', 0.1)
+
+    assert table.num_rows == 3
+    assert store.to_arrow().column('answer').to_pylist()[-1] == 'XYZ'
+
+
+def test_empty_store(pa):
+    assert ResultStore().to_arrow().num_rows == 0
+
+
+def test_labels_replace_ids(pa):
+    store = ResultStore(labels=['a.png', 'b.png'])
+    store.add(1, 'Z', 0.1)
+
+    assert store.to_arrow().column('id').to_pylist() == ['b.png']
+
+
+def test_stats():
+    stats = make_store().stats()
+
+    assert stats['count'] == 3
+    assert stats['succeeded'] == 2
+    assert stats['failed'] == 1
+    assert stats['status_codes'] == {200: 2, 500: 1}
+    assert stats['errors'] == {'APIError': 1}
+    assert stats['latency']['count'] == 3
+    assert stats['latency']['max'] == 0.5
+    assert stats['latency']['p50'] == pytest.approx(0.3, rel=0.01)
+    assert stats['processing_time']['count'] == 1
+
+
+def test_stats_of_empty_store():
+    stats = ResultStore().stats()
+
+    assert stats['count'] == 0
+    assert stats['success_rate'] == 0.0
+    assert stats['latency']['p99'] == 0.0
@@ -0,0 +1,155 @@
+import base64
+import io
+
+import pytest
+
+from fastcaptcha.exceptions import InvalidImageError
+from fastcaptcha.integrations.selenium import (
+    PageScreenshot, data_uri_payload, element_image, solve_element
+)
+from fastcaptcha.testing import answer_for, make_image
+
+RED = (255, 0, 0)
+
+
+class FakeElement:
+    def __init__(self, rect=(0, 0, 1, 1), src=None, png=None):
+        self.rect = rect
+        self.src = src
+        self.screenshot_as_png = png
+
+    def get_attribute(self, name):
+        return self.src if name == 'src' else None
+
+
+class FakeDriver:
+    """Page of ``size`` device pixels at ``ratio`` with a red ``red_box``."""
+
+    def __init__(self, size, ratio=1, red_box=None):
+        self.ratio = ratio
+        self.screenshots = 0
+        self.size = size
+        self.red_box = red_box
+
+    def get_screenshot_as_png(self):
+        from PIL import Image
+
+        self.screenshots += 1
+        image = Image.new('RGB', self.size, (255, 255, 255))
+        if self.red_box:
+            image.paste(RED, self.red_box)
+        buffer = io.BytesIO()
+        image.save(buffer, 'PNG')
+        return buffer.getvalue()
+
+    def execute_script(self, script, element):
+        return [*element.rect, self.ratio]
+
+
+@pytest.fixture
+def Image():
+    return pytest.importorskip('PIL.Image')
+
+
+@pytest.fixture
+def solver(make_solver, stub_transport):
+    transport = stub_transport(answer=lambda image: answer_for(base64.b64decode(image)))
+    return make_solver(transport, validate_images=True)
+
+
+def data_uri(data, media_type='image/png'):
+    return f"data:{media_type};base64,{base64.b64encode(data).decode()}"
+
+
+@pytest.mark.parametrize('src, payload', [
+    ('data:image/png;base64,iVBORw0K', 'iVBORw0K'),
+    ('data:image/JPEG;base64,/9j/4AAQ', '/9j/4AAQ'),
+    ('data:image/png;charset=utf-8;base64,iVBORw0K', 'iVBORw0K'),
+    ('data:image/svg+xml;base64,PHN2Zz4=', None),
+    ('data:text/plain;base64,aGVsbG8=', None),
+    ('data:image/png,rawdata', None),
+    ('data:image/png;base64', None),
+    ('https://example.com/captcha.png', None),
+    ('', None),
+    (None, None),
+])
+def test_data_uri_payload(src, payload):
+    assert data_uri_payload(src) == payload
+
+
+@pytest.mark.parametrize('ratio', [1, 1.5, 2])
+def test_crop_scales_by_device_pixel_ratio(Image, ratio):
+    # Element at (10, 20) CSS pixels, 50x30 CSS pixels in size
+    box = tuple(int(v * ratio) for v in (10, 20, 60, 50))
+    driver = FakeDriver((400, 300), ratio, red_box=box)
+    page = PageScreenshot(driver)
+
+    crop = Image.open(io.BytesIO(page.crop(FakeElement((10, 20, 50, 30)))))
+
+    assert crop.size == (50 * ratio, 30 * ratio)
+    assert crop.convert('RGB').getcolors() == [(crop.width * crop.height, RED)]
+
+
+def test_crop_clips_to_viewport(Image):
+    page = PageScreenshot(FakeDriver((200, 100), ratio=2))
+
+    crop = Image.open(io.BytesIO(page.crop(FakeElement((80, 40, 50, 30)))))
+
+    assert crop.size == (40, 20)
+
+
+@pytest.mark.parametrize('rect', [
+    (150, 10, 50, 30),
+    (10, -40, 50, 30),
+    (10, 10, 0, 0),
+])
+def test_crop_outside_viewport(Image, rect):
+    page = PageScreenshot(FakeDriver((200, 100), ratio=2))
+
+    with pytest.raises(InvalidImageError, match='outside the captured viewport'):
+        page.crop(FakeElement(rect))
+
+
+def test_one_screenshot_for_many_elements(Image):
+    driver = FakeDriver((400, 300))
+    page = PageScreenshot(driver)
+
+    for left in range(0, 300, 50):
+        element_image(FakeElement((left, 0, 40, 40)), page)
+
+    assert driver.screenshots == 1
+
+
+def test_solve_element_sends_data_uri(solver):
+    element = FakeElement(src=data_uri(make_image('FROMSRC')), png=make_image('SHOT'))
+
+    assert solve_element(solver, element) == 'FROMSRC'
+
+
+@pytest.mark.parametrize('src', [
+    data_uri(b'<svg xmlns="http://www.w3.org/2000/svg"/>', 'image/svg+xml'),
+    data_uri(b'not an image'),
+    'https://example.com/captcha.png',
+])
+def test_solve_element_falls_back_to_screenshot(solver, src):
+    element = FakeElement(src=src, png=make_image('SHOT'))
+
+    assert solve_element(solver, element) == 'SHOT'
+
+
+def test_solve_element_without_src(solver):
+    element = FakeElement(src=data_uri(make_image('FROMSRC')), png=make_image('SHOT'))
+
+    assert solve_element(solver, element, use_src=False) == 'SHOT'
+
+
+def test_solve_element_does_not_resend_image_the_api_rejected(make_solver, stub_transport):
+    transport = stub_transport(status=400)
+    solver = make_solver(transport, validate_images=True)
+    element = FakeElement(src=data_uri(make_image('FROMSRC')), png=make_image('SHOT'))
+
+    with pytest.raises(InvalidImageError) as caught:
+        solve_element(solver, element)
+
+    assert caught.value.status_code == 400
+    assert transport.requests_sent == 1
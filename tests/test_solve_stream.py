@@ -0,0 +1,58 @@
+import base64
+
+import pytest
+
+from fastcaptcha.results import ResultStore
+
+
+@pytest.fixture
+def echo_transport(stub_transport):
+    """Answers each solve with its own image, or 500 for images named in ``fail``."""
+    def decode(image):
+        return base64.b64decode(image).decode()
+
+    def make(fail=()):
+        return stub_transport(
+            answer=decode,
+            status=lambda image: 500 if decode(image) in fail else 200,
+            processing_time=0.1
+        )
+
+    return make
+
+
+class BrokenStore(ResultStore):
+    def add(self, *args, **kwargs):
+        raise RuntimeError("disk full")
+
+
+def test_stream_yields_every_result(make_solver, echo_transport):
+    solver = make_solver(echo_transport(fail={'img3'}))
+    images = [f'img{i}'.encode() for i in range(6)]
+
+    results = dict(solver.solve_stream(images, concurrency=3))
+
+    assert sorted(results) == list(range(6))
+    assert results[0] == 'img0'
+    assert isinstance(results[3], Exception)
+
+
+def test_stream_finishes_when_store_fails(make_solver, echo_transport):
+    solver = make_solver(echo_transport())
+    images = [f'img{i}'.encode() for i in range(4)]
+
+    results = dict(solver.solve_stream(images, concurrency=2, store=BrokenStore()))
+
+    assert sorted(results) == [0, 1, 2, 3]
+
+
+def test_batch_fills_store(make_solver, echo_transport):
+    solver = make_solver(echo_transport(fail={'img1'}))
+    store = ResultStore()
+
+    solver.solve_batch([b'img0', b'img1', b'img2'], store=store)
+
+    stats = store.stats()
+    assert stats['count'] == 3
+    assert stats['failed'] == 1
+    assert stats['status_codes'] == {200: 2, 500: 1}
@@ -0,0 +1,77 @@
+import pytest
+
+from fastcaptcha import FastCaptcha
+from fastcaptcha.exceptions import APIError, APIKeyError
+from fastcaptcha.testing import FakeAPIServer, make_image, parse_latency
+
+
+@pytest.fixture
+def server():
+    servers = []
+
+    def start(**options):
+        fake = FakeAPIServer(**options).start()
+        servers.append(fake)
+        return fake
+
+    yield start
+    for fake in servers:
+        fake.stop()
+
+
+def test_solves_and_charges_credits(server):
+    fake = server(credits=10)
+    with FastCaptcha(api_key='test-key', base_url=fake.url) as solver:
+        assert solver.solve_bytes(make_image('XK42P')) == 'XK42P'
+        assert solver.solve_bytes(make_image('HELLO')) == 'HELLO'
+
+    assert fake.balance('test-key') == 8
+    assert fake.responses[200] == 2
+
+
+def test_unknown_key_is_rejected(server):
+    fake = server(api_keys={'good-key'})
+    with FastCaptcha(api_key='bad-key', base_url=fake.url) as solver:
+        with pytest.raises(APIKeyError):
+            solver.solve_bytes(make_image('ABC'))
+
+
+def test_out_of_credits(server):
+    fake = server(credits={'test-key': 1})
+    with FastCaptcha(api_key='test-key', base_url=fake.url) as solver:
+        solver.solve_bytes(make_image('ABC'))
+        with pytest.raises(APIError) as caught:
+            solver.solve_bytes(make_image('ABC'))
+    assert caught.value.status_code == 402
+
+
+def test_rate_limit_answers_429(server):
+    fake = server(rate_limit=1)
+    with FastCaptcha(api_key='test-key', base_url=fake.url) as solver:
+        solver.solve_bytes(make_image('ABC'))
+        with pytest.raises(APIError) as caught:
+            solver.solve_bytes(make_image('ABC'))
+    assert caught.value.status_code == 429
+
+
+def test_batch_endpoint(server):
+    fake = server()
+    images = [make_image(f'IMG{i}') for i in range(6)]
+    with FastCaptcha(api_key='test-key', base_url=fake.url, max_batch_size=8,
+                     max_batch_wait=0.05) as solver:
+        assert solver.solve_batch(images, concurrency=6) == [f'IMG{i}' for i in range(6)]
+        assert solver.get_stats()['batching']['batched'] > 0
+
+
+@pytest.mark.parametrize('spec', ['0.3', 'uniform:0.1:0.5', 'lognormal:0.3:0.5', 'bimodal:0.05:3:0.01'])
+def test_parse_latency(spec):
+    sample = parse_latency(spec, seed=1)
+    values = [sample() for _ in range(100)]
+    assert all(value >= 0 for value in values)
+    assert parse_latency(spec, seed=1)() == values[0]
+
+
+@pytest.mark.parametrize('spec', ['slow', 'gamma:1:2', 'uniform:a:b'])
+def test_parse_latency_rejects(spec):
+    with pytest.raises(ValueError):
+        parse_latency(spec)
@@ -0,0 +1,53 @@
+import pytest
+
+from fastcaptcha.exceptions import TimeoutError
+from fastcaptcha.timeouts import AdaptiveTimeout
+
+
+def test_read_timeout_follows_observed_latency(make_solver):
+    policy = AdaptiveTimeout(floor=1.0, multiplier=3.0, min_samples=20)
+    solver = make_solver(read_timeout=30, adaptive_timeout=policy)
+    for _ in range(20):
+        solver.latencies.add(0.5)
+
+    assert policy.read_timeout(solver.latencies, 30) == pytest.approx(1.5)
+
+
+def test_recovers_after_latency_shift(make_solver, stub_transport):
+    transport = stub_transport(latency=5.0, sleep=False)
+    solver = make_solver(
+        transport,
+        read_timeout=30,
+        adaptive_timeout=AdaptiveTimeout(floor=1.0, multiplier=3.0, retries=1)
+    )
+    # A long run of fast solves pins the adaptive timeout at the floor
+    for _ in range(1000):
+        solver.latencies.add(0.2)
+
+    failures = 0
+    for _ in range(100):
+        try:
+            solver.solve_base64('aW1hZ2U=')
+        except TimeoutError:
+            failures += 1
+        else:
+            break
+    else:
+        pytest.fail("adaptive timeout never grew past the new latency")
+
+    assert failures < 20
+    assert solver.get_stats()['timeouts']['timed_out'] >= 2
+
+
+def test_retry_escalates_timeout(make_solver, stub_transport):
+    transport = stub_transport(latency=1.5, sleep=False)
+    solver = make_solver(
+        transport,
+        read_timeout=30,
+        adaptive_timeout=AdaptiveTimeout(floor=1.0, retries=1, backoff=2.0)
+    )
+    for _ in range(20):
+        solver.latencies.add(0.1)
+
+    assert solver.solve_base64('aW1hZ2U=') == 'ABC123'
+    assert transport.read_timeouts == [1.0, 2.0]
@@ -0,0 +1,200 @@
+import socket
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlsplit
+
+import pytest
+
+from fastcaptcha import FastCaptcha
+from fastcaptcha.exceptions import APIError, InvalidImageError, TimeoutError
+from fastcaptcha.testing import FakeAPIServer, make_image
+from fastcaptcha.transport import (
+    TransportError, TransportTimeout, create_transport
+)
+
+IMAGE = make_image('XK42P')
+
+
+@pytest.fixture(params=['requests', 'urllib3', 'http2'])
+def backend(request):
+    if request.param == 'http2':
+        pytest.importorskip('httpx')
+        pytest.importorskip('h2')
+    return request.param
+
+
+@pytest.fixture
+def api():
+    servers = []
+
+    def start(**options):
+        fake = FakeAPIServer(**options).start()
+        servers.append(fake)
+        return fake
+
+    yield start
+    for fake in servers:
+        fake.stop()
+
+
+@pytest.fixture
+def solver(backend):
+    solvers = []
+
+    def make(base_url, **options):
+        client = FastCaptcha(
+            api_key='test-key', base_url=base_url, transport=backend, **options
+        )
+        solvers.append(client)
+        return client
+
+    yield make
+    for client in solvers:
+        client.close()
+
+
+class _ImageHandler(BaseHTTPRequestHandler):
+    """Serves ``/image``, ``/redirect/<n>`` (n redirects to it) and ``/page``."""
+
+    protocol_version = 'HTTP/1.1'
+
+    def log_message(self, format, *args):
+        pass
+
+    def _send(self, status, body=b'', headers=()):
+        self.send_response(status)
+        self.send_header('Content-Length', str(len(body)))
+        for name, value in headers:
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        if self.path == '/image':
+            self._send(200, IMAGE, [('Content-Type', 'image/png')])
+        elif self.path.startswith('/redirect/'):
+            hops = int(self.path.rsplit('/', 1)[1])
+            # Alternate relative and absolute locations
+            target = f'/redirect/{hops - 1}' if hops > 1 else '/image'
+            if hops % 2:
+                target = f'http://127.0.0.1:{self.server.server_port}{target}'
+            self._send(302, headers=[('Location', target)])
+        elif self.path == '/page':
+            self._send(200, b'<html></html>', [('Content-Type', 'text/html')])
+        else:
+            self._send(404)
+
+
+@pytest.fixture(scope='module')
+def images():
+    server = ThreadingHTTPServer(('127.0.0.1', 0), _ImageHandler)
+    server.daemon_threads = True
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f'http://127.0.0.1:{server.server_port}'
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def refused_url():
+    # A port that was just free and has nothing listening on it
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        port = sock.getsockname()[1]
+    return f'http://127.0.0.1:{port}/api/v1/ocr/'
+
+
+def test_solve(api, solver):
+    fake = api()
+    client = solver(fake.url)
+
+    assert client.solve_bytes(IMAGE) == 'XK42P'
+    assert client.solve_bytes(make_image('HELLO')) == 'HELLO'
+    assert fake.requests['POST /api/v1/ocr/'] == 2
+
+
+def test_balance(api, solver):
+    fake = api(credits=7)
+
+    assert solver(fake.url).get_balance()['credits'] == 7
+
+
+def test_refused_connection_is_not_a_timeout(backend, refused_url):
+    transport = create_transport(backend)
+    try:
+        with pytest.raises(TransportError) as caught:
+            transport.request('GET', refused_url, {}, timeout=(2, 2))
+    finally:
+        transport.close()
+
+    assert not isinstance(caught.value, TransportTimeout)
+
+
+def test_refused_connection_fails_solve(solver, refused_url):
+    with pytest.raises(APIError, match='Network error'):
+        solver(refused_url).solve_bytes(IMAGE)
+
+
+def test_read_timeout(backend, api):
+    fake = api(latency=1.0)
+    transport = create_transport(backend)
+    try:
+        with pytest.raises(TransportTimeout):
+            transport.request(
+                'GET', fake.url.replace('/ocr/', '/balance/'), {}, timeout=(2, 0.1)
+            )
+    finally:
+        transport.close()
+
+
+def test_read_timeout_fails_solve(api, solver):
+    fake = api(latency=1.0)
+
+    with pytest.raises(TimeoutError):
+        solver(fake.url, read_timeout=0.1).solve_bytes(IMAGE)
+
+
+def test_solve_url_follows_redirects(api, solver, images):
+    fake = api()
+
+    assert solver(fake.url).solve_url(f'{images}/redirect/3') == 'XK42P'
+
+
+def test_download_stops_after_max_redirects(solver, images):
+    client = solver('http://127.0.0.1:9/api/v1/ocr/')
+
+    assert client._download(f'{images}/redirect/2', max_redirects=2) == IMAGE
+    with pytest.raises(ValueError, match='Too many redirects'):
+        client._download(f'{images}/redirect/3', max_redirects=2)
+
+
+def test_solve_url_rejects_non_image(api, solver, images):
+    fake = api()
+    client = solver(fake.url)
+
+    with pytest.raises(InvalidImageError, match='text/html'):
+        client.solve_url(f'{images}/page')
+    with pytest.raises(InvalidImageError, match='HTTP 404'):
+        client.solve_url(f'{images}/missing')
+    assert fake.requests['POST /api/v1/ocr/'] == 0
+
+
+def test_connection_pool_serves_requests(backend, api):
+    fake = api()
+    transport = create_transport(backend)
+    url = fake.url.replace('/ocr/', '/balance/')
+    try:
+        pool = transport.connection_pool(url)
+        if backend == 'http2':
+            assert pool is None
+            return
+        transport.request('GET', url, {})
+        transport.request('GET', url, {})
+    finally:
+        transport.close()
+
+    assert (pool.host, pool.port) == ('127.0.0.1', urlsplit(url).port)
+    # Both requests went through the returned pool, over one kept-alive connection
+    assert pool.num_requests == 2
+    assert pool.num_connections == 1
@@ -0,0 +1,72 @@
+import io
+
+import pytest
+
+from fastcaptcha.exceptions import InvalidImageError
+from fastcaptcha.validation import inspect_image, sniff_format, validate_image_data
+
+Image = pytest.importorskip('PIL.Image')
+
+
+def encode(fmt, size=(200, 70), **options):
+    buffer = io.BytesIO()
+    Image.new('RGB', size, (200, 120, 40)).save(buffer, fmt, **options)
+    return buffer.getvalue()
+
+
+@pytest.mark.parametrize('fmt, kind', [
+    ('PNG', 'png'), ('JPEG', 'jpeg'), ('GIF', 'gif'), ('BMP', 'bmp'), ('WEBP', 'webp'),
+])
+def test_reads_format_and_dimensions(fmt, kind):
+    assert inspect_image(encode(fmt)) == (kind, 200, 70)
+
+
+@pytest.mark.parametrize('fmt', ['PNG', 'JPEG', 'GIF'])
+@pytest.mark.parametrize('trailer', [b'\n', b'\r\n', b'\x00' * 16, b'\x00' * 1000])
+def test_accepts_trailing_bytes(fmt, trailer):
+    data = encode(fmt) + trailer
+    Image.open(io.BytesIO(data)).load()  # decoders accept it too
+
+    assert inspect_image(data).width == 200
+
+
+@pytest.mark.parametrize('fmt', ['PNG', 'JPEG', 'GIF', 'BMP', 'WEBP'])
+def test_rejects_truncated_image(fmt):
+    data = encode(fmt)
+
+    with pytest.raises(InvalidImageError):
+        inspect_image(data[:len(data) // 2])
+
+
+def test_rejects_truncated_png_with_padding():
+    data = encode('PNG')
+
+    with pytest.raises(InvalidImageError):
+        inspect_image(data[:-12] + b'\x00' * 64)
+
+
+def test_rejects_truncated_jpeg_with_padding():
+    data = encode('JPEG')
+
+    with pytest.raises(InvalidImageError):
+        inspect_image(data[:-100] + b'\x00' * 64)
+
+
+@pytest.mark.parametrize('data', [b'', b'not an image', b'\x89PNG\r\n\x1a\n'])
+def test_rejects_empty_and_garbage(data):
+    with pytest.raises(InvalidImageError):
+        inspect_image(data)
+
+
+def test_enforces_limits():
+    data = encode('PNG')
+
+    with pytest.raises(InvalidImageError):
+        validate_image_data(data, max_bytes=len(data) - 1)
+    with pytest.raises(InvalidImageError):
+        validate_image_data(data, max_pixels=200 * 70 - 1)
+    assert validate_image_data(data, max_bytes=None, max_pixels=None).format == 'png'
+
+
+def test_sniff_format_unknown():
+    assert sniff_format(b'GIF90a') is None
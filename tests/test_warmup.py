@@ -0,0 +1,81 @@
+import socket
+import threading
+import time
+
+import pytest
+
+pytest.importorskip('urllib3')
+
+from fastcaptcha import FastCaptcha
+
+
+@pytest.fixture
+def silent_server():
+    """Accept connections but never answer them."""
+    server = socket.socket()
+    server.bind(('127.0.0.1', 0))
+    server.listen(16)
+    held = []
+
+    def accept():
+        while True:
+            try:
+                conn, _ = server.accept()
+            except OSError:
+                return
+            held.append(conn)
+
+    threading.Thread(target=accept, daemon=True).start()
+    yield f"http://127.0.0.1:{server.getsockname()[1]}/solve"
+    server.close()
+    for conn in held:
+        conn.close()
+
+
+def test_ping_and_close_are_bounded_by_timeouts(silent_server):
+    solver = FastCaptcha(
+        api_key='key',
+        base_url=silent_server,
+        transport='urllib3',
+        connect_timeout=0.2,
+        read_timeout=0.2
+    )
+    assert solver.warmup(2) == 2
+
+    started = time.monotonic()
+    assert solver._warmer.ping() == 0
+    assert time.monotonic() - started < 2
+
+
+def test_close_does_not_wait_for_stuck_ping(silent_server):
+    solver = FastCaptcha(
+        api_key='key',
+        base_url=silent_server,
+        transport='urllib3',
+        connect_timeout=0.2,
+        read_timeout=0.2
+    )
+    solver.warmup(4, keepalive_interval=0.05)
+    time.sleep(0.2)  # let a background ping get stuck on the silent server
+
+    started = time.monotonic()
+    solver.close()
+    assert time.monotonic() - started < 1
+
+
+def test_warmup_survives_refused_connections():
+    server = socket.socket()
+    server.bind(('127.0.0.1', 0))
+    port = server.getsockname()[1]
+    server.close()  # nothing listens here any more
+
+    solver = FastCaptcha(
+        api_key='key',
+        base_url=f"http://127.0.0.1:{port}/solve",
+        transport='urllib3',
+        connect_timeout=0.2
+    )
+    try:
+        assert solver.warmup(2) == 0
+    finally:
+        solver.close()